@@ -0,0 +1,8 @@
+"""
+Benchmarks for the Mininet-Topo helpers. They need root and Open vSwitch
+and are run from the repository root, e.g.
+
+    sudo python -m bench.ovsbatch
+
+bench.topologies can also run without root, using --dry-run.
+"""
@@ -0,0 +1,55 @@
+"""
+Measure the per-command overhead of Node.cmd() against a CmdPipeline
+that sends the same commands to the node's shell in one round trip.
+
+Usage: sudo python -m bench.cmdpipeline [--count N] [--repeat N]
+"""
+
+import time
+from argparse import ArgumentParser
+
+from mininet.log import lg, output
+from mininet.node import Node
+
+from mntopo.pipeline import CmdPipeline
+
+
+def timeCmd( node, count ):
+    "Return seconds to run count commands with node.cmd()"
+    start = time.time()
+    for _ in range( count ):
+        node.cmd( 'true' )
+    return time.time() - start
+
+def timePipeline( node, count ):
+    "Return seconds to run count commands in one CmdPipeline"
+    start = time.time()
+    pipe = CmdPipeline( node )
+    for _ in range( count ):
+        pipe.add( 'true' )
+    results = pipe.run()
+    assert len( results ) == count
+    return time.time() - start
+
+def bench( count, repeat ):
+    "Print per-command overhead for both methods"
+    node = Node( 'bench1' )
+    try:
+        cmd = min( timeCmd( node, count ) for _ in range( repeat ) )
+        pipe = min( timePipeline( node, count ) for _ in range( repeat ) )
+    finally:
+        node.terminate()
+    output( '%d commands, best of %d runs\n' % ( count, repeat ) )
+    output( '%-12s %10s %14s\n' % ( 'method', 'total', 'per command' ) )
+    for name, seconds in ( 'node.cmd', cmd ), ( 'pipeline', pipe ):
+        output( '%-12s %9.3fs %11.1f us\n' %
+                ( name, seconds, 1e6 * seconds / count ) )
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser( description=__doc__.strip().split( '\n' )[ 0 ] )
+    parser.add_argument( '--count', type=int, default=1000 )
+    parser.add_argument( '--repeat', type=int, default=3 )
+    args = parser.parse_args()
+    lg.setLogLevel( 'output' )
+    bench( args.count, args.repeat )
@@ -0,0 +1,128 @@
+"""
+Measure how many PACKET_INs per second the bundled controller
+(mntopo.controller) handles. Emulated switches connect over TCP, each
+with its own set of hosts on separate ports, and keep a window of
+PACKET_INs outstanding; every PACKET_IN is answered by one PACKET_OUT.
+This needs neither root nor Open vSwitch.
+
+Usage: python -m bench.controller [--switches N] [--hosts N] [--count N]
+"""
+
+import os
+import select
+import socket
+import struct
+import subprocess
+import sys
+import time
+from argparse import ArgumentParser
+
+from mininet.log import lg, output
+
+from mntopo.controller import ( HEADER, PACKET_IN, FEATURES, OXM_IN_PORT,
+                                OFP_NO_BUFFER, OFPT_HELLO,
+                                OFPT_FEATURES_REQUEST, OFPT_FEATURES_REPLY,
+                                OFPT_PACKET_IN, OFPT_PACKET_OUT,
+                                OFPT_FLOW_MOD, Connection, match, message )
+
+
+def mac( host ):
+    "Return the locally administered MAC address of host number host"
+    return b'\x02\x00' + struct.pack( '!I', host )
+
+def packetIn( port, src, dst ):
+    "Return a PACKET_IN carrying a minimal IPv4 frame from src to dst"
+    frame = mac( dst ) + mac( src ) + b'\x08\x00' + b'\0' * 46
+    return message( OFPT_PACKET_IN,
+                    PACKET_IN.pack( OFP_NO_BUFFER, len( frame ), 0, 0, 0 ) +
+                    match( ( OXM_IN_PORT, struct.pack( '!I', port ) ) ) +
+                    b'\0\0' + frame )
+
+def connectSwitch( port, dpid ):
+    "Connect an emulated switch and complete its handshake"
+    sock = socket.create_connection( ( '127.0.0.1', port ) )
+    sock.setsockopt( socket.IPPROTO_TCP, socket.TCP_NODELAY, 1 )
+    conn = Connection( sock )
+    conn.dpid = dpid
+    while True:
+        msgs = conn.messages( sock.recv( 65536 ) )
+        if any( ord( msg[ 1:2 ] ) == OFPT_FEATURES_REQUEST for msg in msgs ):
+            break
+    sock.sendall( message( OFPT_HELLO ) +
+                  message( OFPT_FEATURES_REPLY,
+                           FEATURES.pack( dpid, 0, 1, 0, 0, 0 ) ) )
+    return conn
+
+def run( port, switches, hosts, count, window ):
+    """Send count PACKET_INs through each of switches emulated switches
+       returns: seconds, PACKET_OUTs and FLOW_MODs received"""
+    conns = [ connectSwitch( port, dpid + 1 ) for dpid in range( switches ) ]
+    # Host h sits on port h + 1 of every switch and sends to h + 1
+    msgs = [ packetIn( n % hosts + 1, n % hosts, ( n + 1 ) % hosts )
+             for n in range( count ) ]
+    sent = dict( ( conn.sock, 0 ) for conn in conns )
+    pending = dict( ( conn.sock, 0 ) for conn in conns )
+    bySock = dict( ( conn.sock, conn ) for conn in conns )
+    counts = { OFPT_PACKET_OUT: 0, OFPT_FLOW_MOD: 0 }
+    start = time.time()
+    while any( pending.values() ) or any( n < count for n in sent.values() ):
+        for sock in bySock:
+            if pending[ sock ] < window / 2 and sent[ sock ] < count:
+                batch = msgs[ sent[ sock ]:sent[ sock ] + window ]
+                sock.sendall( b''.join( batch ) )
+                sent[ sock ] += len( batch )
+                pending[ sock ] += len( batch )
+        readable, _, _ = select.select( list( bySock ), [], [], 5 )
+        if not readable:
+            raise Exception( 'controller stopped answering' )
+        for sock in readable:
+            for msg in bySock[ sock ].messages( sock.recv( 1 << 20 ) ):
+                msgType = ord( msg[ 1:2 ] )
+                counts[ msgType ] = counts.get( msgType, 0 ) + 1
+                if msgType == OFPT_PACKET_OUT:
+                    pending[ sock ] -= 1
+    seconds = time.time() - start
+    for conn in conns:
+        conn.sock.close()
+    return seconds, counts[ OFPT_PACKET_OUT ], counts[ OFPT_FLOW_MOD ]
+
+def startController( port ):
+    "Start mntopo.controller on port and wait until it listens"
+    repo = os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) )
+    proc = subprocess.Popen( [ sys.executable, '-m', 'mntopo.controller',
+                               '--port', str( port ) ], cwd=repo,
+                             stderr=open( os.devnull, 'w' ) )
+    for _ in range( 100 ):
+        try:
+            socket.create_connection( ( '127.0.0.1', port ) ).close()
+            return proc
+        except socket.error:
+            time.sleep( .05 )
+    proc.terminate()
+    raise Exception( 'controller did not start on port %d' % port )
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser( description=__doc__.strip().split( '\n' )[ 0 ] )
+    parser.add_argument( '--port', type=int, default=16653,
+                         help='port for the controller under test' )
+    parser.add_argument( '--switches', type=int, default=66 )
+    parser.add_argument( '--hosts', type=int, default=240,
+                         help='hosts behind every switch' )
+    parser.add_argument( '--count', type=int, default=2000,
+                         help='PACKET_INs per switch' )
+    parser.add_argument( '--window', type=int, default=64,
+                         help='PACKET_INs outstanding per switch' )
+    args = parser.parse_args()
+    lg.setLogLevel( 'output' )
+    controller = startController( args.port )
+    try:
+        seconds, packetOuts, flowMods = run( args.port, args.switches,
+                                             args.hosts, args.count,
+                                             args.window )
+    finally:
+        controller.terminate()
+    output( '%d PACKET_INs from %d switches in %.3fs: %.0f/s '
+            '(%d PACKET_OUTs, %d FLOW_MODs)\n' %
+            ( args.switches * args.count, args.switches, seconds,
+              args.switches * args.count / seconds, packetOuts, flowMods ) )
@@ -0,0 +1,97 @@
+"""
+Compare first-packet and steady-state RTT with reactive forwarding (the
+bundled learning controller) and with proactive shortest-path flows
+(mntopo.flows).
+
+For a sample of host pairs, every pair pings three times. The first
+reply includes ARP resolution and, in reactive mode, the PACKET_IN round
+trips along the path; the later ones show the steady state. Each mode
+runs on a fresh network, with floods confined to a spanning tree.
+
+--static-arp fills the neighbor tables first, taking ARP out of the
+first packet.
+
+Usage: sudo python -m bench.firstpacket [--pairs N] [--static-arp] [topo]
+"""
+
+import random
+import re
+from argparse import ArgumentParser
+from functools import partial
+
+from mininet.clean import cleanup
+from mininet.log import lg, output
+from mininet.net import Mininet
+from mininet.node import OVSSwitch
+
+from mntopo.arp import fillNeighbors
+from mntopo.bringup import parallelStart
+from mntopo.controller import LISTEN_PORT, LocalController
+from mntopo.flows import installFlows
+from mntopo.spec import buildNet, loadSpec
+from mntopo.util import PhaseTimer, distribution
+
+
+PING = re.compile( r'icmp_seq=(\d+) .*time=([\d.]+) ms' )
+
+
+def pingTimes( src, dst, count=3 ):
+    "Return the RTTs in ms of count pings from src to dst, None if lost"
+    out = src.cmd( 'ping -c %d -i 0.2 -W 1 %s' % ( count, dst.IP() ) )
+    times = dict( ( int( seq ), float( ms ) )
+                  for seq, ms in PING.findall( out ) )
+    return [ times.get( seq ) for seq in range( 1, count + 1 ) ]
+
+def measure( spec, mode, pairs, workers, staticArp=False ):
+    """Bring spec up with mode forwarding and ping every pair
+       returns: list of RTT lists, one per pair"""
+    spec.controllers = [ ( 'c0', '127.0.0.1', { 'keepFlows': True } ) ]
+    net = buildNet( spec, Mininet( listenPort=LISTEN_PORT, switch=partial(
+                        OVSSwitch, protocols='OpenFlow13' ) ),
+                    workers, controller=LocalController )
+    try:
+        timer = PhaseTimer()
+        parallelStart( net, workers, timer )
+        installFlows( net, gateway=None, timer=timer,
+                      paths=mode == 'proactive', tree=True )
+        if staticArp:
+            fillNeighbors( net.hosts )
+        return [ pingTimes( net.get( src ), net.get( dst ) )
+                 for src, dst in pairs ]
+    finally:
+        net.stop()
+
+def summary( values ):
+    "Format the distribution of values in ms"
+    dist = distribution( [ value for value in values if value is not None ] )
+    lost = sum( 1 for value in values if value is None )
+    if not dist:
+        return 'all %d lost' % lost
+    return 'p50 %7.3f  p90 %7.3f  max %7.3f ms  (%d lost)' % (
+        dist[ 'p50' ], dist[ 'p90' ], dist[ 'max' ], lost )
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser( description=__doc__.strip().split( '\n' )[ 0 ] )
+    parser.add_argument( '--pairs', type=int, default=50,
+                         help='host pairs to sample (default: 50)' )
+    parser.add_argument( '--seed', type=int, default=1 )
+    parser.add_argument( '--workers', type=int, default=8 )
+    parser.add_argument( '--static-arp', action='store_true',
+                         help='fill the neighbor tables before pinging' )
+    parser.add_argument( 'topo', nargs='?', default='curcle' )
+    args = parser.parse_args()
+    lg.setLogLevel( 'output' )
+    cleanup()
+    topo = loadSpec( args.topo )
+    hosts = topo.hostNames()
+    sample = random.Random( args.seed ).sample(
+        [ ( a, b ) for a in hosts for b in hosts if a != b ],
+        args.pairs )
+    for forwarding in 'reactive', 'proactive':
+        rtts = measure( topo, forwarding, sample, args.workers,
+                        args.static_arp )
+        output( '%-9s first  %s\n' % ( forwarding, summary(
+            [ times[ 0 ] for times in rtts ] ) ) )
+        output( '%-9s steady %s\n' % ( '', summary(
+            [ rtt for times in rtts for rtt in times[ 1: ] ] ) ) )
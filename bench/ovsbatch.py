@@ -0,0 +1,56 @@
+"""
+Compare switch start-up through the per-switch OVS path with the batched
+single-transaction backend (mntopo.ovs.BatchOVSSwitch).
+
+Usage: sudo python -m bench.ovsbatch [--repeat N] [topo ...]
+"""
+
+from argparse import ArgumentParser
+
+from mininet.clean import cleanup
+from mininet.log import lg, output
+from mininet.net import Mininet
+from mininet.node import OVSSwitch
+
+from mntopo.bringup import parallelStart
+from mntopo.ovs import BatchOVSSwitch
+from mntopo.spec import buildNet, loadSpec
+from mntopo.util import PhaseTimer
+
+
+def timeBridges( spec, switch ):
+    """Build spec with switch class switch and return the seconds it
+       took to start all of its bridges"""
+    net = buildNet( spec, Mininet( listenPort=6633, switch=switch ) )
+    timer = PhaseTimer()
+    try:
+        parallelStart( net, 1, timer, connectTimeout=0 )
+    finally:
+        net.stop()
+    return timer.seconds( 'bridges' )
+
+def bench( topos, repeat ):
+    "Print per-switch and batched bridge start-up times for topos"
+    output( '%-12s %8s %10s %10s %8s\n' %
+            ( 'topology', 'switches', 'ovs', 'ovsbatch', 'speedup' ) )
+    for name in topos:
+        spec = loadSpec( name )
+        serial = min( timeBridges( spec, OVSSwitch )
+                      for _ in range( repeat ) )
+        batch = min( timeBridges( spec, BatchOVSSwitch )
+                     for _ in range( repeat ) )
+        output( '%-12s %8d %9.3fs %9.3fs %7.1fx\n' %
+                ( name, len( spec.switches ), serial, batch,
+                  serial / batch ) )
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser( description=__doc__.strip().split( '\n' )[ 0 ] )
+    parser.add_argument( '--repeat', type=int, default=3,
+                         help='runs per backend; the best is reported' )
+    parser.add_argument( 'topos', nargs='*',
+                         default=[ 'minicurcle', 'curcle', 'nttutree' ] )
+    args = parser.parse_args()
+    lg.setLogLevel( 'output' )
+    cleanup()
+    bench( args.topos, args.repeat )
@@ -0,0 +1,183 @@
+"""
+Time the bring-up and teardown of the shipped topologies phase by phase:
+build, start (with the controller handshake as start/connect), NAT,
+routes, a first all-pairs ping and teardown. Every run is appended to
+a JSON-lines file, one record per topology and repetition, so results
+can be compared from run to run.
+
+With --dry-run the topologies are built on mntopo.dryrun.DryRunNet,
+which needs neither root nor Open vSwitch; it times only the Python
+side of bring-up and counts the commands that would have run.
+
+Usage: sudo python -m bench.topologies [--dry-run] [--workers N]
+           [--switch ovsbatch] [--repeat N] [--output FILE] [topo ...]
+"""
+
+import json
+import time
+from argparse import ArgumentParser
+from collections import OrderedDict
+
+from mininet.log import lg, output
+from mininet.net import Mininet
+from mininet.node import Node
+
+from mntopo.dryrun import DryRunNet
+from mntopo.flows import installFlows
+from mntopo.internet import connectToInternet
+from mntopo.nat import stopNAT
+from mntopo.runner import SWITCHES, backend, listenPort, pushesFlows
+from mntopo.shaping import parseTier, shapeLinks
+from mntopo.spec import buildNet, loadSpec
+from mntopo.sweep import sweep
+from mntopo.teardown import TeardownGuard, cleanLeftovers, newRun, tagRun
+from mntopo.util import PhaseTimer
+
+
+TOPOS = [ 'minicurcle', '2tree', 'curcle', 'nttutree' ]
+
+# Phases shown in the summary table; all phases go to the output file
+COLUMNS = [ 'build', 'start', 'start/connect', 'nat', 'routes', 'ping',
+            'teardown' ]
+
+
+def runTopo( spec, args ):
+    """Bring spec up, ping all pairs and tear it down again
+       spec: TopoSpec
+       args: parsed command line
+       returns: result record (dict)"""
+    timer = PhaseTimer()
+    switch, controller = backend( args, spec )
+    if args.dry_run:
+        net = DryRunNet( listenPort=listenPort( controller ) )
+        root, guard = net.rootNode(), None
+    else:
+        net = Mininet( listenPort=listenPort( controller ), switch=switch )
+        root = Node( 'root', inNamespace=False )
+        guard = TeardownGuard( net, root )
+    loss = None
+    try:
+        with timer.phase( 'build' ):
+            buildNet( spec, net, workers=args.workers, timer=timer,
+                      controller=controller )
+        connectToInternet(
+            net, timer=timer, workers=args.workers, root=root,
+            connectTimeout=args.connect_timeout, staticArp=args.static_arp )
+        with timer.phase( 'shape' ):
+            shapeLinks( net, spec, args.tiers )
+        if guard:
+            tagRun( net, args.run, root )
+        if pushesFlows( args ):
+            installFlows( net, extra=[ root ], timer=timer,
+                          paths=args.flows == 'proactive',
+                          tree=args.broadcast == 'tree' )
+        if args.ping:
+            with timer.phase( 'ping' ):
+                if args.sweep:
+                    result = sweep( net, timeout=float( args.ping_timeout ),
+                                    fitTable=not args.dry_run )
+                    # Dry-run probes get no replies
+                    loss = None if args.dry_run else 100 * result.lossRate()
+                else:
+                    loss = net.pingAll( timeout=args.ping_timeout )
+    finally:
+        with timer.phase( 'teardown' ):
+            if guard:
+                guard( timer )
+            else:
+                stopNAT( root )
+                net.stop()
+    record = OrderedDict( [
+        ( 'time', time.strftime( '%Y-%m-%dT%H:%M:%SZ', time.gmtime() ) ),
+        ( 'topo', spec.name ),
+        ( 'backend', 'dryrun' if args.dry_run else args.switch ),
+        ( 'controller', args.controller ),
+        ( 'flows', args.flows ),
+        ( 'broadcast', args.broadcast ),
+        ( 'staticArp', args.static_arp ),
+        ( 'shape', args.shape ),
+        ( 'workers', args.workers ),
+        ( 'switches', len( spec.switches ) ),
+        ( 'hosts', len( spec.hosts ) ),
+        ( 'links', len( spec.links ) ),
+        ( 'ping', 'sweep' if args.sweep else 'pingall' ),
+        ( 'loss', loss ),
+        ( 'phases', timer.totals() ),
+        ( 'samples', timer.distributions() ),
+        ( 'total', timer.elapsed() ) ] )
+    if args.dry_run:
+        record[ 'commands' ] = len( net.log )
+    return record
+
+def bench( args ):
+    "Run every topology args.repeat times and record the results"
+    output( '%-12s' % 'topology' +
+            ''.join( '%14s' % column for column in COLUMNS ) +
+            '%10s\n' % 'total' )
+    with open( args.output, 'a' ) as f:
+        for name in args.topos:
+            spec = loadSpec( name )
+            for _ in range( args.repeat ):
+                record = runTopo( spec, args )
+                f.write( json.dumps( record ) + '\n' )
+                f.flush()
+                phases = record[ 'phases' ]
+                output( '%-12s' % name +
+                        ''.join( '%13.3fs' % phases.get( column, 0 )
+                                 for column in COLUMNS ) +
+                        '%9.3fs\n' % record[ 'total' ] )
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser( description=__doc__.strip().split( '\n' )[ 0 ] )
+    parser.add_argument( '--dry-run', action='store_true',
+                         help='record commands instead of running them '
+                              '(no root needed)' )
+    parser.add_argument( '--workers', type=int, default=1,
+                         help='parallel bring-up workers (default: 1)' )
+    parser.add_argument( '--switch', choices=sorted( SWITCHES ),
+                         default='ovs', help='switch backend' )
+    parser.add_argument( '--controller', choices=[ 'remote', 'local' ],
+                         default='remote',
+                         help="remote: the spec's controller; local: the "
+                              'bundled mntopo.controller' )
+    parser.add_argument( '--flows', choices=[ 'reactive', 'proactive' ],
+                         default='reactive',
+                         help='proactive: push shortest-path flows before '
+                              'pinging' )
+    parser.add_argument( '--broadcast', choices=[ 'tree', 'flood' ],
+                         default='flood',
+                         help='tree: confine floods to a spanning tree; '
+                              'flood: leave loops to the controller '
+                              '(default)' )
+    parser.add_argument( '--static-arp', action='store_true',
+                         help='fill the neighbor tables before pinging' )
+    parser.add_argument( '--shape', action='append', default=[],
+                         metavar='TIER:KEY=VALUE,...',
+                         help='shape the links of a tier, e.g. '
+                              'access:bw=100,delay=1 (may be repeated)' )
+    parser.add_argument( '--repeat', type=int, default=1,
+                         help='runs per topology' )
+    parser.add_argument( '--connect-timeout', type=float, default=10,
+                         help='seconds to wait for switches to connect '
+                              '(default: 10)' )
+    parser.add_argument( '--no-ping', dest='ping', action='store_false',
+                         help='skip the all-pairs ping' )
+    parser.add_argument( '--sweep', action='store_true',
+                         help='ping all pairs with the concurrent sweep '
+                              '(mntopo.sweep) instead of pingall' )
+    parser.add_argument( '--ping-timeout', default='1',
+                         help='ping timeout in seconds (default: 1)' )
+    parser.add_argument( '--output', default='bench-topologies.jsonl',
+                         help='JSON-lines file to append results to' )
+    parser.add_argument( 'topos', nargs='*', default=TOPOS )
+    args = parser.parse_args()
+    try:
+        args.tiers = dict( parseTier( shape ) for shape in args.shape )
+    except ValueError as e:
+        parser.error( str( e ) )
+    lg.setLogLevel( 'output' )
+    if not args.dry_run:
+        args.run = newRun()
+        cleanLeftovers( args.run )
+    bench( args )
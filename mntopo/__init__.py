@@ -0,0 +1,7 @@
+"""
+mntopo: shared helpers for the Mininet-Topo experiment scripts.
+
+The Net-to-*.py scripts build their topologies and then use the
+helpers in this package to bring the network up, connect it to the
+outside world and tear it down again.
+"""
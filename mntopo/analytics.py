@@ -0,0 +1,339 @@
+"""
+Structural analytics of topology specs, vectorized with NumPy and SciPy.
+
+analyze() turns a TopoSpec into a sparse switch adjacency matrix and
+computes, without building the network:
+
+- hops: all-pairs hop counts between switches (int16, -1: unreachable);
+  between two hosts it is the hop count of their switches plus 2
+- diameter: the longest shortest path, between switches and between
+  hosts
+- disjoint: edge-disjoint path counts (max flow over unit-capacity
+  links) between sampled pairs of edge switches
+- bisection: an approximate bisection width, the switch links cut by a
+  spectral split of the switches that divides the hosts in half
+- oversubscription: the load of every link, relative to its capacity,
+  when every host sends at line rate spread evenly over all other hosts
+  and traffic is split over all shortest paths (ECMP); 1 is a host link
+
+Hardware interfaces (intf lines) count as hosts of their switch. Link
+capacities come from bw= link parameters, in units of the host links'
+bw; links without bw count as host links.
+
+The arrays are kept in the result, and save() writes them to a .npz
+file for experiment scripts (numpy.load). NumPy and SciPy are only
+needed for this module.
+
+Usage: python -m mntopo.analytics [--pairs N] [--save DIR] topo ...
+"""
+
+import os
+from argparse import ArgumentParser
+from collections import OrderedDict
+
+import numpy as np
+from scipy.sparse import csr_matrix, diags
+from scipy.sparse.csgraph import ( depth_first_order, maximum_flow,
+                                   shortest_path )
+from scipy.sparse.linalg import eigsh
+
+from mininet.log import lg, output
+
+from mntopo.spec import loadSpec
+
+
+# Above this many switches, the Fiedler vector comes from sparse
+# shift-invert instead of a dense eigendecomposition
+DENSE_LIMIT = 500
+
+
+def switchGraph( spec ):
+    """Index spec's switches and links
+       returns: switch names, ( u, v ) index arrays of switch links,
+                host count per switch, host link ( switch, link ) lists"""
+    switches = spec.switchNames()
+    index = dict( ( name, i ) for i, name in enumerate( switches ) )
+    ends, hostLinks = [], []
+    hosts = np.zeros( len( switches ), dtype=np.int64 )
+    for n, ( node1, node2 ) in enumerate( spec.linkPairs() ):
+        if node1 in index and node2 in index:
+            ends.append( ( index[ node1 ], index[ node2 ] ) )
+        elif node1 in index or node2 in index:
+            switch = index[ node1 ] if node1 in index else index[ node2 ]
+            hosts[ switch ] += 1
+            hostLinks.append( ( switch, n ) )
+    for _intf, switch in spec.intfs:
+        hosts[ index[ switch ] ] += 1
+    ends = np.array( ends, dtype=np.int64 ).reshape( -1, 2 )
+    return switches, ends[ :, 0 ], ends[ :, 1 ], hosts, hostLinks
+
+def adjacency( n, u, v ):
+    "Return the symmetric n x n adjacency matrix, counting parallel links"
+    ones = np.ones( 2 * len( u ), dtype=np.int32 )
+    adj = csr_matrix( ( ones, ( np.concatenate( [ u, v ] ),
+                                np.concatenate( [ v, u ] ) ) ),
+                      shape=( n, n ) )
+    adj.sum_duplicates()
+    return adj
+
+def hopMatrix( adj, chunk=1024 ):
+    """Compute all-pairs hop counts, chunk sources at a time
+       returns: int16 matrix, -1 where there is no path"""
+    n = adj.shape[ 0 ]
+    hops = np.empty( ( n, n ), dtype=np.int16 )
+    for start in range( 0, n, chunk ):
+        rows = shortest_path( adj, directed=False, unweighted=True,
+                              indices=np.arange( start, min( n, start +
+                                                             chunk ) ) )
+        rows[ np.isinf( rows ) ] = -1
+        hops[ start:start + chunk ] = rows
+    return hops
+
+def disjointPaths( adj, pairs ):
+    """Count edge-disjoint paths between switch pairs
+       pairs: ( k, 2 ) array of switch indices
+       returns: int array of k path counts"""
+    graph = csr_matrix( adj, dtype=np.int32 )
+    return np.array( [ maximum_flow( graph, int( s ), int( t ) ).flow_value
+                       for s, t in pairs ], dtype=np.int64 )
+
+def fiedler( adj ):
+    "Return the Fiedler vector of the graph Laplacian of adj"
+    n = adj.shape[ 0 ]
+    adj = adj.astype( float )
+    laplacian = diags( np.asarray( adj.sum( axis=1 ) ).ravel() ) - adj
+    if n <= DENSE_LIMIT:
+        _values, vectors = np.linalg.eigh( laplacian.toarray() )
+    else:
+        # Shift-invert just below 0 finds the smallest eigenvalues
+        values, vectors = eigsh( laplacian.tocsc(), k=2,
+                                 sigma=-1e-3, which='LM' )
+        vectors = vectors[ :, np.argsort( values ) ]
+    return vectors[ :, 1 ]
+
+def sweepCut( order, u, v, weights ):
+    """Find the best balanced cut between a prefix of order and the rest
+       weights: per-switch weights; a prefix is balanced if it holds
+                half of them, give or take 5% or one switch's weight
+       returns: links cut, prefix length"""
+    n = len( order )
+    position = np.empty( n, dtype=np.int64 )
+    position[ order ] = np.arange( n )
+    low = np.minimum( position[ u ], position[ v ] )
+    high = np.maximum( position[ u ], position[ v ] )
+    # A prefix of length k cuts the links with low < k <= high
+    cuts = np.cumsum( np.bincount( low + 1, minlength=n + 1 ) -
+                      np.bincount( high + 1, minlength=n + 1 ) )[ 1:n ]
+    offset = np.abs( np.cumsum( weights[ order ] )[ :n - 1 ] -
+                     weights.sum() / 2.0 )
+    balanced = offset <= max( offset.min(), .05 * weights.sum(),
+                              weights.max() )
+    best = int( np.argmin( np.where( balanced, cuts, np.iinfo(
+        np.int64 ).max ) ) )
+    return int( cuts[ best ] ), best + 1
+
+def bisection( adj, u, v, weights ):
+    """Approximate the bisection width with the better of two sweeps: in
+       order of the Fiedler vector (spectral bisection, ties in DFS
+       order) and in DFS order from a peripheral switch
+       weights: per-switch weights (hosts) to divide in half
+       returns: width in links, bool array of the switches on one side"""
+    n = adj.shape[ 0 ]
+    side = np.zeros( n, dtype=bool )
+    if n < 2:
+        return 0, side
+    if not weights.any():
+        weights = np.ones( n, dtype=np.int64 )
+    # Unreached switches (other components) go last
+    start = int( np.argmax( shortest_path( adj, directed=False,
+                                           unweighted=True,
+                                           indices=0 ) ) )
+    dfs = depth_first_order( adj, start, directed=False,
+                             return_predecessors=False )
+    dfs = np.concatenate( [ dfs, np.setdiff1d( np.arange( n ), dfs ) ] )
+    rank = np.empty( n, dtype=np.int64 )
+    rank[ dfs ] = np.arange( n )
+    spectral = np.lexsort( ( rank, np.round( fiedler( adj ), 9 ) ) )
+    width, order, length = None, None, 0
+    for candidate in spectral, dfs:
+        cut, prefix = sweepCut( candidate, u, v, weights )
+        if width is None or cut < width:
+            width, order, length = cut, candidate, prefix
+    side[ order[ :length ] ] = True
+    return width, side
+
+def linkLoads( adj, hops, u, v, hosts, batch=256 ):
+    """Load on every switch link, each way, under all-to-all host traffic
+       split evenly over all shortest paths (Brandes' accumulation,
+       batch sources at a time); every host sends 1 in total
+       returns: loads from u to v, loads from v to u"""
+    total = hosts.sum()
+    forward = np.zeros( len( u ) )
+    backward = np.zeros( len( u ) )
+    sources = np.flatnonzero( hosts )
+    if total < 2:
+        return forward, backward
+    adj = adj.astype( float )
+    for start in range( 0, len( sources ), batch ):
+        src = sources[ start:start + batch ]
+        cols = np.arange( len( src ) )
+        # One column per source; flat indices of each distance level
+        dist = np.ascontiguousarray( hops[ src ].T )
+        # A stable sort of int16 is a radix sort
+        flat = np.argsort( dist, axis=None, kind='stable' )
+        bounds = np.searchsorted( dist.ravel()[ flat ],
+                                  np.arange( dist.max() + 2 ) )
+        levels = [ flat[ bounds[ l ]:bounds[ l + 1 ] ]
+                   for l in range( len( bounds ) - 1 ) ]
+        # Shortest paths from each source, level by level; the flat
+        # views index the same memory as the matrices
+        sigma = np.zeros( dist.shape )
+        sigma[ src, cols ] = 1
+        front = np.zeros( dist.shape )
+        sigmaFlat, frontFlat = sigma.ravel(), front.ravel()
+        for level in range( 1, len( levels ) ):
+            frontFlat[ levels[ level - 2 ] if level > 1 else [] ] = 0
+            frontFlat[ levels[ level - 1 ] ] = sigmaFlat[ levels[ level - 1 ] ]
+            sigmaFlat[ levels[ level ] ] = adj.dot( front ).ravel()[
+                levels[ level ] ]
+        # Traffic to deliver at or beyond each switch, back to front
+        demand = np.outer( hosts, hosts[ src ] ) / float( total - 1 )
+        demand[ src, cols ] = 0
+        delta = np.zeros( dist.shape )
+        perPath = np.zeros( dist.shape )
+        deltaFlat, perPathFlat = delta.ravel(), perPath.ravel()
+        demandFlat = demand.ravel()
+        for level in range( len( levels ) - 1, 0, -1 ):
+            at, above = levels[ level ], levels[ level - 1 ]
+            perPathFlat[ at ] = ( demandFlat[ at ] + deltaFlat[ at ] ) / \
+                sigmaFlat[ at ]
+            deltaFlat[ above ] += sigmaFlat[ above ] * adj.dot(
+                perPath ).ravel()[ above ]
+        forward += ( sigma[ u ] * perPath[ v ] *
+                     ( dist[ v ] == dist[ u ] + 1 ) ).sum( axis=1 )
+        backward += ( sigma[ v ] * perPath[ u ] *
+                      ( dist[ u ] == dist[ v ] + 1 ) ).sum( axis=1 )
+    return forward, backward
+
+def capacities( spec ):
+    "Return link capacities in units of host link bw, in link order"
+    switches = set( spec.switchNames() )
+    bw = np.array( [ params.get( 'bw', np.nan )
+                     for _node1, _node2, params in spec.links ], dtype=float )
+    access = [ bw[ n ] for n, ( node1, node2, _params ) in
+               enumerate( spec.links ) if ( node1 in switches ) !=
+               ( node2 in switches ) and not np.isnan( bw[ n ] ) ]
+    unit = np.median( access ) if access else 1.0
+    return np.where( np.isnan( bw ), 1.0, bw / unit )
+
+def samplePairs( candidates, count, seed ):
+    "Return up to count distinct unordered pairs of candidates"
+    candidates = np.asarray( candidates )
+    n = len( candidates )
+    if n * ( n - 1 ) // 2 <= count:
+        i, j = np.triu_indices( n, 1 )
+    else:
+        rng = np.random.RandomState( seed )
+        i = rng.randint( 0, n, 4 * count )
+        j = rng.randint( 0, n, 4 * count )
+        keep = i < j
+        pairs = np.unique( np.stack( [ i[ keep ], j[ keep ] ], 1 ), axis=0 )
+        pairs = pairs[ rng.permutation( len( pairs ) )[ :count ] ]
+        i, j = pairs[ :, 0 ], pairs[ :, 1 ]
+    return np.stack( [ candidates[ i ], candidates[ j ] ], 1 ).reshape(
+        -1, 2 )
+
+def analyze( spec, pairs=200, seed=1 ):
+    """Compute the structural properties of spec
+       pairs: edge switch pairs to count disjoint paths for
+       seed: random seed for sampling them
+       returns: OrderedDict of scalars and NumPy arrays"""
+    switches, u, v, hosts, hostLinks = switchGraph( spec )
+    n = len( switches )
+    adj = adjacency( n, u, v )
+    hops = hopMatrix( adj )
+    edge = np.flatnonzero( hosts ) if hosts.any() else np.arange( n )
+    edgeHops = hops[ np.ix_( edge, edge ) ]
+    reachable = edgeHops[ edgeHops > 0 ]
+    sampled = samplePairs( edge, pairs, seed )
+    disjoint = disjointPaths( adj, sampled )
+    width, side = bisection( adj, u, v, hosts )
+    forward, backward = linkLoads( adj, hops, u, v, hosts )
+    # Switch links, then host links, with their load and capacity
+    names = np.array( [ '%s-%s' % pair for pair in spec.linkPairs() ] )
+    isSwitch = set( switches ).__contains__
+    switchLinks = [ n for n, ( node1, node2 ) in enumerate(
+        spec.linkPairs() ) if isSwitch( node1 ) and isSwitch( node2 ) ]
+    order = np.array( switchLinks + [ n for _switch, n in hostLinks ],
+                      dtype=np.int64 )
+    load = np.concatenate( [ np.maximum( forward, backward ),
+                             np.ones( len( hostLinks ) ) ] )
+    capacity = capacities( spec )[ order ] if len( order ) else np.zeros( 0 )
+    oversubscription = load / capacity
+    hostCount = int( hosts.sum() )
+    return OrderedDict( [
+        ( 'name', spec.name ),
+        ( 'switches', n ),
+        ( 'hosts', hostCount ),
+        ( 'links', len( spec.links ) ),
+        ( 'diameter', int( hops.max() ) if n else 0 ),
+        ( 'hostDiameter', int( reachable.max() ) + 2 if len( reachable )
+          else 2 if hostCount > 1 else 0 ),
+        ( 'meanHostHops', float(
+            ( ( edgeHops.clip( 0 ) + 2 ) * np.outer( hosts[ edge ],
+                                                     hosts[ edge ] ) ).sum()
+            - 2 * hostCount ) / max( 1, hostCount * ( hostCount - 1 ) ) ),
+        ( 'minDisjoint', int( disjoint.min() ) if len( disjoint ) else 0 ),
+        ( 'medianDisjoint', float( np.median( disjoint ) )
+          if len( disjoint ) else 0.0 ),
+        ( 'bisection', width ),
+        ( 'maxOversubscription', float( oversubscription.max() )
+          if len( order ) else 0.0 ),
+        ( 'worstLink', str( names[ order[ oversubscription.argmax() ] ] )
+          if len( order ) else '' ),
+        ( 'switchNames', np.array( switches ) ),
+        ( 'hostsPerSwitch', hosts ),
+        ( 'hops', hops ),
+        ( 'disjointPairs', sampled ),
+        ( 'disjoint', disjoint ),
+        ( 'side', side ),
+        ( 'linkNames', names[ order ] ),
+        ( 'load', load ),
+        ( 'capacity', capacity ),
+        ( 'oversubscription', oversubscription ) ] )
+
+def save( result, path ):
+    "Write result's arrays and scalars to a .npz file at path"
+    np.savez_compressed( path, **dict( ( key, np.asarray( value ) )
+                                       for key, value in result.items() ) )
+
+def report( result ):
+    "Log a one-line summary of an analyze() result"
+    output( '%-12s %6d %6d %6d %4d/%-4d %7.2f %4d/%-6.1f %6d %8.2f  %s\n' % (
+        result[ 'name' ], result[ 'switches' ], result[ 'hosts' ],
+        result[ 'links' ], result[ 'diameter' ], result[ 'hostDiameter' ],
+        result[ 'meanHostHops' ], result[ 'minDisjoint' ],
+        result[ 'medianDisjoint' ], result[ 'bisection' ],
+        result[ 'maxOversubscription' ], result[ 'worstLink' ] ) )
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser( description='Analyze topology structure' )
+    parser.add_argument( '--pairs', type=int, default=200,
+                         help='edge switch pairs to count disjoint paths '
+                              'for (default: 200)' )
+    parser.add_argument( '--seed', type=int, default=1 )
+    parser.add_argument( '--save', metavar='DIR',
+                         help='write each result to DIR/TOPO.npz' )
+    parser.add_argument( 'topos', nargs='+' )
+    args = parser.parse_args()
+    lg.setLogLevel( 'output' )
+    output( '%-12s %6s %6s %6s %9s %7s %11s %6s %8s  %s\n' % (
+        'topology', 'sw', 'hosts', 'links', 'diameter', 'hops',
+        'disjoint', 'bisect', 'oversub', 'worst link' ) )
+    for topo in args.topos:
+        analysis = analyze( loadSpec( topo ), args.pairs, args.seed )
+        report( analysis )
+        if args.save:
+            save( analysis, os.path.join( args.save,
+                                          analysis[ 'name' ] + '.npz' ) )
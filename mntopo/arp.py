@@ -0,0 +1,111 @@
+"""
+Static neighbor (ARP) tables.
+
+In one flat subnet, the first all-pairs test makes every host ARP for
+every other host, and every request is broadcast through all switches
+(and, with a reactive controller, to the controller). fillNeighbors()
+instead gives every node a permanent neighbor entry for every other
+node before any traffic flows: the MAC addresses are read from all
+nodes at once, then each node loads its entries with one ip -batch
+script, all nodes concurrently.
+"""
+
+import re
+
+from mininet.log import error, info
+
+from mntopo.pipeline import CmdPipeline, failures, runPipelines
+from mntopo.util import dottedQuad, ipBatchCmd
+
+
+LINK_MAC = re.compile( r'link/ether ([0-9a-f]{2}(?::[0-9a-f]{2}){5})' )
+# The kernel's ARP table is shared by all network namespaces; dynamic
+# entries beyond gc_thresh3 fail with 'neighbor table overflow'
+GC_THRESH = '/proc/sys/net/ipv4/neigh/default/gc_thresh%d'
+
+
+def readMACs( nodes ):
+    """Read the MAC address of every node's default interface, all nodes
+       concurrently, and update the interfaces with it
+       returns: dict of node name -> MAC (None if it is unknown)"""
+    pipelines = [ CmdPipeline( node ).add( 'ip -o link show',
+                                           node.defaultIntf() )
+                  for node in nodes ]
+    macs = {}
+    for node, results in zip( nodes, runPipelines( pipelines ) ):
+        intf = node.defaultIntf()
+        match = LINK_MAC.search( ''.join( r.output for r in results ) )
+        if match:
+            intf.mac = match.group( 1 )
+        macs[ node.name ] = intf.MAC()
+    return macs
+
+def fitNeighborTable( entries ):
+    """Raise the kernel's ARP table limits, if needed, to fit this many
+       dynamic entries (Mininet's fixLimits() only allows 16k)
+       returns: True if the limits were raised"""
+    limits = [ entries // 4, entries // 2, entries ]
+    try:
+        current = []
+        for n in 1, 2, 3:
+            with open( GC_THRESH % n ) as f:
+                current.append( int( f.read() ) )
+        if current[ 2 ] >= entries:
+            return False
+        for n, ( limit, value ) in enumerate( zip( limits, current ), 1 ):
+            with open( GC_THRESH % n, 'w' ) as f:
+                f.write( '%d\n' % max( limit, value ) )
+    except ( IOError, OSError, ValueError ) as e:
+        error( '*** Cannot size the ARP table for %d entries: %s\n' %
+               ( entries, e ) )
+        return False
+    info( '*** Raised the ARP table limit from %d to %d entries\n' %
+          ( current[ 2 ], entries ) )
+    return True
+
+def neighborBatch( node, entries ):
+    """Return the ip -batch lines that add entries to node's neighbors
+       node: Mininet node
+       entries: list of ( IP, MAC ); node's own address is skipped"""
+    intf = node.defaultIntf()
+    own = dottedQuad( intf.IP() ) if intf.IP() else None
+    return [ 'neigh replace %s lladdr %s dev %s nud permanent' %
+             ( ip, mac, intf ) for ip, mac in entries if ip != own ]
+
+def fillNeighbors( nodes, new=None ):
+    """Give every node a permanent neighbor entry for all the others
+       nodes: Mininet hosts, plus e.g. the root node as the gateway
+       new: only add the entries of and for these of the nodes, e.g.
+            hosts added to a network whose tables are filled already
+       returns: dict of node name -> error output, for failed nodes"""
+    nodes = list( nodes )
+    new = None if new is None else set( node.name for node in new )
+    macs = readMACs( nodes )
+    # Addresses may be abbreviated like the gateway's ( '10.254' )
+    known = [ ( node.name, ( dottedQuad( node.IP() ), macs[ node.name ] ) )
+              for node in nodes if node.IP() and macs[ node.name ] ]
+    missing = sorted( node.name for node in nodes
+                      if not ( node.IP() and macs[ node.name ] ) )
+    if missing:
+        error( '*** No address known for %s; leaving them to ARP\n' %
+               ' '.join( missing ) )
+    entries = [ entry for _name, entry in known ]
+    # Nodes that have the others' entries only need the new ones
+    newEntries = [ entry for name, entry in known
+                   if new is None or name in new ]
+    batches = [ neighborBatch( node, entries if new is None or
+                               node.name in new else newEntries )
+                for node in nodes ]
+    pipelines = [ CmdPipeline( node ).add( ipBatchCmd( batch ) )
+                  for node, batch in zip( nodes, batches ) if batch ]
+    errors = {}
+    for pipeline, results in zip( pipelines, runPipelines( pipelines ) ):
+        output = ''.join( result.output for result in results ).strip()
+        if failures( results ) or output:
+            errors[ pipeline.node.name ] = output
+    for name in sorted( errors ):
+        error( '*** Neighbor setup failed on %s: %s\n' %
+               ( name, errors[ name ] ) )
+    info( '*** Added %d static neighbor entries on %d nodes\n' %
+          ( sum( len( batch ) for batch in batches ), len( pipelines ) ) )
+    return errors
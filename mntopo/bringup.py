@@ -0,0 +1,195 @@
+"""
+Parallel network bring-up for large topologies.
+
+Host namespaces, switches, veth pairs and OVS bridges are created by a
+bounded pool of worker threads instead of one at a time. Steps that
+depend on each other still run in order:
+
+- links are only created once all hosts and switches exist
+- links are created in rounds; a node takes part in at most one link
+  per round, and each node's links keep their spec order, so shells
+  are never shared between workers and port numbers come out exactly
+  as with the serial build
+- bridges are only started once every link exists
+- the network counts as started once every switch has connected to its
+  controller (mntopo.ready.waitReady)
+
+With a single worker the network is started with Mininet's own
+net.start(), so serial runs behave exactly as before.
+
+Each step is recorded as a phase in a PhaseTimer, and the time each
+switch took to connect as a 'switch connect' sample.
+"""
+
+import time
+from itertools import groupby
+
+from mininet.log import info
+from mininet.node import RemoteController
+from mininet.util import ipAdd, macColonHex
+
+from mntopo.ready import waitReady
+from mntopo.util import parallelMap
+
+
+def linkRounds( pairs ):
+    """Schedule links into rounds of node-disjoint links
+       pairs: list of ( node1, node2 ) names, in creation order
+       returns: list of rounds, each a list of indices into pairs"""
+    lastRound = {}
+    rounds = []
+    for index, ( node1, node2 ) in enumerate( pairs ):
+        current = max( lastRound.get( node1, -1 ),
+                       lastRound.get( node2, -1 ) ) + 1
+        if current == len( rounds ):
+            rounds.append( [] )
+        rounds[ current ].append( index )
+        lastRound[ node1 ] = lastRound[ node2 ] = current
+    return rounds
+
+def hostDefaults( net, params ):
+    """Return the parameters Mininet.addHost would use for the next host,
+       advancing net's IP (and core) counters the same way"""
+    defaults = { 'ip': ipAdd( net.nextIP, ipBaseNum=net.ipBaseNum,
+                              prefixLen=net.prefixLen ) +
+                       '/%s' % net.prefixLen }
+    if net.autoSetMacs:
+        defaults[ 'mac' ] = macColonHex( net.nextIP )
+    if net.autoPinCpus:
+        defaults[ 'cores' ] = net.nextCore
+        net.nextCore = ( net.nextCore + 1 ) % net.numCores
+    net.nextIP += 1
+    defaults.update( params )
+    return defaults
+
+def switchDefaults( net, params ):
+    """Return the parameters Mininet.addSwitch would use for the next
+       switch, advancing net's listen port the same way"""
+    defaults = { 'listenPort': net.listenPort,
+                 'inNamespace': net.inNamespace }
+    if not net.inNamespace and net.listenPort:
+        net.listenPort += 1
+    defaults.update( params )
+    return defaults
+
+def addNodes( net, nodes, cls, registry, workers ):
+    """Create nodes in parallel and register them with net in order
+       nodes: list of ( name, params ) with defaults already applied
+       cls: node class
+       registry: net list to append the nodes to"""
+    created = parallelMap( lambda node: cls( node[ 0 ], **node[ 1 ] ),
+                           nodes, workers )
+    for node in created:
+        registry.append( node )
+        net.nameToNode[ node.name ] = node
+    return created
+
+def parallelBuild( spec, net, workers, timer, controller=RemoteController ):
+    """Build spec into net with up to workers concurrent node operations
+       spec: TopoSpec
+       net: Mininet object
+       workers: size of the worker pool
+       timer: PhaseTimer
+       controller: class of the spec's controllers"""
+    for name, ip, params in spec.controllers:
+        net.addController( name, controller=controller, ip=ip, **params )
+    with timer.phase( 'switches' ):
+        switches = [ ( name, switchDefaults( net, params ) )
+                     for name, params in spec.switches ]
+        addNodes( net, switches, net.switch, net.switches, workers )
+    with timer.phase( 'hosts' ):
+        hosts = [ ( name, hostDefaults( net, params ) )
+                  for name, params in spec.hosts ]
+        addNodes( net, hosts, net.host, net.hosts, workers )
+    with timer.phase( 'links' ):
+        first = len( net.links )
+        links = [ None ] * len( spec.links )
+
+        def addLink( index ):
+            "Create link index of the spec"
+            node1, node2, params = spec.links[ index ]
+            links[ index ] = net.addLink( net.get( node1 ), net.get( node2 ),
+                                          **params )
+
+        rounds = linkRounds( spec.linkPairs() )
+        for indices in rounds:
+            parallelMap( addLink, indices, workers )
+        # Keep net.links in spec order, as the serial build would
+        net.links[ first: ] = links
+        info( '*** Created %d links in %d rounds\n' %
+              ( len( links ), len( rounds ) ) )
+    return net
+
+def configHost( host ):
+    "Configure a host's default interface, as Mininet.configHosts does"
+    if host.defaultIntf():
+        host.configDefault()
+    else:
+        # Don't configure nonexistent intf
+        host.configDefault( ip=None, mac=None )
+
+def parallelConfig( net, workers ):
+    "Do what Mininet.build does, configuring the hosts in parallel"
+    if net.inNamespace:
+        net.configureControlNetwork()
+    parallelMap( configHost, net.hosts, workers )
+    if net.xterms:
+        net.startTerms()
+    if net.autoStaticArp:
+        net.staticArp()
+    net.built = True
+
+def parallelStart( net, workers, timer, connectTimeout=10 ):
+    """Start net with up to workers concurrent node operations,
+       replacing net.start() (which runs as is for one worker)
+       net: Mininet object built by parallelBuild or buildNet
+       workers: size of the worker pool
+       timer: PhaseTimer
+       connectTimeout: seconds to wait for switches to connect (0: don't)
+       returns: dict of switch name -> seconds to connect (None: timed
+                out), empty if connectTimeout is 0"""
+    if workers <= 1:
+        with timer.phase( 'bridges' ):
+            net.start()
+            now = time.time()
+            started = dict( ( switch.name, now ) for switch in net.switches )
+    else:
+        started = parallelSwitches( net, workers, timer )
+    if not connectTimeout:
+        return {}
+    with timer.phase( 'connect' ):
+        ready = waitReady( net.switches, started, connectTimeout,
+                           workers=workers )
+    for seconds in ready.values():
+        if seconds is not None:
+            timer.sample( 'switch connect', seconds )
+    return ready
+
+def parallelSwitches( net, workers, timer ):
+    """Configure the hosts if needed, start the controllers and start the
+       switches with up to workers concurrent operations
+       returns: dict of switch name -> time its bridge was configured"""
+    if not net.built:
+        with timer.phase( 'config' ):
+            parallelConfig( net, workers )
+    with timer.phase( 'controller' ):
+        for controller in net.controllers:
+            controller.start()
+    started = {}
+
+    def startSwitch( switch ):
+        "Start a switch and note when its bridge was configured"
+        switch.start( net.controllers )
+        started[ switch.name ] = time.time()
+
+    with timer.phase( 'bridges' ):
+        parallelMap( startSwitch, net.switches, workers )
+        for swclass, switches in groupby(
+                sorted( net.switches, key=lambda s: str( type( s ) ) ),
+                type ):
+            if hasattr( swclass, 'batchStartup' ):
+                switches = tuple( switches )
+                swclass.batchStartup( switches )
+                now = time.time()
+                started.update( ( switch.name, now ) for switch in switches )
+    return started
@@ -0,0 +1,103 @@
+"""
+Parametric campus-tree generator modeled on Net-to-NTTUtree.py.
+
+The tree is described tier by tier below the core switch s1:
+
+    fanouts: one entry per tier, the number of child switches of each
+             switch in the tier above; a sequence is a pattern that is
+             cycled over that tier's switches in order
+    hosts: one entry per tier including the core, the number of hosts
+           on each leaf switch (a switch without children) of that
+           tier; patterns are cycled over the tier's leaves
+
+Switches are numbered breadth first and hosts from the deepest tier up,
+which is exactly how the NTTU tree is laid out, so the defaults below
+reproduce topos/nttutree.topo. Everything is built with appends in one
+pass, so generation is linear in the size of the tree.
+
+Usage: python -m mntopo.campus --fanout 10 10 10 --hosts 0 0 0 3,7
+"""
+
+import sys
+from argparse import ArgumentParser
+from itertools import cycle
+
+from mntopo.spec import TopoSpec, formatSpec
+
+
+# The NTTU layout: s1 -> 6 distribution switches, of which s3 and s7
+# serve hosts directly, then two edge switches per aggregation switch
+# (four under s12), alternately serving 3 and 7 hosts (17 on s38)
+NTTU_FANOUTS = [ 6, ( 5, 0, 6, 2, 6, 0 ), ( 2, 2, 2, 2, 4 ) + ( 2, ) * 14 ]
+NTTU_HOSTS = [ 0, ( 5, 25 ), 0, ( 3, 7 ) * 5 + ( 3, 17 ) + ( 3, 7 ) * 14 ]
+NTTU_CONTROLLER = ( 'C0', '192.168.176.132' )
+
+
+def pattern( value ):
+    "Return an endless iterator over an int or a sequence pattern"
+    return cycle( value if isinstance( value, ( list, tuple ) ) else
+                  [ value ] )
+
+def campusSpec( fanouts=NTTU_FANOUTS, hosts=NTTU_HOSTS,
+                controller=NTTU_CONTROLLER, name='campus' ):
+    """Generate a campus tree spec
+       fanouts: per-tier child switch counts (ints or cycled patterns)
+       hosts: per-tier hosts-per-leaf counts, core tier first;
+              missing tiers get no hosts
+       controller: ( name, ip ) of the remote controller, or None
+       name: spec name
+       returns: TopoSpec"""
+    spec = TopoSpec( name )
+    if controller:
+        spec.addController( *controller )
+    spec.addSwitch( 's1' )
+    tiers = [ [ 's1' ] ]
+    links = []
+    for fanout in fanouts:
+        children = []
+        counts = pattern( fanout )
+        for parent in tiers[ -1 ]:
+            for _ in range( next( counts ) ):
+                child = 's%d' % ( len( spec.switches ) + 1 )
+                spec.addSwitch( child )
+                links.append( ( parent, child ) )
+                children.append( child )
+        tiers.append( children )
+    parents = set( parent for parent, _child in links )
+    hostLinks = []
+    hosts = list( hosts ) + [ 0 ] * ( len( tiers ) - len( hosts ) )
+    for tier, count in reversed( list( zip( tiers, hosts ) ) ):
+        counts = pattern( count )
+        for switch in tier:
+            if switch in parents:
+                continue
+            for _ in range( next( counts ) ):
+                host = 'h%d' % ( len( spec.hosts ) + 1 )
+                spec.addHost( host )
+                hostLinks.append( ( switch, host ) )
+    for node1, node2 in links + hostLinks:
+        spec.addLink( node1, node2 )
+    return spec
+
+def parsePattern( arg ):
+    "Parse a command-line pattern such as '3,7' into a tuple of ints"
+    return tuple( int( n ) for n in arg.split( ',' ) )
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser( description='Generate a campus tree spec' )
+    parser.add_argument( '--fanout', nargs='+', type=parsePattern,
+                         help='child switches per switch, one per tier' )
+    parser.add_argument( '--hosts', nargs='+', type=parsePattern,
+                         help='hosts per leaf switch, one per tier '
+                              'starting with the core' )
+    parser.add_argument( '--name', default='campus' )
+    args = parser.parse_args()
+    if bool( args.fanout ) != bool( args.hosts ):
+        parser.error( '--fanout and --hosts go together' )
+    if args.fanout:
+        spec = campusSpec( args.fanout, args.hosts, name=args.name )
+    else:
+        spec = campusSpec( name=args.name )
+    sys.stdout.write( '# %r\n' % spec )
+    sys.stdout.write( '\n'.join( formatSpec( spec ) ) + '\n' )
@@ -0,0 +1,329 @@
+"""
+Minimal local OpenFlow 1.3 controller, so a topology can be brought up
+and benchmarked without the lab controller at 192.168.176.132.
+
+It does L2 learning with proactive flow installation: when a MAC
+address is first seen on a switch port, a flow forwarding that address
+to the port is installed at once, before anyone sends to it, so the
+reply direction never reaches the controller. Packets to unknown
+destinations are flooded. When it connects, a switch's flows are
+cleared (unless --keep-flows is given, e.g. for flows pushed by
+mntopo.flows) and it gets a table-miss flow sending unmatched packets
+to the controller.
+
+The controller is a single select() loop without dependencies beyond
+the standard library. Messages are parsed with precompiled structs and
+all replies to one read are written with one send, so it handles many
+thousands of PACKET_INs per second (see bench.controller).
+
+Usage: python -m mntopo.controller [--port 6653] [--idle-timeout N]
+           [--keep-flows]
+
+LocalController runs it as a Mininet controller (Net-to-*.py
+--controller local). Mininet gives every switch a passive OpenFlow port
+counting up from its listenPort; with LISTEN_PORT, above the
+controller's, no switch takes the controller's port.
+"""
+
+import os
+import select
+import signal
+import socket
+import struct
+import sys
+import time
+from argparse import ArgumentParser
+
+from mininet.node import Controller
+
+
+PORT = 6653
+# First switch listenPort for networks using the local controller
+LISTEN_PORT = PORT + 1
+
+OFP_VERSION = 4
+
+OFPT_HELLO = 0
+OFPT_ERROR = 1
+OFPT_ECHO_REQUEST = 2
+OFPT_ECHO_REPLY = 3
+OFPT_FEATURES_REQUEST = 5
+OFPT_FEATURES_REPLY = 6
+OFPT_SET_CONFIG = 9
+OFPT_PACKET_IN = 10
+OFPT_PACKET_OUT = 13
+OFPT_FLOW_MOD = 14
+
+OFPP_FLOOD = 0xfffffffb
+OFPP_CONTROLLER = 0xfffffffd
+OFPP_ANY = 0xffffffff
+OFP_NO_BUFFER = 0xffffffff
+OFPCML_NO_BUFFER = 0xffff
+OFPTT_ALL = 0xff
+OFPFC_ADD = 0
+OFPFC_DELETE = 3
+OFPMT_OXM = 1
+OFPIT_APPLY_ACTIONS = 4
+OFPAT_OUTPUT = 0
+
+# OXM headers: class 0x8000, field << 9, value length
+OXM_IN_PORT = 0x80000004
+OXM_ETH_DST = 0x80000606
+
+LEARNED_PRIORITY = 10
+ETH_TYPE_LLDP = 0x88cc
+
+HEADER = struct.Struct( '!BBHI' )
+PACKET_IN = struct.Struct( '!IHBBQ' )
+MATCH = struct.Struct( '!HH' )
+OXM = struct.Struct( '!I' )
+FLOW_MOD = struct.Struct( '!QQBBHHHIIIH2x' )
+OUTPUT = struct.Struct( '!HHIH6x' )
+PACKET_OUT = struct.Struct( '!IIH6x' )
+FEATURES = struct.Struct( '!QIBB2xII' )
+
+
+def message( msgType, body=b'', xid=0 ):
+    "Return an OpenFlow 1.3 message"
+    return HEADER.pack( OFP_VERSION, msgType, HEADER.size + len( body ),
+                        xid ) + body
+
+def match( *oxms ):
+    "Return an OXM match of packed ( header, value ) fields"
+    fields = b''.join( OXM.pack( header ) + value for header, value in oxms )
+    length = MATCH.size + len( fields )
+    return MATCH.pack( OFPMT_OXM, length ) + fields + b'\0' * ( -length % 8 )
+
+def outputAction( port ):
+    "Return an output action"
+    return OUTPUT.pack( OFPAT_OUTPUT, OUTPUT.size, port, OFPCML_NO_BUFFER )
+
+def flowMod( matchBytes, actions=b'', priority=0, command=OFPFC_ADD,
+             idleTimeout=0, table=0 ):
+    "Return a FLOW_MOD applying actions to packets matching matchBytes"
+    instructions = b''
+    if actions:
+        instructions = struct.pack( '!HH4x', OFPIT_APPLY_ACTIONS,
+                                    8 + len( actions ) ) + actions
+    return message( OFPT_FLOW_MOD, FLOW_MOD.pack(
+        0, 0, table, command, idleTimeout, 0, priority, OFP_NO_BUFFER,
+        OFPP_ANY, OFPP_ANY, 0 ) + matchBytes + instructions )
+
+def packetOut( bufferId, inPort, actions, data=b'' ):
+    "Return a PACKET_OUT, carrying data unless the switch buffered it"
+    if bufferId != OFP_NO_BUFFER:
+        data = b''
+    return message( OFPT_PACKET_OUT, PACKET_OUT.pack(
+        bufferId, inPort, len( actions ) ) + actions + data )
+
+def parsePacketIn( msg ):
+    """Parse a PACKET_IN
+       returns: buffer id, in_port, packet data"""
+    bufferId, _total, _reason, _table, _cookie = PACKET_IN.unpack_from(
+        msg, HEADER.size )
+    offset = HEADER.size + PACKET_IN.size
+    _type, length = MATCH.unpack_from( msg, offset )
+    inPort, pos = None, offset + MATCH.size
+    while pos < offset + length:
+        header, = OXM.unpack_from( msg, pos )
+        if header & 0xfffffe00 == OXM_IN_PORT & 0xfffffe00:
+            inPort, = OXM.unpack_from( msg, pos + OXM.size )
+        pos += OXM.size + ( header & 0xff )
+    data = msg[ offset + length + ( -length % 8 ) + 2: ]
+    return bufferId, inPort, data
+
+
+class Connection( object ):
+    "A switch connected to the controller"
+
+    def __init__( self, sock ):
+        self.sock = sock
+        self.inbuf = b''
+        self.outbuf = []
+        self.dpid = None
+        self.macs = {}
+
+    def send( self, msg ):
+        "Queue a message; flush() sends everything queued"
+        self.outbuf.append( msg )
+
+    def flush( self ):
+        "Send the queued messages in one write"
+        if self.outbuf:
+            self.sock.sendall( b''.join( self.outbuf ) )
+            self.outbuf = []
+
+    def messages( self, data ):
+        "Add received data and return the complete messages in it"
+        buf = self.inbuf + data if self.inbuf else data
+        msgs = []
+        pos = 0
+        while len( buf ) - pos >= HEADER.size:
+            _version, _type, length, _xid = HEADER.unpack_from( buf, pos )
+            if len( buf ) - pos < length or length < HEADER.size:
+                break
+            msgs.append( buf[ pos:pos + length ] )
+            pos += length
+        self.inbuf = buf[ pos: ]
+        return msgs
+
+
+class LearningController( object ):
+    "OpenFlow 1.3 L2 learning controller with proactive flow installation"
+
+    def __init__( self, port=PORT, idleTimeout=0, keepFlows=False,
+                  log=sys.stderr ):
+        self.port = port
+        self.idleTimeout = idleTimeout
+        self.keepFlows = keepFlows
+        self.log = log
+        self.connections = {}
+        self.counts = dict( packetIn=0, flowMod=0, packetOut=0 )
+        self.server = None
+
+    def listen( self ):
+        "Open the listening socket"
+        self.server = socket.socket( socket.AF_INET, socket.SOCK_STREAM )
+        self.server.setsockopt( socket.SOL_SOCKET, socket.SO_REUSEADDR, 1 )
+        self.server.bind( ( '', self.port ) )
+        self.server.listen( 128 )
+
+    def serve( self ):
+        "Handle switches until interrupted"
+        if self.server is None:
+            self.listen()
+        while True:
+            readable, _, _ = select.select(
+                [ self.server ] + list( self.connections ), [], [] )
+            for sock in readable:
+                if sock is self.server:
+                    self.accept()
+                else:
+                    self.receive( sock )
+
+    def accept( self ):
+        "Greet a new switch"
+        sock, _addr = self.server.accept()
+        sock.setsockopt( socket.IPPROTO_TCP, socket.TCP_NODELAY, 1 )
+        conn = Connection( sock )
+        self.connections[ sock ] = conn
+        conn.send( message( OFPT_HELLO ) )
+        conn.send( message( OFPT_FEATURES_REQUEST ) )
+        conn.send( message( OFPT_SET_CONFIG,
+                            struct.pack( '!HH', 0, OFPCML_NO_BUFFER ) ) )
+        conn.flush()
+
+    def close( self, sock ):
+        "Forget a disconnected switch"
+        conn = self.connections.pop( sock )
+        sock.close()
+        if conn.dpid is not None:
+            self.log.write( 'switch %016x disconnected\n' % conn.dpid )
+
+    def receive( self, sock ):
+        "Handle everything a switch has sent"
+        conn = self.connections[ sock ]
+        try:
+            data = sock.recv( 65536 )
+        except socket.error:
+            data = b''
+        if not data:
+            self.close( sock )
+            return
+        for msg in conn.messages( data ):
+            self.handle( conn, msg )
+        try:
+            conn.flush()
+        except socket.error:
+            self.close( sock )
+
+    def handle( self, conn, msg ):
+        "Handle one message from a switch"
+        msgType = ord( msg[ 1:2 ] )
+        if msgType == OFPT_PACKET_IN:
+            self.packetIn( conn, msg )
+        elif msgType == OFPT_ECHO_REQUEST:
+            _v, _t, _l, xid = HEADER.unpack_from( msg )
+            conn.send( message( OFPT_ECHO_REPLY, msg[ HEADER.size: ], xid ) )
+        elif msgType == OFPT_FEATURES_REPLY:
+            conn.dpid = FEATURES.unpack_from( msg, HEADER.size )[ 0 ]
+            self.log.write( 'switch %016x connected\n' % conn.dpid )
+            self.switchUp( conn )
+        elif msgType == OFPT_ERROR:
+            errType, code = struct.unpack_from( '!HH', msg, HEADER.size )
+            self.log.write( 'error from %s: type %d code %d\n' %
+                            ( conn.dpid, errType, code ) )
+
+    def switchUp( self, conn ):
+        "Clear a new switch's flows and send table misses to us"
+        if not self.keepFlows:
+            conn.send( flowMod( match(), command=OFPFC_DELETE,
+                                table=OFPTT_ALL ) )
+        conn.send( flowMod( match(), outputAction( OFPP_CONTROLLER ) ) )
+
+    def packetIn( self, conn, msg ):
+        "Learn the source, install its flow, and forward the packet"
+        self.counts[ 'packetIn' ] += 1
+        bufferId, inPort, data = parsePacketIn( msg )
+        if len( data ) < 14 or inPort is None:
+            return
+        if struct.unpack_from( '!H', data, 12 )[ 0 ] == ETH_TYPE_LLDP:
+            return
+        dst, src = data[ 0:6 ], data[ 6:12 ]
+        # Proactively install the flow back to a newly seen source
+        if not ord( src[ 0:1 ] ) & 1 and conn.macs.get( src ) != inPort:
+            conn.macs[ src ] = inPort
+            conn.send( flowMod( match( ( OXM_ETH_DST, src ) ),
+                                outputAction( inPort ), LEARNED_PRIORITY,
+                                idleTimeout=self.idleTimeout ) )
+            self.counts[ 'flowMod' ] += 1
+        outPort = conn.macs.get( dst, OFPP_FLOOD )
+        if outPort == inPort:
+            return
+        conn.send( packetOut( bufferId, inPort, outputAction( outPort ),
+                                data ) )
+        self.counts[ 'packetOut' ] += 1
+
+    def summary( self ):
+        "Return message counts as a string"
+        return ' '.join( '%s=%d' % item for item in sorted(
+            self.counts.items() ) )
+
+
+class LocalController( Controller ):
+    "Mininet controller running the bundled mntopo.controller locally"
+
+    def __init__( self, name, ip='127.0.0.1', port=PORT, idleTimeout=0,
+                  keepFlows=False, **params ):
+        repo = os.path.dirname( os.path.dirname( os.path.abspath(
+            __file__ ) ) )
+        cargs = '-m mntopo.controller --idle-timeout %d' % idleTimeout
+        if keepFlows:
+            cargs += ' --keep-flows'
+        Controller.__init__(
+            self, name, ip=ip, port=port, command=sys.executable,
+            cargs=cargs + ' --port %d', cdir=repo, **params )
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser( description='Local OpenFlow 1.3 L2 learning '
+                                         'controller' )
+    parser.add_argument( '--port', type=int, default=PORT,
+                         help='TCP port to listen on (default: 6653)' )
+    parser.add_argument( '--idle-timeout', type=int, default=0,
+                         help='idle timeout of learned flows in seconds '
+                              '(default: 0, permanent)' )
+    parser.add_argument( '--keep-flows', action='store_true',
+                         help="don't clear the flows of connecting switches" )
+    args = parser.parse_args()
+    controller = LearningController( args.port, args.idle_timeout,
+                                     args.keep_flows )
+    signal.signal( signal.SIGTERM, lambda *_args: sys.exit( 0 ) )
+    start = time.time()
+    try:
+        controller.serve()
+    except ( KeyboardInterrupt, SystemExit ):
+        pass
+    finally:
+        sys.stderr.write( 'served %.1fs: %s\n' %
+                          ( time.time() - start, controller.summary() ) )
@@ -0,0 +1,520 @@
+"""
+Dry-run Mininet backend that records operations instead of running them.
+
+DryRunNet accepts the same calls as Mininet (addController, addSwitch,
+addHost, addLink, net.intf, start, stop, pingAll, ...), and buildNet(),
+addHwIntfs(), parallelStart() and connectToInternet() run against it
+unchanged, but no namespace, link, bridge or shell is ever created.
+Every shell command a node would run is recorded in net.log as an Op
+with its kind (namespace, link, intf, ovs, iptables, route, ...) and
+the round trip it belongs to, and is answered as if it had succeeded.
+This needs neither root nor Open vSwitch:
+
+    net = buildNet( loadSpec( 'nttutree' ), DryRunNet( listenPort=6633 ) )
+    connectToInternet( net, root=net.rootNode() )
+    print( estimate( net.log ) )
+
+plan() turns the log into a structured plan with command counts and an
+estimated bring-up time from per-command costs (COSTS).
+
+Usage: python -m mntopo.dryrun [--plan FILE] [--cost KIND=MS] topo ...
+"""
+
+import json
+import re
+import struct
+import time
+from argparse import ArgumentParser
+from collections import OrderedDict, namedtuple
+from functools import partial
+from itertools import count
+from threading import Lock
+
+from mininet.log import lg, output
+from mininet.util import netParse
+
+from mntopo.bringup import hostDefaults, switchDefaults
+
+
+# One command of a CmdPipeline script and its status marker; the
+# markers are answered as if every command succeeded
+PIPELINED = re.compile( r"\{ (.*?)(?: ;)? \} 2>&1; "
+                        r"printf '\\n(\S+ \d+) %d\\n' \$\?;", re.DOTALL )
+
+# A long CmdPipeline script, sourced from a file
+SOURCED = re.compile( r'^\. (\S+/mntopo-\w+\.sh)$' )
+
+# Kinds of operations, tried in order on each command
+KINDS = [ ( 'namespace', r'^(unshare|exit)\b' ),
+          ( 'link', r'^ip link (add|del)\b' ),
+          ( 'intf', r'^ip (addr|link set|-o link show)\b' ),
+          ( 'ovs', r'(^|\| )ovs-(vsctl|ofctl)\b' ),
+          ( 'iptables', r'\biptables-(save|restore)\b' ),
+          ( 'route', r"^printf .*'route .*\| ip -force -batch -$" ),
+          ( 'neigh', r"^printf .*'neigh .*\| ip -force -batch -$" ),
+          ( 'tc', r"^printf .*\| tc -force -batch -$" ),
+          ( 'sysctl', r'^sysctl\b' ),
+          ( 'ping', r'^ping\b' ),
+          ( 'probe', r'\bprobe\.py\b' ),
+          ( 'iperf', r'\biperf -[cs]\b' ) ]
+
+# Rough cost of one command of each kind in ms, plus the cost of one
+# round trip to a node's shell; calibrate with bench.topologies
+COSTS = OrderedDict( [ ( 'namespace', 5.0 ), ( 'link', 3.0 ),
+                       ( 'intf', 1.0 ), ( 'ovs', 20.0 ),
+                       ( 'iptables', 10.0 ), ( 'route', 2.0 ),
+                       ( 'neigh', 5.0 ), ( 'tc', 5.0 ), ( 'sysctl', 1.0 ),
+                       ( 'ping', 2.0 ),
+                       ( 'probe', 50.0 ), ( 'iperf', 5.0 ),
+                       ( 'other', 1.0 ), ( 'trip', 0.2 ) ] )
+
+Op = namedtuple( 'Op', 'trip node kind cmd' )
+
+
+def classify( cmd ):
+    "Return the kind of operation a shell command performs"
+    for kind, pattern in KINDS:
+        if re.search( pattern, cmd, re.DOTALL ):
+            return kind
+    return 'other'
+
+
+class OpLog( object ):
+    "Thread-safe record of the commands nodes would have run"
+
+    def __init__( self ):
+        self.ops = []
+        self.trips = 0
+        self.lock = Lock()
+
+    def record( self, node, cmds ):
+        "Record cmds as run by node in one round trip"
+        with self.lock:
+            self.trips += 1
+            self.ops.extend( Op( self.trips, node, classify( cmd ), cmd )
+                             for cmd in cmds )
+
+    def __iter__( self ):
+        return iter( self.ops )
+
+    def __len__( self ):
+        return len( self.ops )
+
+
+class DryRunIntf( object ):
+    "Interface stand-in"
+
+    # Made-up MAC addresses, as the kernel would pick random ones
+    macs = count( 1 )
+
+    def __init__( self, name, node, port, link=None ):
+        self.name = name
+        self.node = node
+        self.link = link
+        self.ip, self.prefixLen = None, None
+        self.mac = ':'.join( '%02x' % byte for byte in bytearray(
+            b'\x02\x00' + struct.pack( '!I', next( self.macs ) ) ) )
+        node.addIntf( self, port )
+
+    def setIP( self, ip, prefixLen=8 ):
+        "Set the interface address; ip may include a /prefix"
+        if '/' in str( ip ):
+            ip, prefixLen = ip.split( '/' )
+        self.ip, self.prefixLen = ip, int( prefixLen )
+        self.node.cmd( 'ip addr add %s/%s dev %s' %
+                       ( ip, prefixLen, self.name ) )
+
+    def setMAC( self, mac ):
+        "Set the interface MAC address"
+        self.mac = mac
+        self.node.cmd( 'ip link set %s address %s' % ( self.name, mac ) )
+
+    def IP( self ):
+        return self.ip
+
+    def MAC( self ):
+        return self.mac
+
+    def delete( self ):
+        "Delete the interface"
+        self.node.cmd( 'ip link del %s' % self.name )
+
+    def __str__( self ):
+        return self.name
+
+    __repr__ = __str__
+
+
+class DryRunNode( object ):
+    "Node stand-in whose shell commands are recorded instead of run"
+
+    portBase = 0
+
+    def __init__( self, name, log, inNamespace=True, **params ):
+        self.name = name
+        self.log = log
+        self.inNamespace = inNamespace
+        self.params = params
+        self.intfs = {}
+        self.ports = {}
+        self.nameToIntf = {}
+        self.pending = ''
+        if inNamespace:
+            self.cmd( 'unshare --net --mount --uts bash' )
+
+    def cmd( self, *args, **_kwargs ):
+        "Record a shell command and return its (empty) output"
+        self.log.record( self.name, [ ' '.join( str( a ) for a in args ) ] )
+        return ''
+
+    def sendCmd( self, *args, **_kwargs ):
+        """Record a shell command, or each command of a CmdPipeline
+           script; waitOutput() returns the output"""
+        self.pending = ' '.join( str( a ) for a in args )
+        sourced = SOURCED.match( self.pending )
+        if sourced:
+            with open( sourced.group( 1 ) ) as f:
+                self.pending = f.read()
+        cmds = [ cmd for cmd, _status in PIPELINED.findall( self.pending ) ]
+        self.log.record( self.name, cmds or [ self.pending ] )
+
+    def waitOutput( self, *_args, **_kwargs ):
+        "Return the output of the command sent by sendCmd()"
+        result = ''.join( '\n%s 0\n' % status for _cmd, status
+                          in PIPELINED.findall( self.pending ) )
+        self.pending = ''
+        return result
+
+    def newPort( self ):
+        "Return the next port number, as Node.newPort does"
+        if self.ports:
+            return max( self.ports.values() ) + 1
+        return self.portBase
+
+    def addIntf( self, intf, port=None ):
+        "Register intf on port"
+        if port is None:
+            port = self.newPort()
+        self.intfs[ port ] = intf
+        self.ports[ intf ] = port
+        self.nameToIntf[ intf.name ] = intf
+
+    def intfList( self ):
+        "Return interfaces in port order"
+        return [ self.intfs[ port ] for port in sorted( self.intfs ) ]
+
+    def defaultIntf( self ):
+        "Return the interface on the lowest port, or None"
+        return self.intfs[ min( self.intfs ) ] if self.intfs else None
+
+    def setIP( self, ip, prefixLen=8, intf=None ):
+        "Set the address of intf (default: the default interface)"
+        intf = self.nameToIntf[ str( intf ) ] if intf else self.defaultIntf()
+        intf.setIP( ip, prefixLen )
+
+    def IP( self ):
+        intf = self.defaultIntf()
+        return intf.IP() if intf else None
+
+    def MAC( self ):
+        intf = self.defaultIntf()
+        return intf.MAC() if intf else None
+
+    def configDefault( self, **moreParams ):
+        "Configure the default interface, as Node.configDefault does"
+        params = dict( self.params, **moreParams )
+        intf = self.defaultIntf()
+        if intf and params.get( 'ip' ):
+            intf.setIP( params[ 'ip' ] )
+        if intf and params.get( 'mac' ):
+            intf.setMAC( params[ 'mac' ] )
+        self.cmd( 'ip link set lo up' )
+
+    def terminate( self ):
+        "Stop the node's shell"
+        if self.inNamespace:
+            self.cmd( 'exit' )
+
+    def stop( self, deleteIntfs=False ):
+        "Stop the node"
+        self.terminate()
+
+    def __str__( self ):
+        return self.name
+
+    __repr__ = __str__
+
+
+class DryRunSwitch( DryRunNode ):
+    "OVS switch stand-in"
+
+    portBase = 1
+
+    def __init__( self, name, log, inNamespace=False, **params ):
+        DryRunNode.__init__( self, name, log, inNamespace=inNamespace,
+                             **params )
+
+    def start( self, controllers ):
+        "Record the commands that create the bridge"
+        ports = [ intf.name for intf in self.intfList() ]
+        self.cmd( 'ovs-vsctl', '--', '--if-exists', 'del-br', self.name,
+                  '--', 'add-br', self.name,
+                  *[ arg for port in ports
+                     for arg in ( '--', 'add-port', self.name, port ) ] )
+        if controllers:
+            self.cmd( 'ovs-vsctl', 'set-controller', self.name,
+                      *[ 'tcp:%s:%s' % ( c.ip, c.port )
+                         for c in controllers ] )
+
+    def connected( self ):
+        return True
+
+    def stop( self, deleteIntfs=True ):
+        "Record the commands that delete the bridge"
+        self.cmd( 'ovs-vsctl', '--if-exists', 'del-br', self.name )
+
+
+class DryRunController( DryRunNode ):
+    "Remote controller stand-in"
+
+    def __init__( self, name, log, ip='127.0.0.1', port=6633, **params ):
+        DryRunNode.__init__( self, name, log, inNamespace=False, **params )
+        self.ip, self.port = ip, port
+
+    def start( self ):
+        pass
+
+    def stop( self, deleteIntfs=False ):
+        pass
+
+
+class DryRunLink( object ):
+    "veth pair stand-in"
+
+    def __init__( self, node1, node2, port1=None, port2=None, **params ):
+        port1 = node1.newPort() if port1 is None else port1
+        port2 = node2.newPort() if port2 is None else port2
+        name1 = '%s-eth%d' % ( node1.name, port1 )
+        name2 = '%s-eth%d' % ( node2.name, port2 )
+        self.params = params
+        node1.cmd( 'ip link add name %s type veth peer name %s netns %s' %
+                   ( name1, name2, node2.name ) )
+        self.intf1 = DryRunIntf( name1, node1, port1, self )
+        self.intf2 = DryRunIntf( name2, node2, port2, self )
+
+    def stop( self ):
+        "Delete the veth pair"
+        self.intf1.delete()
+
+
+class DryRunNet( object ):
+    "Mininet stand-in that records commands in self.log, an OpLog"
+
+    def __init__( self, listenPort=None, ipBase='10.0.0.0/8',
+                  autoSetMacs=False, autoPinCpus=False, inNamespace=False,
+                  **_params ):
+        self.log = OpLog()
+        self.host = partial( DryRunNode, log=self.log )
+        self.switch = partial( DryRunSwitch, log=self.log )
+        self.listenPort = listenPort
+        self.ipBaseNum, self.prefixLen = netParse( ipBase )
+        self.nextIP = 1
+        self.autoSetMacs = autoSetMacs
+        self.autoPinCpus = autoPinCpus
+        self.numCores, self.nextCore = 1, 0
+        self.inNamespace = inNamespace
+        self.xterms = self.autoStaticArp = False
+        self.hosts, self.switches, self.controllers = [], [], []
+        self.links = []
+        self.nameToNode = {}
+        self.built = False
+
+    def addController( self, name='c0', controller=None, **params ):
+        "Add a controller; the controller class is ignored"
+        node = DryRunController( name, self.log, **params )
+        self.controllers.append( node )
+        self.nameToNode[ name ] = node
+        return node
+
+    def addSwitch( self, name, cls=None, **params ):
+        "Add a switch with Mininet's default parameters"
+        node = self.switch( name, **switchDefaults( self, params ) )
+        self.switches.append( node )
+        self.nameToNode[ name ] = node
+        return node
+
+    def addHost( self, name, cls=None, **params ):
+        "Add a host with Mininet's default parameters"
+        node = self.host( name, **hostDefaults( self, params ) )
+        self.hosts.append( node )
+        self.nameToNode[ name ] = node
+        return node
+
+    def rootNode( self, name='root' ):
+        "Return a node in the root namespace, for connectToInternet"
+        return DryRunNode( name, self.log, inNamespace=False )
+
+    def intf( self, name, node=None, port=None, **_params ):
+        "Attach existing interface name to node, like Intf()"
+        node.cmd( 'ip link set %s up' % name )
+        return DryRunIntf( name, node, port )
+
+    def addLink( self, node1, node2, port1=None, port2=None, cls=None,
+                 **params ):
+        "Add a link between two nodes or node names"
+        node1 = self.get( node1 ) if isinstance( node1, str ) else node1
+        node2 = self.get( node2 ) if isinstance( node2, str ) else node2
+        link = DryRunLink( node1, node2, port1, port2, **params )
+        self.links.append( link )
+        return link
+
+    def get( self, *names ):
+        "Return node(s) by name"
+        nodes = [ self.nameToNode[ name ] for name in names ]
+        return nodes[ 0 ] if len( nodes ) == 1 else nodes
+
+    __getitem__ = get
+
+    def configHosts( self ):
+        "Configure every host's default interface"
+        for host in self.hosts:
+            host.configDefault()
+
+    def start( self ):
+        "Configure the hosts and start controllers and switches"
+        if not self.built:
+            self.configHosts()
+            self.built = True
+        for controller in self.controllers:
+            controller.start()
+        for switch in self.switches:
+            switch.start( self.controllers )
+
+    def waitConnected( self, timeout=None, delay=.5 ):
+        "Every dry-run switch connects at once"
+        return True
+
+    def pingAll( self, timeout=None ):
+        """Record a ping between every ordered pair of hosts
+           returns: packet loss percentage (always 0)"""
+        opts = '-W %s ' % timeout if timeout else ''
+        for src in self.hosts:
+            for dst in self.hosts:
+                if src is not dst:
+                    src.cmd( 'ping -c1 %s%s' % ( opts, dst.IP() ) )
+        return 0.0
+
+    def stop( self ):
+        "Tear down links, switches and hosts"
+        for link in self.links:
+            link.stop()
+        for switch in self.switches:
+            switch.stop()
+        for host in self.hosts:
+            host.terminate()
+
+
+def estimate( log, costs=COSTS ):
+    """Estimate how long the logged commands take when run one by one
+       log: OpLog
+       costs: dict of kind -> ms per command, and 'trip' -> ms per trip
+       returns: seconds"""
+    ms = sum( costs.get( op.kind, costs[ 'other' ] ) for op in log )
+    return ( ms + log.trips * costs[ 'trip' ] ) / 1000.0
+
+def plan( net, costs=COSTS ):
+    """Return the structured plan of everything net would have done
+       net: DryRunNet
+       costs: per-command costs for the estimate, see COSTS"""
+    counts = OrderedDict( ( kind, 0 ) for kind, _cost in costs.items()
+                          if kind != 'trip' )
+    for op in net.log:
+        counts[ op.kind ] = counts.get( op.kind, 0 ) + 1
+    return OrderedDict( [
+        ( 'switches', len( net.switches ) ),
+        ( 'hosts', len( net.hosts ) ),
+        ( 'links', len( net.links ) ),
+        ( 'commands', len( net.log ) ),
+        ( 'trips', net.log.trips ),
+        ( 'counts', counts ),
+        ( 'estimate', estimate( net.log, costs ) ),
+        ( 'ops', [ op._asdict() for op in net.log ] ) ] )
+
+def dryRun( spec, intfs=(), workers=1, timer=None, paths=False,
+            tree=False, staticArp=False, tiers=None ):
+    """Build and connect spec on a DryRunNet
+       spec: TopoSpec
+       intfs: hardware interfaces to attach, ( interface, switch ) pairs
+       workers: parallel bring-up workers
+       timer: PhaseTimer (optional)
+       paths: also push proactive shortest-path flows
+       tree: also push the flows confining floods to a spanning tree
+       staticArp: also fill the hosts' neighbor tables
+       tiers: link shaping parameters per tier (mntopo.shaping)
+       returns: DryRunNet, still up"""
+    from mntopo.flows import installFlows
+    from mntopo.hwintf import addHwIntfs
+    from mntopo.internet import connectToInternet
+    from mntopo.shaping import shapeLinks
+    from mntopo.spec import buildNet
+    net = buildNet( spec, DryRunNet( listenPort=6633 ), workers, timer )
+    addHwIntfs( net, intfs )
+    root = connectToInternet( net, timer=timer, workers=workers,
+                              root=net.rootNode(), staticArp=staticArp )
+    shapeLinks( net, spec, tiers )
+    if paths or tree:
+        installFlows( net, extra=[ root ], timer=timer, paths=paths,
+                      tree=tree )
+    return net
+
+def report( name, result, seconds ):
+    "Log a one-line summary of a plan and its per-kind command counts"
+    output( '%-12s %6d commands %6d trips  estimated %7.2fs  '
+            '(planned in %.3fs)\n' %
+            ( name, result[ 'commands' ], result[ 'trips' ],
+              result[ 'estimate' ], seconds ) )
+    output( '             ' +
+            ' '.join( '%s=%d' % item for item in result[ 'counts' ].items()
+                      if item[ 1 ] ) + '\n' )
+
+def parseCosts( items ):
+    "Return COSTS updated with KIND=MS overrides"
+    costs = OrderedDict( COSTS )
+    for item in items:
+        kind, _sep, ms = item.partition( '=' )
+        if kind not in costs:
+            raise ValueError( 'unknown cost %s, expected one of %s' %
+                              ( kind, ', '.join( costs ) ) )
+        costs[ kind ] = float( ms )
+    return costs
+
+
+if __name__ == '__main__':
+    from mntopo.spec import loadSpec
+    parser = ArgumentParser( description='Plan topology bring-up without '
+                                         'running anything' )
+    parser.add_argument( '--workers', type=int, default=1,
+                         help='parallel bring-up workers (default: 1)' )
+    parser.add_argument( '--cost', action='append', default=[],
+                         metavar='KIND=MS',
+                         help='override a per-command cost, e.g. ovs=5' )
+    parser.add_argument( '--plan', metavar='FILE',
+                         help='write the plans, with every operation, to '
+                              'FILE as JSON' )
+    parser.add_argument( 'topos', nargs='+' )
+    args = parser.parse_args()
+    try:
+        overrides = parseCosts( args.cost )
+    except ValueError as e:
+        parser.error( str( e ) )
+    lg.setLogLevel( 'output' )
+    plans = OrderedDict()
+    for topo in args.topos:
+        spec = loadSpec( topo )
+        start = time.time()
+        dryNet = dryRun( spec, spec.intfs, args.workers )
+        plans[ spec.name ] = plan( dryNet, overrides )
+        report( spec.name, plans[ spec.name ], time.time() - start )
+    if args.plan:
+        with open( args.plan, 'w' ) as f:
+            json.dump( plans, f, indent=1 )
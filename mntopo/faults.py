@@ -0,0 +1,576 @@
+"""
+Fault injection: scheduled link and switch failures under probe traffic.
+
+A fault timeline lists probe pairs and timed events in the line syntax
+of topology specs, with times in seconds (or e.g. 2500ms) from the
+start:
+
+    # fail a ring link, then a switch, under h1 -> h5 and h2 -> h9, h10
+    probe h1 -> h5
+    probe h2 -> h9..h10
+    interval 5
+    2 down s2 s3
+    4.5 up s2 s3
+    8 stop s3
+    11 start s3
+    14 loss s2 s6 10
+    17 loss s2 s6 0
+    end 20
+
+down and up take the links between two nodes down or up at their ends
+in the root namespace (a veth whose peer is down has no carrier, so
+both directions stop). stop takes every port of a switch down at once,
+as its neighbors and hosts see a switch fail, and start brings them up
+again. loss sets the netem loss of a link in both directions, in
+percent, on top of its shaping; 0 returns it to its shaping. Probers
+send one echo request to each of their targets every interval ms
+(default 10) until end (default: 3 s after the last event).
+
+runFaults() starts one prober (mntopo/probe.py --interval) on every
+source, all at once, and fires the events a second later. Every
+namespace the events touch gets a long-running ip -batch and tc -batch
+process up front, so an event is one line written to them at its time
+and takes effect within a fraction of a millisecond of schedule.
+
+Each run of consecutive lost probes of a pair is charged to the last
+event before it: its recovery time is from the event to the arrival of
+the next reply, and its loss the number of probes lost (no reply
+within timeout). FaultResult has them per event and pair, and how late
+each event fired.
+
+In the CLI: faults TIMELINE [RESULT.json]
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import OrderedDict, namedtuple
+
+from mininet.log import error, info, output
+
+from mntopo.pipeline import CmdPipeline, runPipelines
+from mntopo.reconfig import linkKey
+from mntopo.shaping import checkShape, rootQdiscs, shapeBatch
+from mntopo.spec import SpecError, splitParams
+from mntopo.sweep import PROBE
+from mntopo.util import dottedQuad
+
+
+ACTIONS = { 'down': 2, 'up': 2, 'stop': 1, 'start': 1, 'loss': 3 }
+TIME = re.compile( r'^(\d+(\.\d+)?)(ms|s)?$' )
+# Seconds of probing before the first event, and after the last one
+# if the timeline has no end
+LEAD = 1.0
+SETTLE = 3.0
+# Seconds before an event to stop sleeping and spin
+SPIN = .002
+
+Event = namedtuple( 'Event', 'time action nodes value' )
+Timeline = namedtuple( 'Timeline', 'pairs interval events end' )
+Gap = namedtuple( 'Gap', 'first last lost recovered' )
+PairResult = namedtuple( 'PairResult', 'src dst sent received rtt gaps' )
+
+
+def parseTime( text ):
+    "Parse a time in seconds, or with a unit, e.g. 2.5 or 2500ms"
+    match = TIME.match( text )
+    if not match:
+        raise SpecError( 'bad time %s' % text )
+    value = float( match.group( 1 ) )
+    return value / 1000 if match.group( 3 ) == 'ms' else value
+
+def parseEvent( tokens ):
+    "Parse a TIME ACTION ARGS line into an Event"
+    if len( tokens ) < 2 or tokens[ 1 ] not in ACTIONS:
+        raise SpecError( 'expected: TIME %s ...' %
+                         '|'.join( sorted( ACTIONS ) ) )
+    when, action, args = parseTime( tokens[ 0 ] ), tokens[ 1 ], tokens[ 2: ]
+    if len( args ) != ACTIONS[ action ]:
+        raise SpecError( 'expected: TIME %s %s' % ( action, {
+            'down': 'NODE NODE', 'up': 'NODE NODE', 'stop': 'SWITCH',
+            'start': 'SWITCH', 'loss': 'NODE NODE PERCENT' }[ action ] ) )
+    value = None
+    if action == 'loss':
+        try:
+            value = checkShape( { 'loss': args.pop() } )[ 'loss' ]
+        except ValueError as e:
+            raise SpecError( str( e ) )
+    return Event( when, action, args, value )
+
+def parseTimeline( lines, name=None ):
+    """Parse fault timeline text into a Timeline
+       lines: iterable of timeline lines
+       name: timeline name, for errors (optional)"""
+    pairs, events, interval, end = [], [], 10.0, None
+    seen = set()
+    for lineno, line in enumerate( lines, 1 ):
+        line = line.split( '#', 1 )[ 0 ].strip()
+        if not line:
+            continue
+        tokens = line.replace( ',', ' ' ).split()
+        try:
+            if tokens[ 0 ] == 'probe':
+                if '->' not in tokens:
+                    raise SpecError( 'expected: probe NODES -> NODES' )
+                arrow = tokens.index( '->' )
+                srcs, params1 = splitParams( tokens[ 1:arrow ] )
+                dsts, params2 = splitParams( tokens[ arrow + 1: ] )
+                if not srcs or not dsts or params1 or params2:
+                    raise SpecError( 'expected: probe NODES -> NODES' )
+                for pair in [ ( src, dst ) for src in srcs for dst in dsts
+                              if src != dst and ( src, dst ) not in seen ]:
+                    seen.add( pair )
+                    pairs.append( pair )
+            elif tokens[ 0 ] in ( 'interval', 'end' ):
+                if len( tokens ) != 2:
+                    raise SpecError( 'expected: %s TIME' % tokens[ 0 ] )
+                if tokens[ 0 ] == 'end':
+                    end = parseTime( tokens[ 1 ] )
+                else:
+                    # A bare interval is in ms
+                    text = tokens[ 1 ]
+                    interval = 1000 * parseTime(
+                        text if text.endswith( 's' ) else text + 'ms' )
+                    if interval <= 0:
+                        raise SpecError( 'interval must be positive' )
+            else:
+                events.append( parseEvent( tokens ) )
+        except SpecError as e:
+            raise SpecError( '%s:%d: %s' % ( name, lineno, e ) )
+    if not pairs or not events:
+        raise SpecError( '%s: a timeline needs probe pairs and events' %
+                         name )
+    events.sort( key=lambda event: event.time )
+    if end is None:
+        end = events[ -1 ].time + SETTLE
+    elif end <= events[ -1 ].time:
+        raise SpecError( '%s: end is not after the last event' % name )
+    return Timeline( pairs, interval, events, end )
+
+def loadTimeline( path ):
+    "Load a fault timeline file"
+    with open( path ) as f:
+        return parseTimeline( f, os.path.basename( path ) )
+
+def formatEvent( event ):
+    "Return an event as it is written in a timeline, without its time"
+    return ' '.join( [ event.action ] + event.nodes + (
+        [ '%g' % event.value ] if event.value is not None else [] ) )
+
+
+def namespace( node ):
+    "Return the key of node's network namespace (None: the root one)"
+    return node.name if node.inNamespace else None
+
+def eventLines( net, event, shapes, qdiscs ):
+    """Return the batch lines that apply event to net
+       shapes: dict of interface name -> shaping parameters
+       qdiscs: names of interfaces with a root qdisc of ours, updated
+       returns: list of ( Intf, tool, lines )
+       raises: SpecError if event's nodes or links are not in net"""
+    if event.action in ( 'stop', 'start' ):
+        switch = net.nameToNode.get( event.nodes[ 0 ] )
+        if switch not in net.switches:
+            raise SpecError( 'no switch %s' % event.nodes[ 0 ] )
+        # Hardware interfaces have no link, and stay up
+        intfs = [ intf for intf in switch.intfList() if intf.link ]
+        state = 'down' if event.action == 'stop' else 'up'
+        return [ ( intf, 'ip', [ 'link set dev %s %s' % ( intf, state ) ] )
+                 for intf in intfs ]
+    key = linkKey( *event.nodes )
+    links = [ link for link in net.links
+              if linkKey( link.intf1.node.name, link.intf2.node.name ) == key ]
+    if not links:
+        raise SpecError( 'no link %s - %s' % tuple( event.nodes ) )
+    entries = []
+    for link in links:
+        if event.action == 'loss':
+            for intf in link.intf1, link.intf2:
+                shape = dict( shapes.get( intf.name, {} ) )
+                if event.value:
+                    shape[ 'loss' ] = event.value
+                lines = shapeBatch( intf, shape )
+                if intf.name in qdiscs:
+                    lines.insert( 0, 'qdisc del dev %s root' % intf )
+                qdiscs.discard( intf.name )
+                if shape:
+                    qdiscs.add( intf.name )
+                entries.append( ( intf, 'tc', lines ) )
+            continue
+        ends = [ intf for intf in ( link.intf1, link.intf2 )
+                 if not intf.node.inNamespace ] or [ link.intf1 ]
+        entries += [ ( intf, 'ip', [ 'link set dev %s %s' % (
+                           intf, event.action ) ] ) for intf in ends ]
+    return entries
+
+def planSteps( net, timeline, shapes=None, qdiscs=None ):
+    """Turn timeline's events into batch lines, events at the same time
+       into one step
+       shapes: dict of interface name -> shaping parameters (default:
+               no link is shaped)
+       qdiscs: names of interfaces that have a root qdisc (default: the
+               ones shapes shape)
+       returns: list of ( time, events, dict of ( tool, namespace ) ->
+                lines ), dict of ( tool, namespace ) -> node to run on"""
+    shapes = shapes or {}
+    if qdiscs is None:
+        qdiscs = [ name for name, shape in shapes.items() if shape ]
+    qdiscs = set( qdiscs )
+    steps, nodes = [], OrderedDict()
+    for event in timeline.events:
+        if not steps or steps[ -1 ][ 0 ] != event.time:
+            steps.append( ( event.time, [], OrderedDict() ) )
+        steps[ -1 ][ 1 ].append( event )
+        for intf, tool, lines in eventLines( net, event, shapes, qdiscs ):
+            key = tool, namespace( intf.node )
+            nodes.setdefault( key, intf.node )
+            steps[ -1 ][ 2 ].setdefault( key, [] ).extend( lines )
+    return steps, nodes
+
+
+def liveQdiscs( nodes ):
+    """Return the names of the interfaces of nodes' namespaces that have
+       a root qdisc other than the default one, with one tc qdisc show
+       per namespace, all at once"""
+    byNamespace = OrderedDict( ( namespace( node ), node )
+                               for node in nodes )
+    pipelines = [ CmdPipeline( node ).add( 'tc qdisc show' )
+                  for node in byNamespace.values() ]
+    names = set()
+    for results in runPipelines( pipelines ):
+        names.update( name for name, handle
+                      in rootQdiscs( results[ 0 ].output ).items()
+                      if handle != '0:' )
+    return names
+
+
+class Injector( object ):
+    """Long-running ip -batch and tc -batch processes, one per tool and
+       namespace, that fire() writes the lines of each step to"""
+
+    def __init__( self, steps, nodes ):
+        """steps, nodes: from planSteps()"""
+        self.steps = steps
+        self.procs = OrderedDict()
+        # ( tool, namespace ) -> step of every line written so far
+        self.lineSteps = dict( ( key, [] ) for key in nodes )
+        for key, node in nodes.items():
+            argv = [ key[ 0 ], '-force', '-batch', '-' ]
+            params = dict( stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                           stderr=subprocess.PIPE )
+            self.procs[ key ] = ( node.popen( argv, **params )
+                                  if node.inNamespace
+                                  else subprocess.Popen( argv, **params ) )
+        self.nodes = nodes
+
+    def fire( self, start ):
+        """Write each step's lines at its time
+           start: time of the timeline's 0 (epoch seconds)
+           returns: list of the times the steps fired"""
+        fired = []
+        for index, ( when, _events, batches ) in enumerate( self.steps ):
+            waitUntil( start + when )
+            fired.append( time.time() )
+            for key, lines in batches.items():
+                self.lineSteps[ key ] += [ index ] * len( lines )
+                try:
+                    self.procs[ key ].stdin.write(
+                        ''.join( line + '\n' for line in lines ).encode() )
+                    self.procs[ key ].stdin.flush()
+                except ( IOError, OSError ):
+                    # Its exit status and output tell what happened
+                    pass
+        return fired
+
+    def stop( self ):
+        """Wait for the batch processes to finish
+           returns: dict of step index -> error output of its lines"""
+        errors = {}
+        for key, proc in self.procs.items():
+            err = proc.communicate()[ 1 ].decode( errors='replace' )
+            steps = self.lineSteps[ key ]
+            # ip and tc report each failed line of a batch after its error
+            lines, failed = [], False
+            for line in err.splitlines():
+                match = re.match( r'^Command failed -:(\d+)$', line )
+                if not match or int( match.group( 1 ) ) > len( steps ):
+                    lines.append( line )
+                    continue
+                errors.setdefault( steps[ int( match.group( 1 ) ) - 1 ],
+                                   [] ).append( '%s: %s' % (
+                    self.nodes[ key ], ' '.join( lines ) ) )
+                lines, failed = [], True
+            if proc.returncode and not failed and steps:
+                errors.setdefault( steps[ -1 ], [] ).append(
+                    '%s: %s exited with %d %s' % (
+                        self.nodes[ key ], key[ 0 ], proc.returncode,
+                        ' '.join( lines ) ) )
+        return dict( ( index, '; '.join( messages ) )
+                     for index, messages in errors.items() )
+
+
+def waitUntil( deadline ):
+    "Sleep until time.time() reaches deadline, spinning the last moment"
+    while True:
+        left = deadline - time.time()
+        if left <= 0:
+            return
+        if left > SPIN:
+            time.sleep( left - SPIN )
+
+
+class StepResult( object ):
+    """Events fired together, and the probes lost after them: lost and
+       recovery map ( src, dst ) of every affected pair to its lost
+       probes and to seconds from the event until traffic got through
+       again (None: it did not before the end)"""
+
+    def __init__( self, when, events, fired ):
+        self.time = when
+        self.events = events
+        self.fired = fired
+        self.lost = OrderedDict()
+        self.recovery = OrderedDict()
+        self.error = None
+
+    def recovered( self ):
+        "Did every affected pair recover?"
+        return None not in self.recovery.values()
+
+    def maxRecovery( self ):
+        """Return the longest recovery time in seconds, 0 without loss
+           and None if a pair did not recover"""
+        if not self.recovered():
+            return None
+        return max( self.recovery.values() ) if self.recovery else 0.0
+
+
+class FaultResult( object ):
+    """Per-pair probe results and per-step recovery of runFaults(); lost
+       holds the probes lost before the first event"""
+
+    def __init__( self, timeline, start, pairs, steps ):
+        self.timeline = timeline
+        self.start = start
+        self.pairs = pairs
+        self.steps = steps
+        self.lost = 0
+        interval = timeline.interval / 1000.0
+        fired = [ step.fired for step in steps ]
+        for pair in pairs:
+            key = pair.src, pair.dst
+            for gap in pair.gaps:
+                # A probe lost in flight when the event fired counts too
+                index = sum( 1 for stamp in fired
+                             if stamp <= gap.first + interval ) - 1
+                if index < 0:
+                    self.lost += gap.lost
+                    continue
+                step = steps[ index ]
+                step.lost[ key ] = step.lost.get( key, 0 ) + gap.lost
+                recovery = ( None if gap.recovered is None
+                             else gap.recovered - step.fired )
+                if key not in step.recovery:
+                    step.recovery[ key ] = recovery
+                elif None not in ( recovery, step.recovery[ key ] ):
+                    step.recovery[ key ] = max( recovery,
+                                                step.recovery[ key ] )
+                else:
+                    step.recovery[ key ] = None
+
+    def late( self ):
+        "Return how late each step fired, in seconds"
+        return [ step.fired - self.start - step.time for step in self.steps ]
+
+    def records( self ):
+        "Return the results as a dict, e.g. for JSON"
+        steps = []
+        for step, late in zip( self.steps, self.late() ):
+            steps.append( {
+                'time': step.time, 'late': late,
+                'events': [ formatEvent( event ) for event in step.events ],
+                'lost': sum( step.lost.values() ),
+                'recovery': step.maxRecovery(),
+                'recovered': step.recovered(), 'error': step.error,
+                'pairs': [ { 'src': src, 'dst': dst,
+                             'lost': step.lost[ src, dst ],
+                             'recovery': step.recovery[ src, dst ] }
+                           for src, dst in step.lost ] } )
+        return { 'start': self.start, 'interval': self.timeline.interval,
+                 'end': self.timeline.end, 'lostBefore': self.lost,
+                 'pairs': [ dict( pair._asdict(),
+                                  gaps=[ gap._asdict() for gap in pair.gaps ] )
+                            for pair in self.pairs ],
+                 'steps': steps }
+
+
+def parseStream( text, names ):
+    """Parse probe.py --interval output
+       names: dict of IP -> node name
+       returns: dict of node name -> ( sent, received, RTT, list of Gap )"""
+    replies = {}
+    for line in text.splitlines():
+        fields = line.split()
+        if len( fields ) == 4 and fields[ 1 ].isdigit():
+            sent, received = int( fields[ 1 ] ), int( fields[ 2 ] )
+            rtt = None if fields[ 3 ] == '-' else float( fields[ 3 ] )
+            replies[ names.get( fields[ 0 ] ) ] = (
+                sent, received, rtt, [] )
+        elif len( fields ) == 6 and fields[ 0 ] == 'gap':
+            name = names.get( fields[ 1 ] )
+            if name in replies:
+                replies[ name ][ 3 ].append( Gap(
+                    float( fields[ 2 ] ), float( fields[ 3 ] ),
+                    int( fields[ 4 ] ),
+                    None if fields[ 5 ] == '-' else float( fields[ 5 ] ) ) )
+    return replies
+
+def runFaults( net, timeline, extra=(), shapes=None, timeout=1.0 ):
+    """Fire the events of a fault timeline under continuous probes
+       net: Mininet network
+       timeline: Timeline, e.g. from loadTimeline()
+       extra: other nodes pairs may name, e.g. connectToInternet's root
+       shapes: dict of interface name -> shaping parameters, that loss
+               events add to (see mntopo.shaping.intfParams())
+       timeout: seconds after which a probe counts as lost
+       returns: FaultResult
+       raises: SpecError if the timeline names nodes or links not in net"""
+    nodes = dict( ( node.name, node )
+                  for node in list( net.hosts ) + list( extra ) )
+    for pair in timeline.pairs:
+        for name in pair:
+            if name not in nodes or not nodes[ name ].IP():
+                raise SpecError( 'probe %s -> %s: no host %s with an '
+                                 'address' % ( pair[ 0 ], pair[ 1 ], name ) )
+    # Loss events replace the qdiscs that are really there
+    lossNodes = [ net.nameToNode[ name ] for event in timeline.events
+                  if event.action == 'loss' for name in event.nodes
+                  if name in net.nameToNode ]
+    steps, batchNodes = planSteps( net, timeline, shapes,
+                                   liveQdiscs( lossNodes ) )
+    bySource = OrderedDict()
+    for src, dst in timeline.pairs:
+        bySource.setdefault( src, [] ).append( dst )
+    ips = dict( ( name, dottedQuad( node.IP() ) )
+                for name, node in nodes.items() if node.IP() )
+    pipelines = [ CmdPipeline( nodes[ src ] ).add(
+                      sys.executable, PROBE, '--interval', timeline.interval,
+                      '--duration', LEAD + timeline.end, '--timeout', timeout,
+                      *[ ips[ dst ] for dst in dsts ] )
+                  for src, dsts in bySource.items() ]
+    info( '*** Probing %d pairs every %g ms; %d events over %gs\n' % (
+        len( timeline.pairs ), timeline.interval, len( timeline.events ),
+        timeline.end ) )
+    injector = Injector( steps, batchNodes )
+    start, fired = [], []
+
+    def schedule():
+        "Fire the events once the probers have had time to start"
+        start.append( time.time() + LEAD )
+        fired.extend( injector.fire( start[ 0 ] ) )
+
+    try:
+        allResults = runPipelines( pipelines, sent=schedule )
+    finally:
+        errors = injector.stop()
+    names = dict( ( ip, name ) for name, ip in ips.items() )
+    pairs = []
+    for ( src, dsts ), results in zip( bySource.items(), allResults ):
+        replies = parseStream( ''.join( r.output for r in results ), names )
+        if results and results[ -1 ].status:
+            error( '*** Probing from %s failed: %s\n' %
+                   ( src, results[ -1 ].output.strip() ) )
+        for dst in dsts:
+            sent, received, rtt, gaps = replies.get(
+                dst, ( 0, 0, None, [] ) )
+            pairs.append( PairResult( src, dst, sent, received, rtt, gaps ) )
+    stepResults = []
+    for index, ( ( when, events, _batches ), stamp ) in enumerate(
+            zip( steps, fired ) ):
+        stepResults.append( StepResult( when, events, stamp ) )
+        stepResults[ -1 ].error = errors.get( index )
+    return FaultResult( timeline, start[ 0 ], pairs, stepResults )
+
+def report( result ):
+    "Log a summary of a FaultResult"
+    timeline = result.timeline
+    sent = sum( pair.sent for pair in result.pairs )
+    output( '*** %d pairs probed every %g ms for %gs: %d of %d probes '
+            'lost, %d before the first event\n' % (
+                len( result.pairs ), timeline.interval,
+                LEAD + timeline.end,
+                sum( pair.sent - pair.received for pair in result.pairs ),
+                sent, result.lost ) )
+    for step, late in zip( result.steps, result.late() ):
+        what = '; '.join( formatEvent( event ) for event in step.events )
+        if step.error:
+            error( '*** %.3fs %s failed: %s\n' % ( step.time, what,
+                                                   step.error ) )
+        if not step.lost:
+            outcome = 'no loss'
+        else:
+            outcome = '%d/%d pairs lost %d probes, ' % (
+                len( step.lost ), len( result.pairs ),
+                sum( step.lost.values() ) )
+            if step.recovered():
+                slowest = max( step.recovery,
+                               key=lambda key: step.recovery[ key ] )
+                outcome += 'recovered in %.1f ms (%s -> %s)' % (
+                    1000 * step.recovery[ slowest ], slowest[ 0 ],
+                    slowest[ 1 ] )
+            else:
+                down = [ key for key, seconds in step.recovery.items()
+                         if seconds is None ]
+                names = [ '%s -> %s' % key for key in down[ :5 ] ]
+                if len( down ) > 5:
+                    names.append( '...' )
+                outcome += '%d did not recover (%s)' % (
+                    len( down ), ', '.join( names ) )
+        output( '*** %7.3fs %s (+%.2f ms): %s\n' % (
+            step.time, what, 1000 * late, outcome ) )
+    late = result.late()
+    if late:
+        output( '*** Events fired at most %.2f ms late\n' %
+                ( 1000 * max( late ) ) )
+
+def save( result, path ):
+    "Write a FaultResult to path as JSON"
+    with open( path, 'w' ) as f:
+        json.dump( result.records(), f, indent=1 )
+
+
+class FaultCommands( object ):
+    """Mininet CLI mixin with a 'faults' command running a fault
+       timeline; listed before ReconfigCommands, it keeps the shapes of
+       self.faults up to date across reconfigurations
+       self.extra: other nodes pairs may name, e.g. the root node
+       self.faults: runFaults() options, e.g. shapes"""
+
+    def reconfigured( self, diff ):
+        "Keep the shaping of changed links for loss events"
+        shapes = self.faults.setdefault( 'shapes', {} )
+        for link in diff.delLinks:
+            for intf in link.intf1, link.intf2:
+                shapes.pop( intf.name, None )
+        shapes.update( diff.shapes )
+
+    def do_faults( self, line ):
+        """Fire the events of a fault timeline under continuous probes
+           and report loss and recovery time per event.
+           Usage: faults TIMELINE [RESULT.json]"""
+        args = line.split()
+        if not 1 <= len( args ) <= 2:
+            error( 'usage: faults TIMELINE [RESULT.json]\n' )
+            return
+        try:
+            result = runFaults( self.mn, loadTimeline( args[ 0 ] ),
+                                self.extra, **self.faults )
+        except ( IOError, SpecError ) as e:
+            error( '*** %s\n' % e )
+            return
+        report( result )
+        if len( args ) > 1:
+            save( result, args[ 1 ] )
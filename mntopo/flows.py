@@ -0,0 +1,183 @@
+"""
+Proactive shortest-path forwarding and loop-free broadcast.
+
+Instead of sending the first packet of every flow to the controller,
+compileFlows() computes a shortest path from every switch to every
+host over the topology graph and turns it into per-switch flow tables:
+IPv4 and ARP packets are forwarded on the address they are for, so ARP
+requests travel to their target instead of being flooded around loops,
+and IPv4 for outside the subnet goes toward the gateway (the root node
+of connectToInternet). Other addresses in the subnet, e.g. machines
+behind hardware interfaces, go to the controller as on a table miss,
+and learned flows take precedence over both. pushFlows() loads each
+switch's table with one 'ovs-ofctl add-flows' reading stdin, on all
+switches concurrently, and only touches switches that get flows or had
+ours before.
+
+Curcle and MiniCurcle have rings, so without STP a flooded packet goes
+around them forever, and OVS STP takes 30 seconds and more to converge.
+treeFlows() instead computes a spanning tree of the known topology and
+drops broadcast and multicast frames arriving on a switch-to-switch
+port off the tree: floods cross such a link at most once and the tree
+is loop-free as soon as the flows are in, while unicast the controller
+or the shortest paths send over a redundant link still gets through.
+The tree is rooted at the gateway's switch, so the gateway paths stay
+on it. They are only installed when asked for (tree=True).
+
+All flows carry COOKIE, so replacing them leaves the controller's own
+flows (e.g. its table-miss flow) alone.
+
+Usage from Python:
+
+    root = connectToInternet( net )
+    installFlows( net, extra=[ root ] )
+"""
+
+from mininet.log import error, info
+
+from mntopo.graph import TopoGraph
+from mntopo.pipeline import CmdPipeline, failures, runPipelines
+from mntopo.util import PhaseTimer, dottedQuad, pipeCmd
+
+
+COOKIE = 0x6d6e746f    # 'mnto'
+# Broadcast and multicast frames: the group bit of the destination
+MULTICAST = 'dl_dst=01:00:00:00:00:00/01:00:00:00:00:00'
+HOST_PRIORITY = 100
+# Above the flows a learning controller installs (mntopo.controller: 10)
+TREE_PRIORITY = 50
+# Below them
+SUBNET_PRIORITY = 5
+GATEWAY_PRIORITY = 1
+
+
+def hostFlows( ip, port ):
+    "Return the flows sending IPv4 and ARP packets for ip to port"
+    return [ 'cookie=%#x,priority=%d,ip,nw_dst=%s,actions=output:%d' %
+             ( COOKIE, HOST_PRIORITY, ip, port ),
+             'cookie=%#x,priority=%d,arp,arp_tpa=%s,actions=output:%d' %
+             ( COOKIE, HOST_PRIORITY, ip, port ) ]
+
+def gatewayFlows( subnet, port ):
+    """Return the flows sending IPv4 for outside subnet to port, and
+       other IPv4 for subnet to the controller"""
+    return [ 'cookie=%#x,priority=%d,ip,nw_dst=%s,actions=CONTROLLER' %
+             ( COOKIE, SUBNET_PRIORITY, dottedQuad( subnet ) ),
+             'cookie=%#x,priority=%d,ip,actions=output:%d' %
+             ( COOKIE, GATEWAY_PRIORITY, port ) ]
+
+def compileFlows( graph, gateway='root', subnet='10.0/8' ):
+    """Compile all-pairs shortest-path flow tables
+       graph: TopoGraph
+       gateway: host that IPv4 destinations outside subnet are sent to
+                (or None)
+       subnet: Mininet subnet
+       returns: dict of switch -> list of ovs-ofctl flow lines"""
+    flows = dict( ( switch, [] ) for switch in graph.switches )
+    toward = {}
+    for host, ip in graph.hosts.items():
+        attachment = graph.attachment( host )
+        if not ip or not attachment:
+            continue
+        edge, hostPort = attachment
+        if edge not in toward:
+            toward[ edge ] = graph.portsToward( edge )
+        for switch, port in toward[ edge ].items():
+            flows[ switch ] += hostFlows( ip, hostPort if port is None
+                                          else port )
+        if host == gateway:
+            for switch, port in toward[ edge ].items():
+                flows[ switch ] += gatewayFlows(
+                    subnet, hostPort if port is None else port )
+    return flows
+
+def treeRoot( graph, gateway='root' ):
+    "Return the switch the gateway is attached to, or None"
+    if gateway not in graph.hosts:
+        return None
+    attachment = graph.attachment( gateway )
+    return attachment[ 0 ] if attachment else None
+
+def treeFlows( graph, root=None ):
+    """Compile flows that drop broadcast and multicast frames arriving
+       on switch-to-switch ports off a spanning tree of graph
+       root: switch to root the tree at (default: the first switch)
+       returns: dict of switch -> list of ovs-ofctl flow lines"""
+    flows = dict( ( switch, [] ) for switch in graph.switches )
+    for switch, ports in graph.offTreePorts( root ).items():
+        flows[ switch ] += [ 'cookie=%#x,priority=%d,in_port=%d,%s,'
+                             'actions=drop' %
+                             ( COOKIE, TREE_PRIORITY, port, MULTICAST )
+                             for port in ports ]
+    return flows
+
+def ofctl( switch ):
+    "Return the ovs-ofctl command prefix for switch's OpenFlow version"
+    protocols = getattr( switch, 'protocols', None )
+    return 'ovs-ofctl -O %s' % protocols if protocols else 'ovs-ofctl'
+
+def pushFlows( net, flows, replace=True ):
+    """Load flow tables into the switches, all switches concurrently
+       net: Mininet network
+       flows: dict of switch name -> flow lines
+       replace: delete the flows we installed before (with COOKIE)
+       returns: dict of switch name -> error output, for failed switches"""
+    # Switches holding flows of ours, from earlier calls
+    loaded = getattr( net, 'flowSwitches', set() )
+    net.flowSwitches = loaded | set( name for name in flows
+                                     if flows[ name ] )
+    if replace:
+        net.flowSwitches -= set( name for name in flows
+                                 if not flows[ name ] )
+    pipelines = []
+    for switch in [ net.get( name ) for name in sorted( flows ) ]:
+        pipeline = CmdPipeline( switch )
+        if replace and switch.name in loaded:
+            pipeline.add( ofctl( switch ), 'del-flows', switch.name,
+                          'cookie=%#x/-1' % COOKIE )
+        if flows[ switch.name ]:
+            pipeline.add( pipeCmd( flows[ switch.name ],
+                                   '%s add-flows %s -' %
+                                   ( ofctl( switch ), switch.name ) ) )
+        if pipeline.cmds:
+            pipelines.append( pipeline )
+    errors = {}
+    for pipeline, results in zip( pipelines, runPipelines( pipelines ) ):
+        failed = failures( results )
+        if failed:
+            errors[ pipeline.node.name ] = ''.join(
+                result.output for result in failed ).strip()
+    for name in sorted( errors ):
+        error( '*** Loading flows into %s failed: %s\n' %
+               ( name, errors[ name ] ) )
+    return errors
+
+def installFlows( net, extra=(), gateway='root', timer=None, paths=True,
+                  tree=False, subnet='10.0/8' ):
+    """Compile and push proactive flows for net
+       extra: non-switch nodes outside net.hosts, e.g. the root node
+       gateway: node that IPv4 destinations outside subnet go to
+       timer: PhaseTimer (optional)
+       paths: install shortest-path flows to every host
+       tree: restrict floods to a spanning tree
+       subnet: Mininet subnet
+       returns: dict of switch name -> error output, for failed switches"""
+    timer = timer or PhaseTimer()
+    with timer.phase( 'flows' ):
+        with timer.phase( 'compile' ):
+            graph = TopoGraph.fromNet( net, extra )
+            flows = dict( ( switch, [] ) for switch in graph.switches )
+            if paths:
+                for switch, lines in compileFlows( graph, gateway,
+                                                  subnet ).items():
+                    flows[ switch ] += lines
+            if tree:
+                root = treeRoot( graph, gateway )
+                for switch, lines in treeFlows( graph, root ).items():
+                    flows[ switch ] += lines
+        with timer.phase( 'push' ):
+            errors = pushFlows( net, flows )
+    info( '*** Installed %d flows on %d switches\n' %
+          ( sum( len( lines ) for lines in flows.values() ),
+            len( [ lines for lines in flows.values() if lines ] ) ) )
+    return errors
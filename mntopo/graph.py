@@ -0,0 +1,145 @@
+"""
+Topology graph: switches, hosts and the ports that link them.
+
+TopoGraph.fromNet() reads a built Mininet network, so the port numbers
+are the ones the switches really use (Mininet requests them as OpenFlow
+port numbers). Neighbors keep link order, so every traversal of the
+graph is deterministic.
+"""
+
+from collections import OrderedDict, deque
+
+from mntopo.util import dottedQuad
+
+
+class TopoGraph( object ):
+    "Undirected multigraph of switches and hosts with per-link ports"
+
+    def __init__( self ):
+        self.switches = []
+        self.hosts = OrderedDict()
+        self.edges = OrderedDict()
+
+    def addSwitch( self, name ):
+        "Add a switch"
+        self.switches.append( name )
+        self.edges.setdefault( name, [] )
+
+    def addHost( self, name, ip=None ):
+        "Add a host (or any other non-switch node) with its IP address"
+        self.hosts[ name ] = ip
+        self.edges.setdefault( name, [] )
+
+    def addLink( self, node1, port1, node2, port2 ):
+        "Add a link between port1 of node1 and port2 of node2"
+        self.edges[ node1 ].append( ( node2, port1, port2 ) )
+        self.edges[ node2 ].append( ( node1, port2, port1 ) )
+
+    def isSwitch( self, node ):
+        return node not in self.hosts
+
+    def neighbors( self, node ):
+        "Return ( neighbor, local port, neighbor port ) for node's links"
+        return self.edges[ node ]
+
+    def links( self ):
+        "Return every link once, as ( node1, port1, node2, port2 )"
+        seen = set()
+        links = []
+        for node1, edges in self.edges.items():
+            for node2, port1, port2 in edges:
+                key = frozenset( [ ( node1, port1 ), ( node2, port2 ) ] )
+                if key not in seen:
+                    seen.add( key )
+                    links.append( ( node1, port1, node2, port2 ) )
+        return links
+
+    def attachment( self, host ):
+        "Return the ( switch, port ) a host is connected to, or None"
+        for node, _port, port in self.edges[ host ]:
+            if self.isSwitch( node ):
+                return node, port
+        return None
+
+    def portsToward( self, target ):
+        """Find, for every switch, the port on a shortest path to target
+           target: switch name
+           returns: dict of switch -> port (None for target itself)"""
+        ports = { target: None }
+        queue = deque( [ target ] )
+        while queue:
+            node = queue.popleft()
+            for neighbor, _port, neighborPort in self.edges[ node ]:
+                if self.isSwitch( neighbor ) and neighbor not in ports:
+                    ports[ neighbor ] = neighborPort
+                    queue.append( neighbor )
+        return ports
+
+    def spanningTree( self, root=None ):
+        """Find a breadth-first spanning tree (a forest if the switches
+           are not all connected) of the switch-to-switch links
+           root: switch to grow the tree from (default: the first switch)
+           returns: set of ( switch, port ) on tree links"""
+        tree = set()
+        seen = set()
+        starts = ( [ root ] if root else [] ) + self.switches
+        for start in starts:
+            if start in seen:
+                continue
+            seen.add( start )
+            queue = deque( [ start ] )
+            while queue:
+                node = queue.popleft()
+                for neighbor, port, neighborPort in self.edges[ node ]:
+                    if self.isSwitch( neighbor ) and neighbor not in seen:
+                        seen.add( neighbor )
+                        tree.update( [ ( node, port ),
+                                       ( neighbor, neighborPort ) ] )
+                        queue.append( neighbor )
+        return tree
+
+    def offTreePorts( self, root=None ):
+        """Return the switch-to-switch ports off the spanning tree, as
+           a dict of switch -> sorted ports; empty if there are no loops"""
+        tree = self.spanningTree( root )
+        ports = OrderedDict()
+        for switch in self.switches:
+            for neighbor, port, _port in self.edges[ switch ]:
+                if self.isSwitch( neighbor ) and ( switch, port ) not in tree:
+                    ports.setdefault( switch, [] ).append( port )
+        for switch in ports:
+            ports[ switch ].sort()
+        return ports
+
+    @classmethod
+    def fromNet( cls, net, extra=() ):
+        """Build the graph of a Mininet network
+           net: Mininet network, built or started
+           extra: further non-switch nodes linked to it, e.g. the root
+                  node of connectToInternet()"""
+        graph = cls()
+        for switch in net.switches:
+            graph.addSwitch( switch.name )
+        for node in list( net.hosts ) + list( extra ):
+            graph.addHost( node.name, nodeIP( node ) )
+        for link in net.links:
+            intf1, intf2 = link.intf1, link.intf2
+            if intf1.node.name in graph.edges and (
+                    intf2.node.name in graph.edges ):
+                graph.addLink( intf1.node.name, intf1.node.ports[ intf1 ],
+                               intf2.node.name, intf2.node.ports[ intf2 ] )
+        return graph
+
+    def __repr__( self ):
+        return '<TopoGraph: %d switches, %d hosts, %d links>' % (
+            len( self.switches ), len( self.hosts ), len( self.links() ) )
+
+
+def nodeIP( node ):
+    """Return a node's IP address as a dotted quad, also before its
+       interfaces are configured"""
+    ip = node.IP()
+    if not ip and getattr( node, 'params', {} ).get( 'ip' ):
+        ip = node.params[ 'ip' ].split( '/' )[ 0 ]
+    # ovs-ofctl doesn't take short forms such as the gateway's 10.254
+    return dottedQuad( ip ) if ip else ip
@@ -0,0 +1,135 @@
+"""
+Hardware interface validation and attachment.
+
+checkIntfs() validates any number of interfaces in one pass: existence
+comes from a single listing of /sys/class/net and addresses from a
+single 'ip -j addr' dump (falling back to 'ip -o addr' on iproute2
+without JSON output), instead of an 'ip link show' and an ifconfig per
+interface. It returns structured results rather than exiting, so the
+caller can report every problem at once before setup starts.
+
+Which interface goes to which switch comes from the spec's intf lines
+or from an interface map, e.g. 'eth1=s8,eth2=s15', parsed by
+parseAttach().
+"""
+
+import json
+import os
+import re
+from collections import namedtuple
+
+from mininet.log import info
+from mininet.util import quietRun
+
+
+SYSFS_NET = '/sys/class/net'
+
+
+class IntfStatus( namedtuple( 'IntfStatus', 'name exists addrs' ) ):
+    "Result of checking one interface: whether it exists, its IPv4 addrs"
+
+    def problem( self ):
+        "Return why the interface can't be attached, or None"
+        if not self.exists:
+            return 'does not exist'
+        if self.addrs:
+            return ( 'has an IP address (%s) and is probably in use' %
+                     ', '.join( self.addrs ) )
+        return None
+
+
+def ipv4Addrs():
+    "Return a dict of interface name -> list of IPv4 addresses"
+    addrs = {}
+    try:
+        for entry in json.loads( quietRun( 'ip -j -4 addr show' ) ):
+            addrs[ entry[ 'ifname' ] ] = [
+                '%s/%s' % ( a[ 'local' ], a[ 'prefixlen' ] )
+                for a in entry.get( 'addr_info', [] ) ]
+        return addrs
+    except ( ValueError, KeyError, TypeError ):
+        pass
+    # Older iproute2: one line per address, e.g.
+    # 2: eth0    inet 10.0.2.15/24 brd 10.0.2.255 scope global eth0 ...
+    for line in quietRun( 'ip -o -4 addr show' ).splitlines():
+        fields = line.split()
+        if len( fields ) > 3 and fields[ 2 ] == 'inet':
+            name = fields[ 1 ].split( '@' )[ 0 ]
+            addrs.setdefault( name, [] ).append( fields[ 3 ] )
+    return addrs
+
+def checkIntfs( names ):
+    """Check that interfaces exist and are not configured
+       names: interface names
+       returns: list of IntfStatus, in the order of names"""
+    try:
+        present = set( os.listdir( SYSFS_NET ) )
+    except OSError:
+        present = set()
+    addrs = ipv4Addrs() if present.intersection( names ) else {}
+    return [ IntfStatus( name, name in present, addrs.get( name, [] ) )
+             for name in names ]
+
+def intfProblems( statuses ):
+    "Return error messages for the interfaces that can't be attached"
+    return [ 'Error: %s %s' % ( status.name, status.problem() )
+             for status in statuses if status.problem() ]
+
+def parseAttach( text ):
+    """Parse an interface map such as 'eth1=s8,eth2=s15'; entries are
+       separated by commas, spaces or newlines and # starts a comment
+       returns: list of ( interface, switch name )"""
+    intfs = []
+    for line in text.splitlines():
+        for entry in re.split( r'[\s,]+', line.split( '#' )[ 0 ] ):
+            if not entry:
+                continue
+            intf, _sep, switch = entry.partition( '=' )
+            if not intf or not switch:
+                raise ValueError( 'bad interface mapping %r, expected '
+                                  'intf=switch' % entry )
+            intfs.append( ( intf, switch ) )
+    return intfs
+
+def loadAttach( path ):
+    "Read an interface map file, see parseAttach()"
+    with open( path ) as f:
+        return parseAttach( f.read() )
+
+def attachProblems( intfs, switches, check=True ):
+    """Check an interface map in one pass
+       intfs: list of ( interface, switch name )
+       switches: names of the switches in the topology
+       check: also check the interfaces on this machine with checkIntfs()
+       returns: error messages for unknown switches, interfaces mapped
+                more than once and interfaces failing checkIntfs()"""
+    problems = []
+    switches = set( switches )
+    seen = set()
+    for intf, switch in intfs:
+        if switch not in switches:
+            problems.append( 'Error: %s is mapped to unknown switch %s' %
+                             ( intf, switch ) )
+        if intf in seen:
+            problems.append( 'Error: %s is mapped more than once' % intf )
+        seen.add( intf )
+    if not check:
+        return problems
+    names = [ intf for intf, _switch in intfs ]
+    unique = sorted( set( names ), key=names.index )
+    return problems + intfProblems( checkIntfs( unique ) )
+
+def addHwIntfs( net, intfs ):
+    """Attach hardware interfaces to switches; check them first with
+       attachProblems(). The ports are added when the switches start,
+       so BatchOVSSwitch adds all of them in its one transaction
+       net: Mininet network; interfaces are created with net.intf
+       intfs: list of ( interface, switch name )"""
+    for intfName, switchName in intfs:
+        switch = net.get( switchName )
+        info( '*** Adding hardware interface', intfName, 'to switch',
+              switch.name, '\n' )
+        net.intf( intfName, node=switch )
+    if intfs:
+        info( '*** Note: you may need to reconfigure the interfaces for '
+              'the Mininet hosts:\n', net.hosts, '\n' )
@@ -0,0 +1,84 @@
+"""
+Connect a Mininet network to the outside world through the root
+namespace, with NAT and forwarding.
+
+These helpers used to be copied into every Net-to-*.py script.
+"""
+
+from mininet.log import info
+from mininet.node import Node
+
+from mntopo.arp import fillNeighbors
+from mntopo.bringup import parallelStart
+from mntopo.nat import startNAT
+from mntopo.routes import installRoutes
+from mntopo.util import PhaseTimer
+
+
+def fixNetworkManager( root, intf ):
+    """Prevent network-manager from messing with our interface,
+       by specifying manual configuration in /etc/network/interfaces
+       root: a node in the root namespace (for running commands)
+       intf: interface name"""
+    cfile = '/etc/network/interfaces'
+    line = 'iface %s inet manual' % intf
+    # Check and append in one command, echoing the line if it was added
+    result = root.cmd( "[ ! -e {cfile} ] || grep -qxF '{line}' {cfile} || "
+                       "{{ printf '\\n%s\\n' '{line}' >> {cfile} && "
+                       "echo added; }}".format( cfile=cfile, line=line ) )
+    if 'added' in result:
+        info( '*** Added', line, 'to', cfile, '\n' )
+        # Probably need to restart network-manager to be safe -
+        # hopefully this won't disconnect you
+        root.cmd( 'service network-manager restart' )
+
+def connectToInternet( network, switch='s1', rootip='10.254', subnet='10.0/8',
+                       timer=None, workers=1, root=None, connectTimeout=10,
+                       staticArp=False ):
+    """Connect the network to the internet
+       switch: switch to connect to root namespace
+       rootip: address for interface in root namespace
+       subnet: Mininet subnet
+       timer: PhaseTimer to record bring-up phases in (optional)
+       workers: number of parallel workers for network start-up
+       root: node in the root namespace to use (default: a new Node)
+       connectTimeout: seconds to wait for switches to connect to their
+                       controllers before going on (0: don't wait)
+       staticArp: fill every host's neighbor table with all other hosts
+                  and the gateway instead of leaving it to ARP"""
+    report = timer is None
+    if report:
+        timer = PhaseTimer()
+    switch = network.get( switch )
+    prefixLen = subnet.split( '/' )[ 1 ]
+
+    # Create a node in root namespace
+    if root is None:
+        root = Node( 'root', inNamespace=False )
+
+    # Prevent network-manager from interfering with our interface
+    fixNetworkManager( root, 'root-eth0' )
+
+    # Create link between root NS and switch
+    link = network.addLink( root, switch )
+    link.intf1.setIP( rootip, prefixLen )
+
+    # Start network that now includes link to root namespace
+    with timer.phase( 'start' ):
+        parallelStart( network, workers, timer, connectTimeout )
+
+    # Start NAT and establish forwarding
+    with timer.phase( 'nat' ):
+        startNAT( root )
+
+    # Establish routes from end hosts, all hosts at once
+    with timer.phase( 'routes' ):
+        installRoutes( network.hosts, subnet, rootip )
+
+    if staticArp:
+        with timer.phase( 'arp' ):
+            fillNeighbors( network.hosts + [ root ] )
+
+    if report:
+        timer.report( 'Time to connect %d hosts' % len( network.hosts ) )
+    return root
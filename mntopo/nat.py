@@ -0,0 +1,159 @@
+"""
+Idempotent NAT/forwarding setup for the root namespace.
+
+All rules live in two dedicated chains, MNTOPO-FORWARD (filter table)
+and MNTOPO-POSTROUTING (nat table), hooked into FORWARD and POSTROUTING
+by a single jump each. They are loaded atomically with one
+iptables-restore --noflush, so the host's own rules and chain policies
+are left alone. Forwarded traffic that our chain does not match falls
+through to the host's rules.
+
+startNAT() compares the live ruleset (one iptables-save) with the rules
+it wants and does nothing if they are already in place, so restarting
+an experiment reuses the rules of the previous run. It records on the
+node that NAT was started and whether the kernel was forwarding before,
+and stopNAT() removes only our chains and restores forwarding as it
+was, or does nothing if NAT was never started from the node.
+"""
+
+from mininet.log import error
+
+from mntopo.pipeline import CmdPipeline, failures
+from mntopo.util import dottedQuad, pipeCmd
+
+
+FORWARD_CHAIN = 'MNTOPO-FORWARD'
+NAT_CHAIN = 'MNTOPO-POSTROUTING'
+FORWARDING = 'net.ipv4.ip_forward'
+
+
+def natRules( localIntf, inetIntf, subnet ):
+    """Return our rules per table, in iptables-save syntax so they can be
+       compared with the live ruleset
+       localIntf: interface connecting to the Mininet network
+       inetIntf: interface for internet access
+       subnet: Mininet subnet"""
+    subnet = dottedQuad( subnet )
+    return {
+        'filter': [ '-A %s -d %s -i %s -j DROP' %
+                    ( FORWARD_CHAIN, subnet, localIntf ),
+                    '-A %s -s %s -i %s -j ACCEPT' %
+                    ( FORWARD_CHAIN, subnet, localIntf ),
+                    '-A %s -d %s -i %s -j ACCEPT' %
+                    ( FORWARD_CHAIN, subnet, inetIntf ) ],
+        'nat': [ '-A %s -o %s -j MASQUERADE' % ( NAT_CHAIN, inetIntf ) ] }
+
+JUMPS = { 'filter': ( 'FORWARD', FORWARD_CHAIN ),
+          'nat': ( 'POSTROUTING', NAT_CHAIN ) }
+
+def savedRules( root ):
+    """Return the live rules as a dict of table -> list of rule lines
+       root: node in the root namespace"""
+    saved = CmdPipeline( root ).add( 'iptables-save' ).run()[ 0 ]
+    if saved.status:
+        raise Exception( 'iptables-save failed: %s' % saved.output )
+    return parseSaved( saved.output )
+
+def parseSaved( text ):
+    """Parse iptables-save output into a dict of table -> list of chain
+       and rule lines"""
+    tables = {}
+    table = None
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith( '*' ):
+            table = tables.setdefault( line[ 1: ], [] )
+        elif table is not None and line.startswith( ( '-A', ':' ) ):
+            table.append( line )
+    return tables
+
+def hasChain( rules, chain ):
+    "Does the rule list of a table declare chain?"
+    return any( line.startswith( ':%s ' % chain ) for line in rules )
+
+def restoreCmd( tables ):
+    """Return the shell command loading tables (table -> lines) with
+       iptables-restore --noflush"""
+    lines = []
+    for table in sorted( tables ):
+        if tables[ table ]:
+            lines += [ '*' + table ] + tables[ table ] + [ 'COMMIT' ]
+    return pipeCmd( lines, 'iptables-restore --noflush' )
+
+def forwardingCmd( enabled ):
+    "Return the shell command turning kernel IPv4 forwarding on or off"
+    return 'sysctl -qw %s=%d' % ( FORWARDING, bool( enabled ) )
+
+def rulesToLoad( live, wanted ):
+    """Return what iptables-restore --noflush must load to put our rules
+       in place, as a dict of table -> lines; empty if they already are
+       live: live rules, from savedRules()
+       wanted: our rules, from natRules()"""
+    load = {}
+    for table, rules in wanted.items():
+        builtin, chain = JUMPS[ table ]
+        jump = '-A %s -j %s' % ( builtin, chain )
+        current = live.get( table, [] )
+        ours = [ line for line in current
+                 if line.startswith( '-A %s ' % chain ) ]
+        if ours == rules and jump in current:
+            continue
+        # Declaring the chain creates it, or flushes it if it exists
+        load[ table ] = [ ':%s - [0:0]' % chain ] + rules
+        if jump not in current:
+            load[ table ].append( '-I %s 1 -j %s' % ( builtin, chain ) )
+    return load
+
+def startNAT( root, inetIntf='eth0', subnet='10.0/8' ):
+    """Start NAT/forwarding between Mininet and external network
+       root: node to access iptables from
+       inetIntf: interface for internet access
+       subnet: Mininet subnet (default 10.0/8)
+       returns: True if rules were loaded, False if already in place
+       Sets root.natForwarding to whether the kernel was forwarding
+       before."""
+    # Identify the interface connecting to the mininet network
+    localIntf = root.defaultIntf()
+    load = rulesToLoad( savedRules( root ),
+                        natRules( localIntf, inetIntf, subnet ) )
+    pipeline = CmdPipeline( root ).add( 'sysctl -n', FORWARDING )
+    if load:
+        pipeline.add( restoreCmd( load ) )
+    # Instruct the kernel to perform forwarding
+    pipeline.add( forwardingCmd( True ) )
+    results = pipeline.run()
+    # From here on stopNAT() has something to undo, even if this fails
+    root.natForwarding = results[ 0 ].output.strip() == '1'
+    for result in failures( results ):
+        raise Exception( 'Starting NAT failed: %s' % result.output )
+    return bool( load )
+
+def stopNAT( root ):
+    """Stop NAT/forwarding between Mininet and external network,
+       removing only our own chains and restoring kernel forwarding
+       as it was before startNAT()
+       root: node NAT was started from; nothing is done if it wasn't"""
+    forwarding = getattr( root, 'natForwarding', None )
+    if forwarding is None:
+        return
+    del root.natForwarding
+    live = savedRules( root )
+    unload = {}
+    for table, ( builtin, chain ) in JUMPS.items():
+        current = live.get( table, [] )
+        lines = []
+        jump = '-A %s -j %s' % ( builtin, chain )
+        lines += [ '-D' + jump[ 2: ] ] * current.count( jump )
+        if hasChain( current, chain ):
+            lines += [ '-F %s' % chain, '-X %s' % chain ]
+        unload[ table ] = lines
+    pipeline = CmdPipeline( root )
+    if any( unload.values() ):
+        pipeline.add( restoreCmd( unload ) )
+    if not forwarding:
+        # Instruct the kernel to stop forwarding
+        pipeline.add( forwardingCmd( False ) )
+    if not pipeline:
+        return
+    for result in failures( pipeline.run() ):
+        error( '*** Stopping NAT failed: %s\n' % result.output )
@@ -0,0 +1,76 @@
+"""
+Batched Open vSwitch backend.
+
+BatchOVSSwitch is Mininet's OVSSwitch with batch=True: start() queues
+each switch's ovs-vsctl command, and OVSSwitch.batchStartup() runs the
+queued commands of all switches in as few ovs-vsctl transactions as
+argmax allows, then re-applies the qdiscs of TCIntf ports that OVS
+cleared. On top of that, failed transactions are logged, and
+transactions() joins any ovs-vsctl commands the same way for teardown
+and reconfiguration.
+
+Mininet.start() and mntopo.bringup.parallelStart() call batchStartup()
+for every switch class that has it.
+"""
+
+from mininet.log import error
+from mininet.node import OVSSwitch
+from mininet.util import errRun
+
+
+def portArgs( switch, intf ):
+    """Return the ovs-vsctl commands adding intf to an OVSSwitch, with
+       its OVSSwitch.intfOpts() (port number, patch peer)"""
+    # intfOpts() is ' -- set Interface ...', or empty
+    opts = switch.intfOpts( intf ).split()
+    return [ [ 'add-port', switch.name, intf.name ] ] + (
+        [ opts[ 1: ] ] if opts else [] )
+
+
+class BatchOVSSwitch( OVSSwitch ):
+    "Open vSwitch switch started in batched ovs-vsctl transactions"
+
+    # Leave some room below the usual 128 KiB ARG_MAX
+    argmax = 100000
+
+    def __init__( self, name, **params ):
+        params.setdefault( 'batch', True )
+        OVSSwitch.__init__( self, name, **params )
+
+    @classmethod
+    def transactions( cls, groups ):
+        """Join command groups into as few ovs-vsctl argument lists as
+           argmax allows, never splitting a group (--id=@name references
+           only resolve within one transaction)
+           groups: list of lists of ovs-vsctl commands"""
+        argvs = []
+        argv, length = [], 0
+        for group in groups:
+            args = []
+            for command in group:
+                args.extend( [ '--' ] + command )
+            size = sum( len( arg ) + 1 for arg in args )
+            if argv and length + size > cls.argmax:
+                argvs.append( argv )
+                argv, length = [], 0
+            argv.extend( args )
+            length += size
+        if argv:
+            argvs.append( argv )
+        return [ [ 'ovs-vsctl' ] + argv for argv in argvs ]
+
+    @classmethod
+    def batchStartup( cls, switches, run=errRun ):
+        """Start switches as OVSSwitch.batchStartup() does, logging
+           failed transactions
+           switches: switches to start up
+           run: function to run commands (errRun)
+           returns: switches that were started"""
+        def checked( cmd, **kwargs ):
+            "Run cmd, logging its error if it fails"
+            out, err, exitcode = run( cmd, **kwargs )
+            if exitcode:
+                error( '*** ovs-vsctl failed: %s\n' % err )
+            return out, err, exitcode
+        return super( BatchOVSSwitch, cls ).batchStartup(
+            switches, run=checked )
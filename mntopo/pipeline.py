@@ -0,0 +1,131 @@
+"""
+Pipelined shell commands for Mininet nodes.
+
+Node.cmd() writes one command to the node's shell and blocks until the
+shell prints its prompt again, so every command costs a full round
+trip. A CmdPipeline queues any number of commands, sends them to the
+shell in one write and collects all of their outputs and exit codes in
+one read. Each command's output is followed by a marker line carrying
+its index and exit status, so results and errors come back per command:
+
+    pipe = CmdPipeline( root )
+    pipe.add( 'iptables-restore --noflush < rules' )
+    pipe.add( 'sysctl', 'net.ipv4.ip_forward=1' )
+    for result in pipe.run():
+        if result.status:
+            error( result.cmd, 'failed:', result.output )
+
+runPipelines() sends the pipelines of many nodes before collecting any,
+so the nodes run them concurrently.
+
+A node's shell reads its commands from a tty in canonical mode, which
+drops everything past the first 4095 bytes of a line. Longer scripts
+(large ip, tc or ovs-ofctl batches) are written to a file that the
+shell sources instead.
+"""
+
+import os
+import re
+import tempfile
+from collections import namedtuple
+from uuid import uuid4
+
+
+CmdResult = namedtuple( 'CmdResult', 'cmd status output' )
+# Longest script sent to a shell as a line, below the tty's 4095 bytes
+MAX_LINE = 4000
+
+
+class CmdPipeline( object ):
+    "Shell commands queued for a node and run in one round trip"
+
+    def __init__( self, node ):
+        self.node = node
+        self.cmds = []
+        self.marker = '@@mntopo-%s' % uuid4().hex
+        self.scriptFile = None
+
+    def add( self, *args ):
+        "Queue a command; arguments are joined with spaces like Node.cmd"
+        self.cmds.append( ' '.join( str( arg ) for arg in args ) )
+        return self
+
+    def __len__( self ):
+        return len( self.cmds )
+
+    def script( self ):
+        "Return the queued commands as one line of shell"
+        parts = []
+        for index, cmd in enumerate( self.cmds ):
+            cmd = cmd.rstrip()
+            # A backgrounded command can't be followed by ';'
+            sep = ' ' if cmd.endswith( '&' ) else ' ; '
+            parts.append( "{ %s%s} 2>&1; printf '\\n%s %d %%d\\n' $?;" %
+                          ( cmd, sep, self.marker, index ) )
+        return ' '.join( parts )
+
+    def send( self ):
+        "Write the queued commands to the node's shell"
+        script = self.script()
+        if len( script ) > MAX_LINE:
+            fd, self.scriptFile = tempfile.mkstemp( prefix='mntopo-',
+                                                    suffix='.sh' )
+            with os.fdopen( fd, 'w' ) as f:
+                f.write( script + '\n' )
+            script = '. %s' % self.scriptFile
+        self.node.sendCmd( script, printPid=False )
+
+    def collect( self ):
+        """Wait for the commands sent by send() to finish
+           returns: list of CmdResult, one per queued command"""
+        try:
+            return self.parse( self.node.waitOutput() )
+        finally:
+            if self.scriptFile:
+                os.unlink( self.scriptFile )
+                self.scriptFile = None
+
+    def run( self ):
+        """Run the queued commands in one round trip
+           returns: list of CmdResult, one per queued command"""
+        if not self.cmds:
+            return []
+        self.send()
+        return self.collect()
+
+    def parse( self, output ):
+        "Split the shell output into per-command results"
+        pattern = re.compile( r'\r?\n%s (\d+) (\d+)\r?\n' %
+                              re.escape( self.marker ) )
+        results = []
+        start = 0
+        for match in pattern.finditer( output ):
+            index, status = int( match.group( 1 ) ), int( match.group( 2 ) )
+            results.append( CmdResult( self.cmds[ index ], status,
+                                       output[ start:match.start() ] ) )
+            start = match.end()
+        # A command that killed the shell leaves no marker behind
+        for cmd in self.cmds[ len( results ): ]:
+            results.append( CmdResult( cmd, None, output[ start: ] ) )
+            start = len( output )
+        return results
+
+
+def failures( results ):
+    "Return the results of commands that failed"
+    return [ result for result in results if result.status != 0 ]
+
+def runPipelines( pipelines, sent=None ):
+    """Run the pipelines of many nodes concurrently
+       pipelines: list of CmdPipeline, at most one per node
+       sent: function called once all pipelines have been sent, before
+             any output is collected (optional)
+       returns: list of result lists, in pipeline order"""
+    active = [ pipeline for pipeline in pipelines if pipeline.cmds ]
+    for pipeline in active:
+        pipeline.send()
+    if sent:
+        sent()
+    results = dict( ( id( pipeline ), pipeline.collect() )
+                    for pipeline in active )
+    return [ results.get( id( pipeline ), [] ) for pipeline in pipelines ]
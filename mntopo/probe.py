@@ -0,0 +1,229 @@
+"""
+ICMP echo prober run inside a host by mntopo.sweep.
+
+One process probes all of its targets from one raw socket, keeping at
+most --window echo requests in flight, so a probe costs a packet rather
+than a ping process. It prints one line per target:
+
+    <ip> <sent> <received> <mean RTT in ms, or ->
+
+With --interval, used by mntopo.faults, it instead probes every target
+once per interval for --duration seconds, and also prints each run of
+consecutive lost probes:
+
+    gap <ip> <first sent> <last sent> <lost> <next reply, or ->
+
+with times in seconds since the epoch; the run ends with the arrival of
+the next reply, which may come late (e.g. held in the neighbor queue
+while a link is down) but still within --timeout.
+
+This file only uses the standard library and is run by path, so it
+does not need mntopo on the host's Python path. It needs root (raw
+sockets).
+
+Usage: python probe.py [--count N] [--timeout S] [--window N] ip ...
+       python probe.py --interval MS --duration S [--timeout S] ip ...
+"""
+
+import os
+import select
+import socket
+import struct
+import sys
+import time
+from argparse import ArgumentParser
+
+
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY = 0
+ECHO = struct.Struct( '!BBHHH' )
+# Kernel receive timestamps, so a reply that waits for us in the socket
+# (while many probers share a CPU) neither times out nor inflates its RTT
+SO_TIMESTAMPNS = getattr( socket, 'SO_TIMESTAMPNS', 35 )
+TIMESPEC = struct.Struct( '@ll' )
+
+
+def checksum( data ):
+    "Return the Internet checksum of data"
+    if len( data ) % 2:
+        data += b'\0'
+    total = sum( struct.unpack( '!%dH' % ( len( data ) // 2 ), data ) )
+    total = ( total >> 16 ) + ( total & 0xffff )
+    total += total >> 16
+    return ~total & 0xffff
+
+def echoRequest( ident, seq, payload=b'mntopo-probe' ):
+    "Return an ICMP echo request"
+    header = ECHO.pack( ICMP_ECHO_REQUEST, 0, 0, ident, seq )
+    return ECHO.pack( ICMP_ECHO_REQUEST, 0,
+                      checksum( header + payload ), ident, seq ) + payload
+
+def parseReply( packet, ident ):
+    "Return the sequence number of an echo reply to us in an IP packet"
+    offset = ( ord( packet[ 0:1 ] ) & 0x0f ) * 4
+    if len( packet ) < offset + ECHO.size:
+        return None
+    icmpType, _code, _sum, replyId, seq = ECHO.unpack_from( packet, offset )
+    if icmpType != ICMP_ECHO_REPLY or replyId != ident:
+        return None
+    return seq
+
+def receive( sock ):
+    """Read every packet waiting on sock
+       returns: list of ( packet, kernel receive time )"""
+    packets = []
+    while True:
+        try:
+            packet, ancillary, _flags, _addr = sock.recvmsg(
+                65536, socket.CMSG_SPACE( TIMESPEC.size ),
+                socket.MSG_DONTWAIT )
+        except ( BlockingIOError, InterruptedError ):
+            return packets
+        stamp = time.time()
+        for level, kind, data in ancillary:
+            if level == socket.SOL_SOCKET and kind == SO_TIMESTAMPNS:
+                seconds, nanoseconds = TIMESPEC.unpack(
+                    data[ :TIMESPEC.size ] )
+                stamp = seconds + nanoseconds / 1e9
+        packets.append( ( packet, stamp ) )
+
+def probe( targets, count=1, timeout=1.0, window=32 ):
+    """Send count echo requests to each target, at most window at a time
+       returns: dict of target -> list of RTTs in ms (None: lost)"""
+    sock = socket.socket( socket.AF_INET, socket.SOCK_RAW,
+                          socket.IPPROTO_ICMP )
+    sock.setsockopt( socket.SOL_SOCKET, SO_TIMESTAMPNS, 1 )
+    ident = os.getpid() & 0xffff
+    # Probe n goes to targets[ n % len( targets ) ], so each round
+    # covers every target once before any target is probed again
+    probes = len( targets ) * count
+    rtts = dict( ( target, [ None ] * count ) for target in targets )
+    sent = {}
+    nextProbe = 0
+    while nextProbe < probes or sent:
+        while nextProbe < probes and len( sent ) < window:
+            seq = nextProbe & 0xffff
+            start = time.time()
+            sock.sendto( echoRequest( ident, seq ),
+                         ( targets[ nextProbe % len( targets ) ], 0 ) )
+            sent[ seq ] = ( nextProbe, start )
+            nextProbe += 1
+        oldest = min( start for _n, start in sent.values() )
+        select.select( [ sock ], [], [],
+                       max( 0, oldest + timeout - time.time() ) )
+        for packet, stamp in receive( sock ):
+            seq = parseReply( packet, ident )
+            if seq in sent:
+                n, start = sent.pop( seq )
+                if stamp - start < timeout:
+                    rtts[ targets[ n % len( targets ) ] ][
+                        n // len( targets ) ] = ( stamp - start ) * 1000
+        # Only expire probes once all waiting replies have been read
+        now = time.time()
+        for seq, ( _n, start ) in list( sent.items() ):
+            if now - start >= timeout:
+                del sent[ seq ]
+    sock.close()
+    return rtts
+
+def stream( targets, interval, duration, timeout=1.0 ):
+    """Send an echo request to every target once per interval seconds
+       for duration seconds
+       returns: dict of target -> list of ( send time, RTT in ms or None
+                if lost ), one per round"""
+    sock = socket.socket( socket.AF_INET, socket.SOCK_RAW,
+                          socket.IPPROTO_ICMP )
+    sock.setsockopt( socket.SOL_SOCKET, SO_TIMESTAMPNS, 1 )
+    ident = os.getpid() & 0xffff
+    rounds = max( 1, int( duration / interval ) )
+    probes = len( targets ) * rounds
+    results = dict( ( target, [] ) for target in targets )
+    sent = {}
+    nextProbe = 0
+    start = time.time()
+    while nextProbe < probes or sent:
+        # A round that is due goes out at once, even if we fell behind
+        while ( nextProbe < probes and
+                start + nextProbe // len( targets ) * interval <=
+                time.time() ):
+            seq = nextProbe & 0xffff
+            target = targets[ nextProbe % len( targets ) ]
+            stamp = time.time()
+            sock.sendto( echoRequest( ident, seq ), ( target, 0 ) )
+            results[ target ].append( [ stamp, None ] )
+            sent[ seq ] = ( target, results[ target ][ -1 ] )
+            nextProbe += 1
+        wake = [ entry[ 0 ] + timeout for _target, entry in sent.values() ]
+        if nextProbe < probes:
+            wake.append( start + nextProbe // len( targets ) * interval )
+        select.select( [ sock ], [], [], max( 0, min( wake ) - time.time() ) )
+        for packet, stamp in receive( sock ):
+            seq = parseReply( packet, ident )
+            if seq in sent:
+                _target, entry = sent.pop( seq )
+                if stamp - entry[ 0 ] < timeout:
+                    entry[ 1 ] = ( stamp - entry[ 0 ] ) * 1000
+        now = time.time()
+        for seq, ( _target, entry ) in list( sent.items() ):
+            if now - entry[ 0 ] >= timeout:
+                del sent[ seq ]
+    sock.close()
+    return dict( ( target, [ tuple( entry ) for entry in entries ] )
+                 for target, entries in results.items() )
+
+def gaps( entries ):
+    """Return the runs of consecutive lost probes in stream() results
+       returns: list of ( first sent, last sent, lost, arrival time of
+                the next reply or None )"""
+    runs = []
+    first = None
+    for n, ( stamp, rtt ) in enumerate( entries ):
+        if rtt is None and first is None:
+            first = n
+        elif rtt is not None and first is not None:
+            runs.append( ( entries[ first ][ 0 ], entries[ n - 1 ][ 0 ],
+                           n - first, stamp + rtt / 1000 ) )
+            first = None
+    if first is not None:
+        runs.append( ( entries[ first ][ 0 ], entries[ -1 ][ 0 ],
+                       len( entries ) - first, None ) )
+    return runs
+
+def summary( target, rtts ):
+    "Return the summary line of target's RTTs (None: lost)"
+    times = [ rtt for rtt in rtts if rtt is not None ]
+    return '%s %d %d %s' % (
+        target, len( rtts ), len( times ),
+        '%.3f' % ( sum( times ) / len( times ) ) if times else '-' )
+
+def main( argv=None ):
+    parser = ArgumentParser( description='Probe targets with ICMP echo' )
+    parser.add_argument( '--count', type=int, default=1 )
+    parser.add_argument( '--timeout', type=float, default=1.0 )
+    parser.add_argument( '--window', type=int, default=32 )
+    parser.add_argument( '--interval', type=float, metavar='MS' )
+    parser.add_argument( '--duration', type=float, default=10.0 )
+    parser.add_argument( 'targets', nargs='*' )
+    args = parser.parse_args( argv )
+    if not args.targets:
+        return
+    lines = []
+    if args.interval:
+        results = stream( args.targets, args.interval / 1000.0,
+                          args.duration, args.timeout )
+        for target in args.targets:
+            lines.append( summary( target, [ rtt for _stamp, rtt
+                                             in results[ target ] ] ) )
+            for first, last, lost, recovered in gaps( results[ target ] ):
+                lines.append( 'gap %s %.6f %.6f %d %s' % (
+                    target, first, last, lost,
+                    '-' if recovered is None else '%.6f' % recovered ) )
+    else:
+        rtts = probe( args.targets, args.count, args.timeout, args.window )
+        lines = [ summary( target, rtts[ target ] )
+                  for target in args.targets ]
+    sys.stdout.write( '\n'.join( lines ) + '\n' )
+
+
+if __name__ == '__main__':
+    main()
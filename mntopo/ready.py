@@ -0,0 +1,105 @@
+"""
+Controller-readiness barrier.
+
+Mininet's waitConnected() asks one switch at a time whether it is
+connected (two ovs-vsctl calls per switch) and sleeps half a second
+between rounds. waitReady() instead polls every switch at once, for
+Open vSwitch with a single ovs-vsctl dump of all bridges and
+controllers, every 20 ms, and records how long each switch took from
+the moment its bridge was configured until it reported is_connected.
+"""
+
+import json
+import time
+
+from mininet.log import info, warn
+from mininet.node import OVSSwitch
+from mininet.util import errRun
+
+from mntopo.util import parallelMap
+
+
+def ovsRows( text ):
+    "Parse the output of ovs-vsctl --format=json commands into row dicts"
+    tables = []
+    decoder = json.JSONDecoder()
+    text = text.strip()
+    while text:
+        table, end = decoder.raw_decode( text )
+        tables.append( [ dict( zip( table[ 'headings' ], row ) )
+                         for row in table[ 'data' ] ] )
+        text = text[ end: ].strip()
+    return tables
+
+def ovsSet( value ):
+    "Return the members of an ovsdb JSON value, which may be a set"
+    if isinstance( value, list ) and value and value[ 0 ] == 'set':
+        return value[ 1 ]
+    return [ value ]
+
+def ovsConnected( run=errRun ):
+    """Return the names of the bridges connected to at least one of
+       their controllers, or in standalone fail mode, with one ovs-vsctl
+       run: function to run commands (errRun)"""
+    out, err, exitcode = run(
+        'ovs-vsctl --format=json --data=json '
+        '-- --columns=name,controller,fail_mode list Bridge '
+        '-- --columns=_uuid,is_connected list Controller' )
+    if exitcode:
+        warn( '*** Reading controller state failed: %s\n' % err )
+        return set()
+    bridges, controllers = ovsRows( out )
+    up = set( tuple( row[ '_uuid' ] ) for row in controllers
+              if row[ 'is_connected' ] is True )
+    return set( row[ 'name' ] for row in bridges
+                if row[ 'fail_mode' ] == 'standalone' or
+                any( tuple( uuid ) in up
+                     for uuid in ovsSet( row[ 'controller' ] ) ) )
+
+def connectedSwitches( switches, workers=1 ):
+    """Return the names of the switches that are connected
+       switches: switches to check; Open vSwitch switches are checked
+                 with one ovs-vsctl call, others with connected()
+       workers: concurrent connected() calls for other switches"""
+    ovs = [ switch for switch in switches if isinstance( switch, OVSSwitch ) ]
+    others = [ switch for switch in switches
+               if not isinstance( switch, OVSSwitch ) ]
+    connected = set()
+    if ovs:
+        connected |= ovsConnected() & set( switch.name for switch in ovs )
+    states = parallelMap( lambda switch: switch.connected(), others, workers )
+    connected |= set( switch.name for switch, state in zip( others, states )
+                      if state )
+    return connected
+
+def waitReady( switches, started=None, timeout=10, interval=.02,
+               workers=1 ):
+    """Wait until every switch is connected to a controller
+       switches: switches to wait for
+       started: dict of switch name -> time its bridge was configured
+                (default: now)
+       timeout: seconds to wait
+       interval: seconds between polls
+       workers: concurrent connected() calls for non-OVS switches
+       returns: dict of switch name -> seconds from start to connection,
+                None for switches that did not connect in time"""
+    info( '*** Waiting for %d switches to connect\n' % len( switches ) )
+    begin = time.time()
+    started = started or {}
+    ready = dict( ( switch.name, None ) for switch in switches )
+    remaining = list( switches )
+    while remaining:
+        connected = connectedSwitches( remaining, workers )
+        now = time.time()
+        for switch in list( remaining ):
+            if switch.name in connected:
+                ready[ switch.name ] = now - started.get( switch.name, begin )
+                remaining.remove( switch )
+        if not remaining or now - begin > timeout:
+            break
+        time.sleep( interval )
+    if remaining:
+        warn( '*** %d switches not connected after %ss: %s\n' %
+              ( len( remaining ), timeout,
+                ' '.join( switch.name for switch in remaining ) ) )
+    return ready
@@ -0,0 +1,336 @@
+"""
+Live reconfiguration: change a running network to match another spec.
+
+diffTopo() compares a running network with a target TopoSpec, e.g. the
+NTTU tree with a redundant uplink between two distribution switches
+added to its spec, and reconfigure() applies only the difference:
+
+- veths of removed links are deleted and those of new links created
+  with one ip -batch per namespace, all namespaces at once, host ends
+  going straight into their namespaces
+- their switch ports are deleted and added in one ovs-vsctl
+  transaction, while the new interfaces are configured; once it is
+  done, every switch port whose qdisc OVS cleared is shaped again
+- new hosts are created in parallel and get their address, routes and
+  link shaping with one ip -batch and tc -batch each, and static
+  neighbor entries with --static-arp; removed hosts are killed, and
+  their namespaces go with their last process
+- proactive and spanning-tree flows (mntopo.flows) are recomputed for
+  the new topology if the network uses them
+
+Switches can not be added or removed, and links are matched by their
+end nodes only, so changed link parameters are not applied. Every step
+is timed in milliseconds.
+
+In the CLI: reconfig SPEC
+"""
+
+import subprocess
+import time
+from collections import Counter, OrderedDict
+
+from mininet.link import Link
+from mininet.log import error, output
+
+from mntopo.arp import fillNeighbors
+from mntopo.bringup import addNodes, hostDefaults
+from mntopo.flows import installFlows
+from mntopo.ovs import BatchOVSSwitch, portArgs
+from mntopo.pipeline import CmdPipeline, failures, runPipelines
+from mntopo.routes import routeBatch
+from mntopo.shaping import ( linkShapes, lostShapes, namespaceBatches,
+                             shapeBatch )
+from mntopo.spec import SpecError, loadSpec
+from mntopo.teardown import killAll, namespacePids
+from mntopo.util import PhaseTimer, dottedQuad, ipBatchCmd, tcBatchCmd
+
+
+class TopoDiff( object ):
+    "Hosts and links to add to and delete from a running network"
+
+    def __init__( self ):
+        self.addHosts = []    # ( name, params ) from the spec
+        self.delHosts = []    # Mininet hosts
+        self.addLinks = []    # indices into the spec's links
+        self.delLinks = []    # Mininet links
+        self.shapes = {}      # new interface name -> shaping parameters
+        self.times = OrderedDict()
+        self.errors = {}
+
+    def __len__( self ):
+        return ( len( self.addHosts ) + len( self.delHosts ) +
+                 len( self.addLinks ) + len( self.delLinks ) )
+
+    def __str__( self ):
+        return '+%d/-%d hosts, +%d/-%d links' % (
+            len( self.addHosts ), len( self.delHosts ),
+            len( self.addLinks ), len( self.delLinks ) )
+
+
+def linkKey( node1, node2 ):
+    "Return the key matching a link between two nodes either way round"
+    return tuple( sorted( ( node1, node2 ) ) )
+
+def diffTopo( net, spec ):
+    """Compare net with the topology of spec
+       returns: TopoDiff
+       raises: SpecError if their switches differ"""
+    switches = set( switch.name for switch in net.switches )
+    if switches != set( spec.switchNames() ):
+        raise SpecError( 'switches can not be added or removed live' )
+    diff = TopoDiff()
+    hosts = set( host.name for host in net.hosts )
+    targets = set( spec.hostNames() )
+    diff.addHosts = [ ( name, params ) for name, params in spec.hosts
+                      if name not in hosts ]
+    diff.delHosts = [ host for host in net.hosts if host.name not in targets ]
+    # Links to other nodes, e.g. connectToInternet's root, are not ours
+    nodes = switches | hosts
+    current = OrderedDict()
+    for link in net.links:
+        key = linkKey( link.intf1.node.name, link.intf2.node.name )
+        if set( key ) <= nodes:
+            current.setdefault( key, [] ).append( link )
+    wanted = Counter()
+    for index, ( node1, node2, _params ) in enumerate( spec.links ):
+        key = linkKey( node1, node2 )
+        wanted[ key ] += 1
+        if wanted[ key ] > len( current.get( key, [] ) ):
+            diff.addLinks.append( index )
+    for key, links in current.items():
+        diff.delLinks += links[ wanted[ key ]: ]
+    return diff
+
+def runBatches( batches, what ):
+    """Run ( node, command ) pairs as one pipeline per node, all nodes at
+       once
+       returns: dict of node name -> error output, for failed nodes"""
+    pipelines = OrderedDict()
+    for node, cmd in batches:
+        pipelines.setdefault( node, CmdPipeline( node ) ).add( cmd )
+    pipelines = list( pipelines.values() )
+    errors = {}
+    for pipeline, results in zip( pipelines, runPipelines( pipelines ) ):
+        failed = failures( results )
+        if failed:
+            errors[ pipeline.node.name ] = ''.join(
+                result.output for result in failed ).strip()
+    for name in sorted( errors ):
+        error( '*** %s failed on %s: %s\n' % ( what, name, errors[ name ] ) )
+    return errors
+
+def batchCmds( entries, cmd ):
+    """Group ( Intf, lines ) by namespace into one command each
+       cmd: function of lines returning the command, e.g. ipBatchCmd
+       returns: list of ( node, command )"""
+    return [ ( node, cmd( lines ) )
+             for node, lines in namespaceBatches( entries ) if lines ]
+
+
+class QueuedLink( Link ):
+    """veth link whose pair reconfigure() creates in a batch; making one
+       doesn't run any command"""
+
+    def __init__( self, node1, node2, **params ):
+        # up=None: our interfaces are brought up in the batch as well
+        Link.__init__( self, node1, node2, up=None, **params )
+
+    def makeIntfPair( self, *_args, **_kwargs ):
+        "Leave the veth pair to the batch"
+        pass
+
+    def addLine( self ):
+        "Return the ip -batch line that creates our veth pair"
+        node1, node2 = self.intf1.node, self.intf2.node
+        line = 'link add %s address %s type veth peer name %s address %s' % (
+            self.intf1, self.intf1.mac, self.intf2, self.intf2.mac )
+        if node1.inNamespace or node2.inNamespace:
+            line += ' netns %d' % node2.pid
+        return line
+
+
+def ovsCmds( net, added, deleted ):
+    """Return the ovs-vsctl commands adding the switch ends of added and
+       deleting those of deleted"""
+    groups = []
+    for link in deleted:
+        for intf in link.intf1, link.intf2:
+            if intf.node in net.switches:
+                groups.append( [ [ '--if-exists', 'del-port', intf.node.name,
+                                   intf.name ] ] )
+    for link in added:
+        for intf in link.intf1, link.intf2:
+            switch = intf.node
+            if switch in net.switches:
+                groups.append( portArgs( switch, intf ) )
+    return BatchOVSSwitch.transactions( groups ) if groups else []
+
+def linkParams( net, spec, tiers=None ):
+    """Return the shaping parameters of the links of net that spec has,
+       matching them by their end nodes in order as diffTopo() does
+       tiers: dict of tier -> parameters (optional)
+       returns: list of ( Link, parameters )"""
+    shapes = OrderedDict()
+    for ( node1, node2, _params ), shape in zip( spec.links,
+                                                 linkShapes( spec, tiers ) ):
+        shapes.setdefault( linkKey( node1, node2 ), [] ).append( shape )
+    params = []
+    for link in net.links:
+        key = linkKey( link.intf1.node.name, link.intf2.node.name )
+        if shapes.get( key ):
+            params.append( ( link, shapes[ key ].pop( 0 ) ) )
+    return params
+
+def hostAddr( net, host ):
+    "Return host's address with its prefix length, as Mininet sets it"
+    ip = host.params[ 'ip' ]
+    return ip if '/' in ip else '%s/%d' % ( ip, net.prefixLen )
+
+def reshapePorts( net, spec, tiers=None ):
+    """Shape the switch ports of net that lost their root qdisc, e.g. to
+       an OVS bridge reconfiguration, as spec and tiers say, with one tc
+       qdisc show and one tc -batch in the root namespace
+       returns: dict of node name -> error output, for failed nodes"""
+    ports = [ ( intf, shapeBatch( intf, shape ) )
+              for link, shape in linkParams( net, spec, tiers )
+              for intf in ( link.intf1, link.intf2 )
+              if intf.node in net.switches and not intf.node.inNamespace ]
+    ports = [ ( intf, lines ) for intf, lines in ports if lines ]
+    if not ports:
+        return {}
+    node = ports[ 0 ][ 0 ].node
+    result = CmdPipeline( node ).add( 'tc qdisc show' ).run()[ 0 ]
+    return runBatches( batchCmds( lostShapes( result.output, ports ),
+                                  tcBatchCmd ), 'Shaping ports' )
+
+def reconfigure( net, spec, extra=(), workers=1, tiers=None,
+                 subnet='10.0/8', gateway='10.254', paths=False,
+                 tree=False, staticArp=False ):
+    """Change net to match spec, applying only the difference
+       extra: non-switch nodes outside net.hosts, e.g. the root node
+       workers: number of new hosts to create concurrently
+       tiers: link shaping tiers for the new links, as for shapeLinks()
+       subnet, gateway: routes of new hosts, as for installRoutes()
+       paths, tree: recompute these flows, as for installFlows()
+       staticArp: give new hosts and the others, including extra,
+                  static neighbor entries for each other
+       returns: TopoDiff, with the time of each step in ms in times, the
+                error output of failed nodes in errors and the shaping
+                of the new interfaces in shapes"""
+    timer = PhaseTimer()
+    start = time.time()
+    with timer.phase( 'diff' ):
+        diff = diffTopo( net, spec )
+    if not len( diff ):
+        diff.times[ 'total' ] = 1000 * ( time.time() - start )
+        return diff
+    with timer.phase( 'hosts' ):
+        addNodes( net, [ ( name, hostDefaults( net, params ) )
+                         for name, params in diff.addHosts ],
+                  net.host, net.hosts, workers )
+    with timer.phase( 'veths' ):
+        # Forget the deleted interfaces first, so new ports may reuse them
+        for link in diff.delLinks:
+            for intf in link.intf1, link.intf2:
+                intf.node.delIntf( intf )
+            net.links.remove( link )
+        added = [ net.addLink( spec.links[ index ][ 0 ],
+                               spec.links[ index ][ 1 ], cls=QueuedLink,
+                               **spec.links[ index ][ 2 ] )
+                  for index in diff.addLinks ]
+        diff.errors = runBatches( batchCmds(
+            [ ( link.intf1, [ 'link del dev %s' % link.intf1 ] )
+              for link in diff.delLinks ] +
+            [ ( link.intf1, [ link.addLine() ] ) for link in added ],
+            ipBatchCmd ), 'Changing veths' )
+    with timer.phase( 'config' ):
+        procs = [ subprocess.Popen( argv, stdout=subprocess.DEVNULL,
+                                    stderr=subprocess.PIPE )
+                  for argv in ovsCmds( net, added, diff.delLinks ) ]
+        ipLines = [ ( intf, [ 'link set dev %s up' % intf ] )
+                    for link in added for intf in ( link.intf1, link.intf2 ) ]
+        new = [ net.get( name ) for name, _params in diff.addHosts ]
+        for host in new:
+            intf = host.defaultIntf()
+            if intf is None:
+                continue
+            addr = hostAddr( net, host )
+            intf.ip, prefixLen = addr.split( '/' )
+            intf.prefixLen = int( prefixLen )
+            ipLines.append( ( intf, [ 'link set lo up',
+                                      'addr add %s dev %s' % ( addr, intf ) ] +
+                routeBatch( host, dottedQuad( subnet ),
+                            dottedQuad( gateway ) ) ) )
+        shapes = linkShapes( spec, tiers )
+        diff.shapes = dict( ( intf.name, shapes[ index ] )
+                            for link, index in zip( added, diff.addLinks )
+                            for intf in ( link.intf1, link.intf2 ) )
+        # Switch ports are shaped once OVS is done with them
+        tcLines = [ ( intf, shapeBatch( intf, diff.shapes[ intf.name ] ) )
+                    for link in added for intf in ( link.intf1, link.intf2 )
+                    if intf.node not in net.switches ]
+        diff.errors.update( runBatches(
+            batchCmds( ipLines, ipBatchCmd ) +
+            batchCmds( tcLines, tcBatchCmd ), 'Configuring' ) )
+        for proc in procs:
+            err = proc.communicate()[ 1 ]
+            if proc.returncode:
+                diff.errors[ 'ovs-vsctl' ] = err.decode().strip()
+                error( '*** Changing switch ports failed: %s\n' %
+                       diff.errors[ 'ovs-vsctl' ] )
+    with timer.phase( 'shape' ):
+        diff.errors.update( reshapePorts( net, spec, tiers ) )
+    with timer.phase( 'kill' ):
+        killAll( namespacePids( [ host.shell.pid
+                                  for host in diff.delHosts ] ) )
+        for host in diff.delHosts:
+            host.terminate()
+            net.hosts.remove( host )
+            del net.nameToNode[ host.name ]
+    if staticArp and new:
+        with timer.phase( 'arp' ):
+            diff.errors.update( fillNeighbors(
+                list( net.hosts ) + list( extra ), new=new ) )
+    if paths or tree:
+        installFlows( net, extra, timer=timer, paths=paths, tree=tree )
+    for name, seconds in timer.totals().items():
+        diff.times[ name ] = 1000 * seconds
+    diff.times[ 'total' ] = 1000 * ( time.time() - start )
+    return diff
+
+def report( diff ):
+    "Log what reconfigure() changed and how long each step took"
+    times = diff.times
+    output( '*** Reconfigured %s in %.1f ms%s\n' % (
+        diff, times[ 'total' ],
+        ' (%s)' % ', '.join( '%s %.1f' % ( name, ms )
+                             for name, ms in times.items()
+                             if name != 'total' )
+        if len( times ) > 1 else '' ) )
+
+
+class ReconfigCommands( object ):
+    """Mininet CLI mixin with a 'reconfig' command changing the live
+       topology
+       self.extra: other nodes, e.g. the root node
+       self.reconfig: reconfigure() options, e.g. workers and tiers"""
+
+    def do_reconfig( self, line ):
+        """Change the running topology to match a spec, applying only
+           the links and hosts that differ.
+           Usage: reconfig SPEC"""
+        if len( line.split() ) != 1:
+            error( 'usage: reconfig SPEC\n' )
+            return
+        try:
+            diff = reconfigure( self.mn, loadSpec( line.strip() ),
+                                self.extra, **self.reconfig )
+        except ( IOError, SpecError ) as e:
+            error( '*** %s\n' % e )
+            return
+        report( diff )
+        self.reconfigured( diff )
+
+    def reconfigured( self, diff ):
+        "Called with the TopoDiff of every reconfiguration"
+        pass
@@ -0,0 +1,43 @@
+"""
+Batched host route programming.
+
+Every host gets its routing changes as one ip -batch script instead of
+three separate route commands, and all hosts are programmed at once
+with runPipelines(), so the hosts run their scripts concurrently.
+"""
+
+from mininet.log import error
+
+from mntopo.pipeline import CmdPipeline, failures, runPipelines
+from mntopo.util import dottedQuad, ipBatchCmd
+
+
+def routeBatch( host, subnet, gateway ):
+    """Return the ip -batch lines that set up routing on host
+       host: Mininet host
+       subnet: Mininet subnet in dotted-quad CIDR form
+       gateway: default gateway in dotted-quad form"""
+    return [ 'route flush root 0/0',
+             'route add %s dev %s' % ( subnet, host.defaultIntf() ),
+             'route add default via %s' % gateway ]
+
+def installRoutes( hosts, subnet='10.0/8', gateway='10.254' ):
+    """Install the subnet and default routes on all hosts concurrently
+       hosts: list of Mininet hosts
+       subnet: Mininet subnet
+       gateway: default gateway (the root namespace address)
+       returns: dict of host name -> error output, for failed hosts"""
+    subnet = dottedQuad( subnet )
+    gateway = dottedQuad( gateway )
+    pipelines = [ CmdPipeline( host ).add(
+                      ipBatchCmd( routeBatch( host, subnet, gateway ) ) )
+                  for host in hosts ]
+    errors = {}
+    for host, results in zip( hosts, runPipelines( pipelines ) ):
+        output = ''.join( result.output for result in results ).strip()
+        if failures( results ) or output:
+            errors[ host.name ] = output
+    for name in sorted( errors ):
+        error( '*** Route setup failed on %s: %s\n' %
+               ( name, errors[ name ] ) )
+    return errors
@@ -0,0 +1,273 @@
+"""
+Common main program for the Net-to-*.py topology scripts: build the
+topology from its spec, connect it to the internet, run the CLI and
+shut everything down again.
+"""
+
+from argparse import ArgumentParser
+from functools import partial
+
+from mininet.cli import CLI
+from mininet.log import lg, info, error
+from mininet.net import Mininet
+from mininet.node import Node, OVSSwitch, RemoteController
+
+from mntopo.controller import LISTEN_PORT, LocalController
+from mntopo.dryrun import dryRun, plan, report
+from mntopo.faults import FaultCommands, loadTimeline, runFaults
+from mntopo.faults import report as faultReport
+from mntopo.faults import save as faultSave
+from mntopo.flows import installFlows
+from mntopo.hwintf import addHwIntfs, attachProblems, loadAttach, parseAttach
+from mntopo.internet import connectToInternet
+from mntopo.ovs import BatchOVSSwitch
+from mntopo.reconfig import ReconfigCommands
+from mntopo.shaping import checkShapes, intfParams, parseTier, shapeLinks
+from mntopo.spec import SpecError, buildNet, loadSpec
+from mntopo.sweep import SweepCommands
+from mntopo.teardown import TeardownGuard, cleanLeftovers, newRun, tagRun
+from mntopo.telemetry import Telemetry, TelemetryCommands
+from mntopo.traffic import TrafficCommands, loadMatrix, runTraffic, save
+from mntopo.traffic import report as trafficReport
+from mntopo.util import PhaseTimer
+from mntopo.warm import persist
+
+
+SWITCHES = { 'ovs': OVSSwitch, 'ovsbatch': BatchOVSSwitch }
+
+
+class TopoCLI( FaultCommands, ReconfigCommands, TelemetryCommands,
+               TrafficCommands, SweepCommands, CLI ):
+    "Mininet CLI with the commands of every mntopo feature"
+
+    def __init__( self, mininet, extra=(), telemetry=None, reconfig=None,
+                  faults=None, **kwargs ):
+        """extra: other nodes commands may name, e.g. the root node
+           telemetry: running Telemetry collector for 'top' (optional)
+           reconfig: reconfigure() options, e.g. workers and tiers
+           faults: runFaults() options, e.g. shapes"""
+        # CLI.__init__ runs the command loop
+        self.extra = list( extra )
+        self.telemetry = telemetry
+        self.reconfig = reconfig or {}
+        self.faults = faults or {}
+        CLI.__init__( self, mininet, **kwargs )
+
+
+def parseArgs( name, argv=None ):
+    "Parse the command line of a topology script"
+    parser = ArgumentParser( description='Run the %s topology' % name )
+    parser.add_argument( '--topo', default=name,
+                         help='topology spec name or file (default: %s)' %
+                              name )
+    parser.add_argument( '--workers', type=int, default=1,
+                         help='bring the network up with this many parallel '
+                              'workers (default: 1, serial)' )
+    parser.add_argument( '--switch', choices=sorted( SWITCHES ), default='ovs',
+                         help='switch backend; ovsbatch configures all '
+                              'switches in one ovs-vsctl transaction' )
+    parser.add_argument( '--attach', action='append', default=[],
+                         metavar='INTF=SWITCH,...',
+                         help='attach hardware interfaces to switches in '
+                              'place of the intf lines of the spec, e.g. '
+                              'eth1=s8,eth2=s15 (may be repeated)' )
+    parser.add_argument( '--attach-file', metavar='FILE',
+                         help='read an interface map from FILE, one or more '
+                              'INTF=SWITCH entries per line' )
+    parser.add_argument( '--controller', choices=[ 'remote', 'local' ],
+                         default='remote',
+                         help="remote: the spec's controller; local: the "
+                              'bundled OpenFlow 1.3 learning controller '
+                              '(mntopo.controller) on this machine' )
+    parser.add_argument( '--flows', choices=[ 'reactive', 'proactive' ],
+                         default='reactive',
+                         help='reactive: forwarding is up to the controller; '
+                              'proactive: push all-pairs shortest-path flows '
+                              'to every switch once it is up' )
+    parser.add_argument( '--broadcast', choices=[ 'tree', 'flood' ],
+                         default='flood',
+                         help='tree: confine floods to a spanning tree of '
+                              'the topology so they cannot loop; flood: '
+                              'leave loops to the controller (default)' )
+    parser.add_argument( '--static-arp', action='store_true',
+                         help="fill every host's neighbor table with all "
+                              'other hosts and the gateway at start-up, so '
+                              'no ARP requests are broadcast' )
+    parser.add_argument( '--connect-timeout', type=float, default=10,
+                         help='seconds to wait for every switch to connect '
+                              'to its controller before the CLI starts '
+                              '(default: 10)' )
+    parser.add_argument( '--shape', action='append', default=[],
+                         metavar='TIER:KEY=VALUE,...',
+                         help='shape every link of a tier (uplink: switch '
+                              'to switch, access: switch to host), e.g. '
+                              'uplink:bw=1000,delay=1 or access:bw=100,'
+                              'loss=0.1,max_queue_size=100; parameters on '
+                              'link lines of the spec take precedence '
+                              '(may be repeated)' )
+    parser.add_argument( '--traffic', metavar='MATRIX',
+                         help='run the flows of a traffic matrix file with '
+                              'iperf once the network is up, e.g. '
+                              'topos/nttutree-gateway.traffic' )
+    parser.add_argument( '--traffic-out', metavar='FILE',
+                         help='write the per-flow traffic results to FILE '
+                              'as JSON' )
+    parser.add_argument( '--faults', metavar='TIMELINE',
+                         help='fire the link and switch failures of a '
+                              'fault timeline under continuous probes '
+                              'once the network is up, e.g. '
+                              'topos/minicurcle.faults' )
+    parser.add_argument( '--faults-out', metavar='FILE',
+                         help='write the per-event loss and recovery '
+                              'times to FILE as JSON' )
+    parser.add_argument( '--telemetry', metavar='FILE',
+                         help='sample the counters of every switch port '
+                              'and host interface into FILE while the '
+                              "network is up ('top' in the CLI shows the "
+                              'busiest)' )
+    parser.add_argument( '--telemetry-rate', type=float, default=10,
+                         metavar='HZ',
+                         help='telemetry samples per second (default: 10)' )
+    parser.add_argument( '--persist', action='store_true',
+                         help='keep the network up without a CLI for '
+                              'experiments to attach to and reset '
+                              '(mntopo.warm) until SIGTERM or control-C' )
+    parser.add_argument( '--dry-run', action='store_true',
+                         help='record and summarize every operation instead '
+                              'of running it (no root needed)' )
+    args = parser.parse_args( argv )
+    try:
+        args.matrix = loadMatrix( args.traffic ) if args.traffic else None
+        args.timeline = loadTimeline( args.faults ) if args.faults else None
+        args.tiers = dict( parseTier( shape ) for shape in args.shape )
+    except ( IOError, ValueError ) as e:
+        parser.error( str( e ) )
+    # None: use the spec's interfaces
+    args.intfs = None
+    try:
+        if args.attach or args.attach_file:
+            args.intfs = [ entry for attach in args.attach
+                           for entry in parseAttach( attach ) ]
+        if args.attach_file:
+            args.intfs += loadAttach( args.attach_file )
+    except ( IOError, ValueError ) as e:
+        parser.error( str( e ) )
+    return args
+
+def pushesFlows( args ):
+    "Do args ask for flows to be installed once the switches are up?"
+    return args.flows == 'proactive' or args.broadcast == 'tree'
+
+def backend( args, spec ):
+    """Return the switch and controller classes selected by args.switch
+       and args.controller, pointing spec at the local controller if
+       that is selected"""
+    switch, controller = SWITCHES[ args.switch ], RemoteController
+    if args.controller == 'local':
+        params = { 'keepFlows': True } if pushesFlows( args ) else {}
+        spec.controllers = [ ( 'c0', '127.0.0.1', params ) ]
+        switch = partial( switch, protocols='OpenFlow13' )
+        controller = LocalController
+    return switch, controller
+
+def listenPort( controller ):
+    """Return the first switch listenPort for networks using controller,
+       keeping the switches off the local controller's port"""
+    return LISTEN_PORT if controller is LocalController else 6633
+
+def main( name, argv=None ):
+    """Run a topology with the CLI
+       name: shipped topology name, e.g. 'nttutree'
+       argv: command line arguments (default: sys.argv)"""
+    args = parseArgs( name, argv )
+    lg.setLogLevel( 'info' )
+    timer = PhaseTimer()
+    spec = loadSpec( args.topo )
+    intfs = spec.intfs if args.intfs is None else args.intfs
+    # Check every hardware interface before setting anything up
+    with timer.phase( 'intfs' ):
+        # The interfaces need not exist on the machine of a dry run
+        problems = attachProblems( intfs, spec.switchNames(),
+                                   check=not args.dry_run )
+    if problems:
+        error( '\n'.join( problems ) + '\n' )
+        exit( 1 )
+    if args.dry_run:
+        net = dryRun( spec, intfs, args.workers, timer,
+                      paths=args.flows == 'proactive',
+                      tree=args.broadcast == 'tree',
+                      staticArp=args.static_arp, tiers=args.tiers )
+        report( spec.name, plan( net ), timer.elapsed() )
+        return
+    run = newRun()
+    cleanLeftovers( run )
+    switch, controller = backend( args, spec )
+    net = Mininet( listenPort=listenPort( controller ), switch=switch )
+    # Created up front, so that the guard can stop its NAT on any exit
+    rootnode = Node( 'root', inNamespace=False )
+    guard = TeardownGuard( net, rootnode )
+    try:
+        with timer.phase( 'build' ):
+            buildNet( spec, net, workers=args.workers, timer=timer,
+                      controller=controller )
+        addHwIntfs( net, intfs )
+        # Configure and start NATted connectivity
+        connectToInternet( net, timer=timer, workers=args.workers,
+                           root=rootnode,
+                           connectTimeout=args.connect_timeout,
+                           staticArp=args.static_arp )
+        # Once the bridges are configured, which clears port qdiscs
+        with timer.phase( 'shape' ):
+            shapeLinks( net, spec, args.tiers )
+        tagRun( net, run, rootnode )
+        if pushesFlows( args ):
+            installFlows( net, extra=[ rootnode ], timer=timer,
+                          paths=args.flows == 'proactive',
+                          tree=args.broadcast == 'tree' )
+        timer.report( 'Bring-up of %d switches and %d hosts' %
+                      ( len( net.switches ), len( net.hosts ) ) )
+        checkShapes( net, spec, args.tiers )
+        info( "*** Hosts are running and should have internet "
+              "connectivity\n" )
+        telemetry = None
+        if args.telemetry:
+            telemetry = Telemetry( net, args.telemetry,
+                                   rate=args.telemetry_rate,
+                                   extra=[ rootnode ] ).start()
+            guard.before.append( telemetry.stop )
+        if args.matrix is not None:
+            try:
+                result = runTraffic( net, args.matrix, extra=[ rootnode ] )
+                trafficReport( result )
+                if args.traffic_out:
+                    save( result, args.traffic_out )
+            except SpecError as e:
+                error( '*** %s\n' % e )
+        # Loss events add to the links' shaping
+        shapes = dict( ( intf.name, shape ) for intf, shape
+                       in intfParams( net, spec, args.tiers ) )
+        if args.timeline is not None:
+            try:
+                result = runFaults( net, args.timeline, extra=[ rootnode ],
+                                    shapes=shapes )
+                faultReport( result )
+                if args.faults_out:
+                    faultSave( result, args.faults_out )
+            except SpecError as e:
+                error( '*** %s\n' % e )
+        if args.persist:
+            persist( net, spec, rootnode, run, args.tiers )
+            return
+        info( "*** Type 'sweep' for a concurrent all-pairs ping, "
+              "'traffic MATRIX' to run a traffic matrix, 'reconfig SPEC' "
+              "to change the topology, 'faults TIMELINE' to inject "
+              "failures\n" )
+        info( "*** Type 'exit' or control-D to shut down network\n" )
+        TopoCLI( net, extra=[ rootnode ], telemetry=telemetry,
+                 reconfig=dict( workers=args.workers, tiers=args.tiers,
+                                paths=args.flows == 'proactive',
+                                tree=args.broadcast == 'tree',
+                                staticArp=args.static_arp ),
+                 faults=dict( shapes=shapes ) )
+    finally:
+        guard()
@@ -0,0 +1,228 @@
+"""
+Link shaping: bandwidth, delay, jitter, loss and queue size per link.
+
+Every link is in a tier, 'uplink' (switch to switch) or 'access'
+(switch to host), and gets its tier's parameters, overridden by any
+given on its line of the spec:
+
+    s1 -> s2..s7 bw=1000 delay=1ms
+    s48 -> h114..h120 bw=100 loss=0.1
+
+The parameters are TCLink's: bw in Mbit/s, delay and jitter in ms (or
+with a unit, e.g. 500us), loss in percent and max_queue_size in packets.
+As with TCLink, both ends of a link are shaped, so each direction is.
+Instead of one tc process per interface, every namespace gets a single
+tc -batch script -- one for all switch ports, which share the root
+namespace, and one per host -- and all of them run at once.
+
+OVS clears the root qdisc of a port when it configures the bridge (see
+OVSSwitch.TCReapply), so links are shaped once the switches are up, and
+checkShapes() then confirms that the switch ports kept their qdiscs.
+"""
+
+import re
+
+from mininet.log import error, info
+
+from mntopo.pipeline import CmdPipeline, failures, runPipelines
+from mntopo.spec import SpecError
+from mntopo.util import tcBatchCmd
+
+
+TIERS = ( 'uplink', 'access' )
+PARAMS = ( 'bw', 'delay', 'jitter', 'loss', 'max_queue_size' )
+TIME = re.compile( r'^\d+(\.\d+)?(us|ms|s)?$' )
+QDISC = re.compile( r'^qdisc \S+ (\S+) dev (\S+) root\b', re.M )
+HANDLE = re.compile( r' root handle (\S+) ' )
+
+
+def checkShape( params ):
+    """Check link shaping parameters
+       returns: params, with delay and jitter as tc times
+       raises: ValueError if a parameter is unknown or out of range"""
+    shape = {}
+    for key, value in params.items():
+        if key not in PARAMS:
+            raise ValueError( 'unknown link parameter %s' % key )
+        text = str( value )
+        if key in ( 'delay', 'jitter' ):
+            if not TIME.match( text ):
+                raise ValueError( 'bad %s %s' % ( key, text ) )
+            shape[ key ] = text if text[ -1 ] == 's' else text + 'ms'
+            continue
+        try:
+            number = ( int if key == 'max_queue_size' else float )( text )
+        except ValueError:
+            raise ValueError( 'bad %s %s' % ( key, text ) )
+        if not ( 0 <= number <= 100 if key == 'loss' else number > 0 ):
+            raise ValueError( '%s %s out of range' % ( key, text ) )
+        shape[ key ] = number
+    return shape
+
+def parseTier( text ):
+    """Parse a TIER:key=value,... option, e.g. 'uplink:bw=1000,delay=1'
+       returns: tier, params"""
+    tier, _sep, rest = text.partition( ':' )
+    if tier not in TIERS or not rest:
+        raise ValueError( 'expected %s:key=value,... not %s' %
+                          ( '|'.join( TIERS ), text ) )
+    params = {}
+    for item in rest.split( ',' ):
+        key, sep, value = item.partition( '=' )
+        if not sep:
+            raise ValueError( 'expected key=value, not %s' % item )
+        params[ key ] = value
+    return tier, checkShape( params )
+
+def linkShapes( spec, tiers=None ):
+    """Return the shaping parameters of every link of spec, in order
+       tiers: dict of tier -> parameters (optional)"""
+    tiers = tiers or {}
+    switches = set( spec.switchNames() )
+    shapes = []
+    for node1, node2, params in spec.links:
+        tier = ( 'uplink' if node1 in switches and node2 in switches
+                 else 'access' )
+        shape = dict( tiers.get( tier, {} ) )
+        try:
+            shape.update( checkShape( dict(
+                ( key, value ) for key, value in params.items()
+                if key in PARAMS ) ) )
+        except ValueError as e:
+            raise SpecError( 'link %s -> %s: %s' % ( node1, node2, e ) )
+        shapes.append( shape )
+    return shapes
+
+def shapeBatch( intf, shape ):
+    """Return the tc -batch lines that shape intf's egress like TCIntf:
+       an htb rate limit with a netem child for delay, jitter, loss and
+       queue size"""
+    netem = []
+    if 'delay' in shape or 'jitter' in shape:
+        netem += [ 'delay', shape.get( 'delay', '0ms' ) ]
+        if 'jitter' in shape:
+            netem.append( shape[ 'jitter' ] )
+    if 'loss' in shape:
+        netem += [ 'loss', '%g%%' % shape[ 'loss' ] ]
+    if 'max_queue_size' in shape:
+        netem += [ 'limit', shape[ 'max_queue_size' ] ]
+    lines = []
+    parent = 'root'
+    if 'bw' in shape:
+        lines += [ 'qdisc add dev %s root handle 5: htb default 1' % intf,
+                   'class add dev %s parent 5: classid 5:1 htb rate '
+                   '%gmbit burst 15k' % ( intf, shape[ 'bw' ] ) ]
+        parent = 'parent 5:1'
+    if netem:
+        lines.append( 'qdisc add dev %s %s handle 10: netem %s' % (
+            intf, parent, ' '.join( str( arg ) for arg in netem ) ) )
+    return lines
+
+def intfParams( net, spec, tiers=None ):
+    """Return the shaping parameters of the interfaces of the links net
+       was built with from spec
+       tiers: dict of tier -> parameters (optional)
+       returns: list of ( Intf, parameters ), for both ends of every link"""
+    shapes = linkShapes( spec, tiers )
+    links = net.links[ :len( shapes ) ]
+    params = []
+    for link, shape, pair in zip( links, shapes, spec.linkPairs() ):
+        if ( link.intf1.node.name, link.intf2.node.name ) != pair:
+            raise SpecError( 'links of %s do not match the network' %
+                             spec.name )
+        params += [ ( link.intf1, shape ), ( link.intf2, shape ) ]
+    return params
+
+def intfShapes( net, spec, tiers=None ):
+    """Return the tc -batch lines shaping the interfaces of the links net
+       was built with from spec
+       tiers: dict of tier -> parameters (optional)
+       returns: list of ( Intf, lines ), for the shaped interfaces"""
+    lines = []
+    for intf, shape in intfParams( net, spec, tiers ):
+        batch = shapeBatch( intf, shape )
+        if batch:
+            lines.append( ( intf, batch ) )
+    return lines
+
+def namespaceBatches( intfLines ):
+    """Group per-interface batch lines by network namespace
+       intfLines: list of ( Intf, lines )
+       returns: list of ( node to run the batch on, lines )"""
+    batches = {}
+    for intf, lines in intfLines:
+        node = intf.node
+        # Nodes outside a namespace all share the root namespace
+        key = node.name if node.inNamespace else None
+        batches.setdefault( key, ( node, [] ) )[ 1 ].extend( lines )
+    return list( batches.values() )
+
+def rootQdiscs( text ):
+    """Parse tc qdisc show output
+       returns: dict of interface name -> handle of its root qdisc"""
+    return dict( ( dev, handle ) for handle, dev in QDISC.findall( text ) )
+
+def lostShapes( text, intfLines ):
+    """Return the entries of intfLines whose interfaces lack the root
+       qdisc their lines create, according to tc qdisc show output, with
+       a qdisc del first where another qdisc took its place
+       intfLines: list of ( Intf, lines ), as from intfShapes()
+       returns: list of ( Intf, lines ) to re-apply"""
+    qdiscs = rootQdiscs( text )
+    lost = []
+    for intf, lines in intfLines:
+        current = qdiscs.get( intf.name )
+        if current == HANDLE.search( lines[ 0 ] ).group( 1 ):
+            continue
+        # 0: is the default qdisc, which adding a root qdisc replaces
+        dels = ( [ 'qdisc del dev %s root' % intf ]
+                 if current not in ( None, '0:' ) else [] )
+        lost.append( ( intf, dels + lines ) )
+    return lost
+
+def checkShapes( net, spec, tiers=None ):
+    """Check that the switch ports of the links net was built with from
+       spec still have the root qdiscs shapeLinks() gave them, with one
+       tc qdisc show in the root namespace
+       tiers: dict of tier -> parameters (optional)
+       returns: names of the switch ports that lost their shaping"""
+    ports = [ ( intf, lines )
+              for intf, lines in intfShapes( net, spec, tiers )
+              if not intf.node.inNamespace ]
+    if not ports:
+        return []
+    node = ports[ 0 ][ 0 ].node
+    result = CmdPipeline( node ).add( 'tc qdisc show' ).run()[ 0 ]
+    missing = sorted( intf.name for intf, _lines
+                      in lostShapes( result.output, ports ) )
+    if missing:
+        error( '*** %d switch ports lost their shaping: %s\n' %
+               ( len( missing ), ' '.join( missing[ :10 ] ) ) )
+    return missing
+
+def shapeLinks( net, spec, tiers=None ):
+    """Shape the links net was built with from spec, one tc -batch per
+       namespace, all namespaces concurrently; call it once the switches
+       are started, as OVS clears the qdiscs of the ports it adds
+       tiers: dict of tier -> parameters (optional)
+       returns: dict of node name -> error output, for failed nodes"""
+    shapes = linkShapes( spec, tiers )
+    if not any( shapes ):
+        return {}
+    batches = namespaceBatches( intfShapes( net, spec, tiers ) )
+    pipelines = [ CmdPipeline( node ).add( tcBatchCmd( lines ) )
+                  for node, lines in batches ]
+    errors = {}
+    for pipeline, results in zip( pipelines, runPipelines( pipelines ) ):
+        # tc warns about large htb quanta even when it succeeds
+        failed = failures( results )
+        if failed:
+            errors[ pipeline.node.name ] = ''.join(
+                result.output for result in failed ).strip()
+    for name in sorted( errors ):
+        error( '*** Shaping links failed on %s: %s\n' %
+               ( name, errors[ name ] ) )
+    info( '*** Shaped %d of %d links with %d tc batches\n' % (
+        sum( 1 for shape in shapes if shape ), len( shapes ),
+        len( pipelines ) ) )
+    return errors
@@ -0,0 +1,300 @@
+"""
+Declarative topology specs.
+
+A topology is described by a small line-oriented text file instead of
+hundreds of hand-written addSwitch/addHost/addLink calls:
+
+    # comment
+    controller C0 192.168.176.132
+    switch s1..s66
+    host h1..h240
+    host h2..h4 h6 ip=10.0.0.{n}
+    s1 -> s2..s7
+    s48 -> h114..h120
+    intf eth1 -> s8
+
+Names may be given as ranges (s1..s66) separated by spaces or commas.
+A link line connects every node on the left to every node on the right,
+in order. Trailing key=value pairs become node or link parameters;
+{n} in a value is replaced by the numeric suffix of the node name.
+Declaration order is preserved exactly, since Mininet derives IP
+addresses and port numbers from it.
+
+Usage: python -m mntopo.spec topos/nttutree.topo
+"""
+
+import os
+import re
+import sys
+
+from mininet.net import Mininet
+from mininet.node import RemoteController
+
+from mntopo.util import PhaseTimer
+
+
+TOPODIR = os.path.join( os.path.dirname( os.path.dirname(
+    os.path.abspath( __file__ ) ) ), 'topos' )
+
+
+class SpecError( ValueError ):
+    "Malformed topology spec"
+
+
+class TopoSpec( object ):
+    "Ordered description of switches, hosts, links and controllers"
+
+    def __init__( self, name=None ):
+        self.name = name
+        self.controllers = []
+        self.switches = []
+        self.hosts = []
+        self.links = []
+        self.intfs = []
+        self.nodeParams = {}
+
+    def addController( self, name, ip, **params ):
+        "Add a remote controller"
+        self.controllers.append( ( name, ip, params ) )
+
+    def addSwitch( self, name, **params ):
+        "Add a switch"
+        self._addNode( self.switches, name, params )
+
+    def addHost( self, name, **params ):
+        "Add a host"
+        self._addNode( self.hosts, name, params )
+
+    def _addNode( self, nodes, name, params ):
+        "Add a node to nodes, rejecting duplicate names"
+        if name in self.nodeParams:
+            raise SpecError( 'duplicate node %s' % name )
+        self.nodeParams[ name ] = params
+        nodes.append( ( name, params ) )
+
+    def addLink( self, node1, node2, **params ):
+        "Add a link between two declared nodes"
+        for node in node1, node2:
+            if node not in self.nodeParams:
+                raise SpecError( 'link to undeclared node %s' % node )
+        self.links.append( ( node1, node2, params ) )
+
+    def addIntf( self, intf, switch ):
+        "Attach hardware interface intf to switch"
+        if switch not in self.nodeParams:
+            raise SpecError( 'interface on undeclared switch %s' % switch )
+        self.intfs.append( ( intf, switch ) )
+
+    def switchNames( self ):
+        "Return switch names in declaration order"
+        return [ name for name, _params in self.switches ]
+
+    def hostNames( self ):
+        "Return host names in declaration order"
+        return [ name for name, _params in self.hosts ]
+
+    def linkPairs( self ):
+        "Return ( node1, node2 ) pairs in declaration order"
+        return [ ( node1, node2 ) for node1, node2, _params in self.links ]
+
+    def __repr__( self ):
+        return '<TopoSpec %s: %d switches, %d hosts, %d links>' % (
+            self.name, len( self.switches ), len( self.hosts ),
+            len( self.links ) )
+
+
+def nodeNumber( name ):
+    "Return the numeric suffix of a node name, e.g. 'h114' -> 114"
+    match = re.search( r'(\d+)$', name )
+    return int( match.group( 1 ) ) if match else None
+
+def expandNames( token ):
+    """Expand a name or name range, e.g. 'h3..h5' -> [ 'h3', 'h4', 'h5' ]
+       token: node name or range"""
+    if '..' not in token:
+        return [ token ]
+    first, last = token.split( '..', 1 )
+    match1 = re.match( r'^(\D*)(\d+)$', first )
+    match2 = re.match( r'^(\D*)(\d+)$', last )
+    if not match1 or not match2 or match1.group( 1 ) != match2.group( 1 ):
+        raise SpecError( 'bad range %s' % token )
+    prefix = match1.group( 1 )
+    start, end = int( match1.group( 2 ) ), int( match2.group( 2 ) )
+    if end < start:
+        raise SpecError( 'empty range %s' % token )
+    return [ '%s%d' % ( prefix, n ) for n in range( start, end + 1 ) ]
+
+def parseValue( value ):
+    "Convert a parameter value to int or float where possible"
+    for convert in int, float:
+        try:
+            return convert( value )
+        except ValueError:
+            pass
+    return value
+
+def splitParams( tokens ):
+    """Split tokens into names and key=value parameters
+       returns: list of names, dict of parameters"""
+    names, params = [], {}
+    for token in tokens:
+        if '=' in token:
+            key, value = token.split( '=', 1 )
+            params[ key ] = value
+        else:
+            names.extend( expandNames( token ) )
+    return names, params
+
+def nodeParams( name, params ):
+    "Return params for node name, with {n} replaced by its number"
+    number = nodeNumber( name )
+    return dict( ( key, parseValue( value.replace( '{n}', str( number ) ) ) )
+                 for key, value in params.items() )
+
+def parseSpec( lines, name=None ):
+    """Parse spec text into a TopoSpec
+       lines: iterable of spec lines
+       name: topology name (optional)"""
+    spec = TopoSpec( name )
+    for lineno, line in enumerate( lines, 1 ):
+        line = line.split( '#', 1 )[ 0 ].strip()
+        if not line:
+            continue
+        tokens = line.replace( ',', ' ' ).split()
+        try:
+            parseLine( spec, tokens )
+        except SpecError as e:
+            raise SpecError( '%s:%d: %s' % ( name, lineno, e ) )
+    return spec
+
+def parseLine( spec, tokens ):
+    "Add the declaration in tokens to spec"
+    keyword = tokens[ 0 ]
+    if keyword == 'controller':
+        names, params = splitParams( tokens[ 1: ] )
+        if len( names ) != 2:
+            raise SpecError( 'expected: controller NAME IP' )
+        spec.addController( names[ 0 ], names[ 1 ],
+                            **nodeParams( '', params ) )
+    elif keyword in ( 'switch', 'host' ):
+        names, params = splitParams( tokens[ 1: ] )
+        add = spec.addSwitch if keyword == 'switch' else spec.addHost
+        for node in names:
+            add( node, **nodeParams( node, params ) )
+    elif keyword == 'intf':
+        if len( tokens ) != 4 or tokens[ 2 ] != '->':
+            raise SpecError( 'expected: intf INTF -> SWITCH' )
+        spec.addIntf( tokens[ 1 ], tokens[ 3 ] )
+    elif '->' in tokens:
+        arrow = tokens.index( '->' )
+        left, _params = splitParams( tokens[ :arrow ] )
+        right, params = splitParams( tokens[ arrow + 1: ] )
+        if not left or not right or _params:
+            raise SpecError( 'expected: NODES -> NODES [key=value ...]' )
+        for node1 in left:
+            for node2 in right:
+                spec.addLink( node1, node2, **nodeParams( node2, params ) )
+    else:
+        raise SpecError( 'unknown declaration %s' % keyword )
+
+def compressNames( names ):
+    "Return names as a list of tokens, with consecutive runs as ranges"
+    tokens = []
+    run = []
+    for name in names + [ None ]:
+        if run and name is not None:
+            prefix, number = re.sub( r'\d+$', '', name ), nodeNumber( name )
+            last = run[ -1 ]
+            if ( number is not None and prefix == re.sub( r'\d+$', '', last )
+                 and number == nodeNumber( last ) + 1 ):
+                run.append( name )
+                continue
+        if len( run ) > 2:
+            tokens.append( '%s..%s' % ( run[ 0 ], run[ -1 ] ) )
+        else:
+            tokens.extend( run )
+        run = [ name ]
+    return tokens
+
+def formatParams( params ):
+    "Format a parameter dict as sorted key=value tokens"
+    return [ '%s=%s' % ( key, params[ key ] ) for key in sorted( params ) ]
+
+def groupRuns( items, key ):
+    "Group consecutive items with equal key( item )"
+    groups = []
+    for item in items:
+        if groups and key( groups[ -1 ][ -1 ] ) == key( item ):
+            groups[ -1 ].append( item )
+        else:
+            groups.append( [ item ] )
+    return groups
+
+def formatSpec( spec ):
+    "Return spec as compact spec text lines, inverse of parseSpec"
+    lines = []
+    for name, ip, params in spec.controllers:
+        lines.append( ' '.join( [ 'controller', name, ip ] +
+                                formatParams( params ) ) )
+    for keyword, nodes in ( 'switch', spec.switches ), ( 'host', spec.hosts ):
+        for group in groupRuns( nodes, lambda node: node[ 1 ] ):
+            lines.append( ' '.join( [ keyword ] +
+                                    compressNames( [ n for n, _ in group ] ) +
+                                    formatParams( group[ 0 ][ 1 ] ) ) )
+    for group in groupRuns( spec.links,
+                            lambda link: ( link[ 0 ], link[ 2 ] ) ):
+        node1, _node2, params = group[ 0 ]
+        lines.append( ' '.join( [ node1, '->' ] +
+                                compressNames( [ l[ 1 ] for l in group ] ) +
+                                formatParams( params ) ) )
+    for intf, switch in spec.intfs:
+        lines.append( 'intf %s -> %s' % ( intf, switch ) )
+    return lines
+
+def topoPath( name ):
+    "Return the path of a shipped topology, given its name or a path"
+    if os.path.exists( name ):
+        return name
+    return os.path.join( TOPODIR, name + '.topo' )
+
+def loadSpec( name ):
+    """Load a topology spec
+       name: shipped topology name (e.g. 'nttutree') or spec file path"""
+    path = topoPath( name )
+    with open( path ) as f:
+        name = os.path.splitext( os.path.basename( path ) )[ 0 ]
+        return parseSpec( f, name )
+
+def buildNet( spec, net=None, workers=1, timer=None,
+              controller=RemoteController ):
+    """Build the Mininet network described by spec
+       spec: TopoSpec
+       net: Mininet object to add to (default: Mininet( listenPort=6633 ))
+       workers: number of parallel workers (1: serial build)
+       timer: PhaseTimer to record build phases in (optional)
+       controller: class of the spec's controllers
+       returns: net"""
+    if net is None:
+        net = Mininet( listenPort=6633 )
+    if timer is None:
+        timer = PhaseTimer()
+    if workers > 1:
+        from mntopo.bringup import parallelBuild
+        return parallelBuild( spec, net, workers, timer, controller )
+    for name, ip, params in spec.controllers:
+        net.addController( name, controller=controller, ip=ip, **params )
+    with timer.phase( 'switches' ):
+        for name, params in spec.switches:
+            net.addSwitch( name, **params )
+    with timer.phase( 'hosts' ):
+        for name, params in spec.hosts:
+            net.addHost( name, **params )
+    with timer.phase( 'links' ):
+        for node1, node2, params in spec.links:
+            net.addLink( net.get( node1 ), net.get( node2 ), **params )
+    return net
+
+
+if __name__ == '__main__':
+    for arg in sys.argv[ 1: ]:
+        print( loadSpec( arg ) )
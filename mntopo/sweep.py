@@ -0,0 +1,158 @@
+"""
+Concurrent all-pairs reachability and RTT sweep.
+
+Mininet's pingall runs one ping after the other: about 57k of them on
+the NTTU tree. sweep() instead starts one prober (mntopo/probe.py) on
+every host at once through runPipelines(); each sends ICMP echoes to
+all of its targets from a raw socket with a bounded window, so the
+whole sweep takes about as long as the slowest host's probes. For very
+large topologies, sample limits each host to that many random targets.
+
+    result = sweep( net )
+    report( result )
+    result.loss[ i ][ j ], result.rtt[ i ][ j ]    # hosts i -> j
+
+SweepCommands adds the sweep as a 'sweep' command to a Mininet CLI.
+"""
+
+import os
+import random
+import sys
+import time
+
+from mininet.log import error, output
+
+from mntopo.arp import fitNeighborTable
+from mntopo.pipeline import CmdPipeline, runPipelines
+from mntopo.util import distribution
+
+
+PROBE = os.path.join( os.path.dirname( os.path.abspath( __file__ ) ),
+                      'probe.py' )
+
+
+class SweepResult( object ):
+    """Loss (0..1) and mean RTT (ms) matrices between hosts, indexed by
+       position in names; None for pairs not probed or, in rtt, lost"""
+
+    def __init__( self, names ):
+        self.names = names
+        self.loss = [ [ None ] * len( names ) for _ in names ]
+        self.rtt = [ [ None ] * len( names ) for _ in names ]
+        self.sent = self.received = 0
+
+    def pairs( self ):
+        "Return the number of probed pairs"
+        return sum( 1 for row in self.loss for loss in row
+                    if loss is not None )
+
+    def unreachable( self ):
+        "Return the ( source, destination ) names of fully lost pairs"
+        return [ ( self.names[ i ], self.names[ j ] )
+                 for i, row in enumerate( self.loss )
+                 for j, loss in enumerate( row ) if loss == 1 ]
+
+    def lossRate( self ):
+        "Return the fraction of probes lost"
+        return 1 - float( self.received ) / self.sent if self.sent else 0.0
+
+
+def targetLists( hosts, sample=None, seed=1 ):
+    """Return the hosts each host probes: all others, or sample random
+       ones per host"""
+    rng = random.Random( seed )
+    targets = []
+    for host in hosts:
+        others = [ other for other in hosts if other is not host ]
+        if sample is not None and sample < len( others ):
+            others = rng.sample( others, sample )
+        targets.append( others )
+    return targets
+
+def sweep( net, hosts=None, count=1, timeout=1.0, inflight=4096,
+           sample=None, seed=1, fitTable=True ):
+    """Probe between hosts, all hosts at once
+       hosts: hosts to sweep (default: net.hosts)
+       count: echo requests per pair
+       timeout: seconds to wait for each reply
+       inflight: probes in flight over all hosts together
+       sample: number of random targets per host (default: all)
+       fitTable: raise the kernel's ARP table limit to fit the sweep
+       returns: SweepResult"""
+    hosts = list( net.hosts if hosts is None else hosts )
+    targets = targetLists( hosts, sample, seed )
+    if fitTable:
+        # Room for every host's entries for its targets, and back
+        fitNeighborTable( 2 * sum( len( others ) for others in targets ) +
+                          len( hosts ) )
+    window = max( 1, inflight // max( 1, len( hosts ) ) )
+    pipelines = [ CmdPipeline( host ).add(
+                      sys.executable, PROBE, '--count', count,
+                      '--timeout', timeout, '--window', window,
+                      *[ other.IP() for other in others ] )
+                  for host, others in zip( hosts, targets ) if others ]
+    result = SweepResult( [ host.name for host in hosts ] )
+    index = dict( ( host.name, i ) for i, host in enumerate( hosts ) )
+    for pipeline, results in zip( pipelines, runPipelines( pipelines ) ):
+        src = index[ pipeline.node.name ]
+        replies = parseProbe( ''.join( r.output for r in results ) )
+        others = targets[ src ]
+        for other in others:
+            dst = index[ other.name ]
+            sent, received, rtt = replies.get( other.IP(),
+                                               ( count, 0, None ) )
+            result.loss[ src ][ dst ] = 1 - float( received ) / sent
+            result.rtt[ src ][ dst ] = rtt
+            result.sent += sent
+            result.received += received
+        if results and results[ -1 ].status:
+            error( '*** Probing from %s failed: %s\n' %
+                   ( pipeline.node.name, results[ -1 ].output.strip() ) )
+    return result
+
+def parseProbe( text ):
+    "Parse probe.py output into a dict of IP -> ( sent, received, RTT )"
+    replies = {}
+    for line in text.splitlines():
+        fields = line.split()
+        if len( fields ) != 4 or not fields[ 1 ].isdigit():
+            continue
+        ip, sent, received, rtt = fields
+        replies[ ip ] = ( int( sent ), int( received ),
+                          None if rtt == '-' else float( rtt ) )
+    return replies
+
+def report( result, seconds=None ):
+    "Log a summary of a sweep like pingall's"
+    rtts = distribution( [ rtt for row in result.rtt for rtt in row
+                           if rtt is not None ] )
+    output( '*** Sweep: %d pairs, %d/%d probes lost (%.1f%%)%s\n' % (
+        result.pairs(), result.sent - result.received, result.sent,
+        100 * result.lossRate(),
+        ' in %.2fs' % seconds if seconds is not None else '' ) )
+    if rtts:
+        output( '*** RTT ms: min %.3f  p50 %.3f  p99 %.3f  max %.3f\n' % (
+            rtts[ 'min' ], rtts[ 'p50' ], rtts[ 'p99' ], rtts[ 'max' ] ) )
+    unreachable = result.unreachable()
+    for src, dst in unreachable[ :10 ]:
+        output( '*** %s -> %s unreachable\n' % ( src, dst ) )
+    if len( unreachable ) > 10:
+        output( '*** ... and %d more\n' % ( len( unreachable ) - 10 ) )
+
+
+class SweepCommands( object ):
+    "Mininet CLI mixin with a concurrent all-pairs 'sweep' command"
+
+    def do_sweep( self, line ):
+        """Probe between all hosts at once and report loss and RTT.
+           Usage: sweep [count] [sample]"""
+        args = line.split()
+        try:
+            count = int( args[ 0 ] ) if args else 1
+            sample = int( args[ 1 ] ) if len( args ) > 1 else None
+        except ValueError:
+            error( 'usage: sweep [count] [sample]\n' )
+            return
+        start = time.time()
+        result = sweep( self.mn, count=count, sample=sample )
+        report( result, time.time() - start )
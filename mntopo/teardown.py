@@ -0,0 +1,330 @@
+"""
+Fast, crash-safe teardown.
+
+Mininet.stop() deletes the links one at a time, with two shell round
+trips each, and then stops the switches and hosts one by one.
+teardown() instead does everything at once:
+
+- it deletes all Open vSwitch bridges in one ovs-vsctl transaction;
+- it deletes the links left in the root namespace (switch to switch,
+  and root-eth0) with one ip -batch;
+- it kills every process in the hosts' namespaces. A namespace goes
+  away with its last process, and the kernel then deletes its veths,
+  and their peers in the root namespace, in batches.
+
+Every run has an ID, and everything it creates that could outlive it
+is tagged with it: every node shell, and so everything started in one,
+has MNTOPO_RUN=ID in its environment, and after bring-up tagRun() sets
+external_ids:mntopo-run=ID on the bridges and the alias mntopo-run=ID
+on the links between root namespace nodes. TeardownGuard tears the
+network down on exceptions, at exit and on SIGTERM or SIGHUP. If a run
+dies anyway (SIGKILL, a crash of Python itself), cleanLeftovers() finds
+what it left behind by the tags of runs that are no longer alive and
+removes it, without a full mn -c.
+"""
+
+import atexit
+import os
+import re
+import signal
+import subprocess
+import time
+
+from mininet.log import error, info
+from mininet.node import OVSSwitch
+
+from mntopo.nat import stopNAT
+from mntopo.ovs import BatchOVSSwitch
+from mntopo.pipeline import CmdPipeline, failures
+from mntopo.util import PhaseTimer, ipBatchCmd
+
+
+RUN_ENV = 'MNTOPO_RUN'
+TAG = 'mntopo-run'
+SIGNALS = ( signal.SIGTERM, signal.SIGHUP )
+TAGGED_INTF = re.compile( r'^\d+: ([^:@\s]+)[@:].*\balias %s=(\S+)' % TAG,
+                          re.M )
+TAGGED_BRIDGE = re.compile( r'^"?([^,"]+)"?,.*\b%s=([\w.]+)' % TAG, re.M )
+
+
+def procStart( pid ):
+    """Return the start time of process pid in clock ticks, as a string,
+       or None if there is no such process"""
+    try:
+        with open( '/proc/%s/stat' % pid ) as f:
+            stat = f.read()
+    except ( IOError, OSError ):
+        return None
+    # The command name in parentheses may contain spaces
+    return stat.rsplit( ')', 1 )[ 1 ].split()[ 19 ]
+
+def newRun():
+    """Start a run, tagging every process started from now on (node
+       shells inherit our environment) with its ID
+       returns: run ID, our pid and start time"""
+    pid = os.getpid()
+    run = '%d.%s' % ( pid, procStart( pid ) )
+    os.environ[ RUN_ENV ] = run
+    return run
+
+def runAlive( run ):
+    "Is the process that started run still running?"
+    pid, _sep, start = run.partition( '.' )
+    return pid.isdigit() and procStart( pid ) == start
+
+def rootLinks( net ):
+    "Return the links of net with both ends in the root namespace"
+    return [ link for link in net.links
+             if link.intf1 and link.intf2 and
+             not ( link.intf1.node.inNamespace or
+                   link.intf2.node.inNamespace ) ]
+
+def ovsBridges( net ):
+    "Return the names of net's Open vSwitch bridges"
+    return [ switch.name for switch in net.switches
+             if isinstance( switch, OVSSwitch ) ]
+
+def tagRun( net, run, root ):
+    """Tag net's bridges and the links between its root namespace nodes
+       with run, in one ovs-vsctl transaction and one ip -batch
+       root: node in the root namespace to run ip from"""
+    bridges = ovsBridges( net )
+    for argv in BatchOVSSwitch.transactions(
+            [ [ [ 'set', 'Bridge', name,
+                  'external_ids:%s=%s' % ( TAG, run ) ] ]
+              for name in bridges ] ):
+        proc = subprocess.Popen( argv, stdout=subprocess.DEVNULL,
+                                 stderr=subprocess.PIPE )
+        err = proc.communicate()[ 1 ]
+        if proc.returncode:
+            error( '*** Tagging bridges failed: %s\n' % err.decode().strip() )
+    lines = [ 'link set dev %s alias %s=%s' % ( link.intf1, TAG, run )
+              for link in rootLinks( net ) ]
+    if lines:
+        pipeline = CmdPipeline( root ).add( ipBatchCmd( lines ) )
+        for result in failures( pipeline.run() ):
+            error( '*** Tagging links failed: %s\n' % result.output.strip() )
+
+def deleteCmds( bridges, intfs ):
+    """Start deleting bridges and root namespace interfaces
+       returns: list of ( what, Popen ), to be passed to waitCmds()"""
+    procs = []
+    for argv in BatchOVSSwitch.transactions(
+            [ [ [ '--if-exists', 'del-br', name ] ] for name in bridges ] ):
+        procs.append( ( 'bridges', subprocess.Popen(
+            argv, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE ) ) )
+    if intfs:
+        proc = subprocess.Popen( [ 'ip', '-force', '-batch', '-' ],
+                                 stdin=subprocess.PIPE,
+                                 stdout=subprocess.DEVNULL,
+                                 stderr=subprocess.PIPE )
+        proc.stdin.write( ''.join( 'link del dev %s\n' % intf
+                                   for intf in intfs ).encode() )
+        proc.stdin.close()
+        procs.append( ( 'links', proc ) )
+    return procs
+
+def waitCmds( procs ):
+    "Wait for the commands started by deleteCmds(), logging failures"
+    for what, proc in procs:
+        err = proc.stderr.read().decode().strip()
+        if proc.wait():
+            error( '*** Deleting %s failed: %s\n' % ( what, err ) )
+
+def namespacePids( pids ):
+    """Return all processes in the network namespaces of pids
+       (which must be outside the root namespace)"""
+    namespaces = set()
+    for pid in pids:
+        try:
+            namespaces.add( os.readlink( '/proc/%d/ns/net' % pid ) )
+        except OSError:
+            pass
+    found = []
+    for entry in os.listdir( '/proc' ):
+        if not entry.isdigit():
+            continue
+        try:
+            if os.readlink( '/proc/%s/ns/net' % entry ) in namespaces:
+                found.append( int( entry ) )
+        except OSError:
+            pass
+    return found
+
+def killAll( pids ):
+    "Send SIGKILL to every process in pids that still exists"
+    for pid in pids:
+        try:
+            os.kill( pid, signal.SIGKILL )
+        except OSError:
+            pass
+
+def waitGone( intfs, timeout ):
+    """Wait until none of intfs exists any more
+       returns: the interfaces still there after timeout seconds"""
+    deadline = time.time() + timeout
+    while True:
+        intfs = [ intf for intf in intfs
+                  if os.path.exists( '/sys/class/net/%s' % intf ) ]
+        if not intfs or time.time() > deadline:
+            return intfs
+        time.sleep( .05 )
+
+def teardown( net, root=None, timer=None, timeout=10 ):
+    """Tear net down, and stop the NAT of root if it was started, all
+       at once
+       root: node in the root namespace that NAT was started from
+       timer: PhaseTimer to record the teardown phases in (optional)
+       timeout: seconds to wait for the hosts' namespaces to go away
+       Calling it again for the same net does nothing."""
+    if getattr( net, 'tornDown', False ):
+        return
+    net.tornDown = True
+    timer = timer or PhaseTimer()
+    start = time.time()
+    if root is not None and root.shell:
+        with timer.phase( 'nat' ):
+            stopNAT( root )
+    for controller in net.controllers:
+        controller.stop()
+    with timer.phase( 'delete' ):
+        links = rootLinks( net )
+        procs = deleteCmds( ovsBridges( net ),
+                            [ link.intf1.name for link in links ] )
+        # Kill the hosts while the bridges and links are being deleted
+        shells = [ host.shell.pid for host in net.hosts
+                   if host.shell and host.inNamespace ]
+        killAll( namespacePids( shells ) )
+        for switch in net.switches:
+            if not isinstance( switch, OVSSwitch ):
+                switch.stop( deleteIntfs=False )
+        waitCmds( procs )
+    with timer.phase( 'nodes' ):
+        nodes = net.hosts + net.switches + ( [ root ] if root else [] )
+        for node in nodes:
+            node.terminate()
+        # The kernel deletes the namespaces' veths after their last
+        # process is gone; wait for their root namespace ends too
+        ends = [ intf.name for link in net.links
+                 if link.intf1 and link.intf2 and link not in links
+                 for intf in ( link.intf1, link.intf2 )
+                 if not intf.node.inNamespace ]
+        left = waitGone( ends, timeout )
+    if left:
+        error( '*** %d interfaces still exist after %ds: %s\n' %
+               ( len( left ), timeout, ' '.join( left[ :10 ] ) ) )
+    info( '*** Tore down %d switches, %d hosts and %d links in %.2fs\n' %
+          ( len( net.switches ), len( net.hosts ), len( net.links ),
+            time.time() - start ) )
+
+
+class TeardownGuard( object ):
+    """Tears a network down exactly once: when called, at exit, or on
+       SIGTERM or SIGHUP, which exit through any finally blocks first
+
+       guard = TeardownGuard( net, root )
+       try:
+           ...
+       finally:
+           guard()"""
+
+    def __init__( self, net, root=None, before=() ):
+        """net: network to tear down
+           root: node in the root namespace NAT was started from
+           before: functions to call first, e.g. to stop a collector"""
+        self.net = net
+        self.root = root
+        self.before = list( before )
+        self.started = False
+        self.handlers = dict( ( sig, signal.signal( sig, self.signalled ) )
+                              for sig in SIGNALS )
+        atexit.register( self )
+
+    def signalled( self, signum, _frame ):
+        "Exit on a signal, unless the teardown is already running"
+        if not self.started:
+            raise SystemExit( 128 + signum )
+
+    def __call__( self, timer=None ):
+        "Tear the network down, if that has not been done yet"
+        if self.started:
+            return
+        self.started = True
+        for fn in self.before:
+            try:
+                fn()
+            except Exception as e:  # pylint: disable=broad-except
+                error( '*** %s failed during teardown: %s\n' % ( fn, e ) )
+        try:
+            teardown( self.net, self.root, timer )
+        finally:
+            for sig, handler in self.handlers.items():
+                signal.signal( sig, handler )
+            atexit.unregister( self )
+
+
+def findLeftovers( run=None ):
+    """Find what runs that are no longer alive left behind, by its tags
+       run: our own run ID, which is never a leftover
+       returns: dict of 'processes' -> pids, 'bridges' and 'intfs' ->
+                names"""
+    run = run or os.environ.get( RUN_ENV )
+    dead = {}
+
+    def isDead( other ):
+        "Is other a dead run's ID?"
+        if other not in dead:
+            dead[ other ] = other != run and not runAlive( other )
+        return dead[ other ]
+
+    marker = ( '%s=' % RUN_ENV ).encode()
+    pids = []
+    for entry in os.listdir( '/proc' ):
+        if not entry.isdigit():
+            continue
+        try:
+            with open( '/proc/%s/environ' % entry, 'rb' ) as f:
+                environ = f.read()
+        except ( IOError, OSError ):
+            continue
+        for var in environ.split( b'\0' ):
+            if var.startswith( marker ):
+                if isDead( var[ len( marker ): ].decode() ):
+                    pids.append( int( entry ) )
+                break
+    bridges = []
+    try:
+        proc = subprocess.Popen(
+            [ 'ovs-vsctl', '--timeout=5', '--format=csv', '--data=bare',
+              '--no-headings', '--columns=name,external_ids', 'list',
+              'Bridge' ], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL )
+        out = proc.communicate()[ 0 ].decode()
+        if not proc.returncode:
+            bridges = [ name for name, other in TAGGED_BRIDGE.findall( out )
+                        if isDead( other ) ]
+    except OSError:
+        # No Open vSwitch here
+        pass
+    out = subprocess.Popen( [ 'ip', '-o', 'link', 'show' ],
+                            stdout=subprocess.PIPE ).communicate()[ 0 ]
+    intfs = [ name for name, other in
+              TAGGED_INTF.findall( out.decode() ) if isDead( other ) ]
+    return { 'processes': pids, 'bridges': bridges, 'intfs': intfs }
+
+def cleanLeftovers( run=None ):
+    """Remove what runs that are no longer alive left behind: kill their
+       processes, which removes their namespaces, and delete their
+       bridges and the links between their root namespace nodes
+       run: our own run ID, which is never a leftover
+       returns: the leftovers, as findLeftovers() does"""
+    leftovers = findLeftovers( run )
+    if not any( leftovers.values() ):
+        return leftovers
+    procs = deleteCmds( leftovers[ 'bridges' ], leftovers[ 'intfs' ] )
+    killAll( leftovers[ 'processes' ] )
+    waitCmds( procs )
+    info( '*** Removed the leftovers of earlier runs: %d processes, '
+          '%d bridges, %d links\n' % ( len( leftovers[ 'processes' ] ),
+                                       len( leftovers[ 'bridges' ] ),
+                                       len( leftovers[ 'intfs' ] ) ) )
+    return leftovers
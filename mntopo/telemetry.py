@@ -0,0 +1,380 @@
+"""
+Link and port counter telemetry.
+
+A Telemetry collector samples RX/TX bytes, packets and drops of every
+switch port and host interface, up to 10 times a second, and streams
+the samples to an append-only file:
+
+    telemetry = Telemetry( net, 'run.tm', rate=10 )
+    telemetry.start()
+    ...
+    telemetry.top()     # busiest interfaces right now
+    telemetry.stop()
+
+TelemetryCommands adds the same view as a 'top' command to a Mininet
+CLI.
+
+Kernel counters come from each namespace's /proc/PID/net/dev (the same
+statistics as /sys/class/net/*/statistics, which only shows our own
+namespace): one read covers every switch port, since switches share
+the root namespace, and one more covers each host. The files are kept
+open and re-read, so a sample costs no process and no open(). With
+ports='ofctl', switch ports are read with one ovs-ofctl dump-ports per
+switch instead, all switches at once, for datapaths whose ports are
+not kernel devices.
+
+Samples go into a ring buffer of bounded size, from which a writer
+thread appends them to the file once a second; if the writer falls a
+whole ring behind, the oldest samples are dropped and counted. The
+file is a JSON header followed by fixed-size records: a float64 time
+and the uint32 increase of every counter since the previous record
+(the header holds their starting values). readTelemetry() reads it
+back; python -m mntopo.telemetry FILE lists the busiest interfaces.
+"""
+
+import json
+import os
+import re
+import struct
+import subprocess
+import threading
+import time
+from argparse import ArgumentParser
+from array import array
+from collections import deque
+from operator import itemgetter
+
+from mininet.log import error, info, lg, output
+
+
+MAGIC = b'MNTOPOTM'
+HEADER = struct.Struct( '<8sI' )
+STAMP = struct.Struct( '<d' )
+COUNTERS = ( 'rx_bytes', 'rx_packets', 'rx_dropped',
+             'tx_bytes', 'tx_packets', 'tx_dropped' )
+# Columns of /proc/net/dev after the interface name, in COUNTERS order
+DEVFIELDS = itemgetter( 0, 1, 3, 8, 9, 11 )
+MAXDELTA = 0xffffffff
+PORTSTATS = re.compile(
+    r'port\s+"?([^":\s]+)"?:\s*rx pkts=(\d+|\?), bytes=(\d+|\?), '
+    r'drop=(\d+|\?).*?tx pkts=(\d+|\?), bytes=(\d+|\?), drop=(\d+|\?)',
+    re.DOTALL )
+
+
+def devPath( node ):
+    "Return the net/dev file of node's network namespace"
+    if getattr( node, 'inNamespace', False ):
+        return '/proc/%d/net/dev' % node.pid
+    return '/proc/net/dev'
+
+def readAll( fd ):
+    "Return the whole, freshly generated, contents of a proc file"
+    chunks = [ os.pread( fd, 65536, 0 ) ]
+    # The kernel fills a page per read, so a short first read is all of
+    # a small (host's) file and saves a read
+    if len( chunks[ 0 ] ) < 2048:
+        return chunks[ 0 ]
+    while chunks[ -1 ]:
+        chunks.append( os.pread( fd, 65536,
+                                 sum( len( chunk ) for chunk in chunks ) ) )
+    return b''.join( chunks )
+
+def parseNetDev( data, wanted, values ):
+    """Parse /proc/net/dev text into a flat list of counters
+       wanted: dict of interface name (bytes) -> column
+       values: list to store each interface's COUNTERS at column"""
+    width = len( COUNTERS )
+    for line in data.split( b'\n' )[ 2: ]:
+        name, _sep, rest = line.partition( b':' )
+        column = wanted.get( name.strip() )
+        if column is not None:
+            start = column * width
+            values[ start:start + width ] = map(
+                int, DEVFIELDS( rest.split() ) )
+
+def parsePortStats( text ):
+    """Parse ovs-ofctl dump-ports output
+       returns: dict of port name or number -> counters in COUNTERS
+       order (unsupported counters as 0)"""
+    return dict( ( match.group( 1 ),
+                   [ int( value ) if value != '?' else 0
+                     for value in match.group( 3, 2, 4, 6, 5, 7 ) ] )
+                 for match in PORTSTATS.finditer( text ) )
+
+
+class Telemetry( object ):
+    "Background collector of interface counters for a Mininet network"
+
+    def __init__( self, net, path, rate=10, capacity=600, ports='kernel',
+                  extra=() ):
+        """net: Mininet network
+           path: file to append samples to
+           rate: samples per second
+           capacity: samples held in the ring buffer
+           ports: where switch port counters come from: 'kernel' or
+                  'ofctl' (ovs-ofctl dump-ports)
+           extra: other nodes to sample, e.g. connectToInternet's root"""
+        if ports not in ( 'kernel', 'ofctl' ):
+            raise ValueError( 'ports must be kernel or ofctl' )
+        self.net = net
+        self.path = path
+        self.interval = 1.0 / rate
+        self.ports = ports
+        self.switches = list( net.switches )
+        nodes = self.switches + list( net.hosts ) + list( extra )
+        # Sampled interfaces, as ( node name, interface name )
+        self.intfs = [ ( node.name, intf.name ) for node in nodes
+                       for intf in node.intfList() if intf.name != 'lo' ]
+        self.column = dict( ( intf, i )
+                            for i, intf in enumerate( self.intfs ) )
+        self.sources = self.devSources( nodes )
+        self.fds = []
+        self.ring = deque( maxlen=capacity )
+        self.last = None
+        self.samples = self.written = self.dropped = self.missed = 0
+        self.cpu = 0.0
+        self.stopping = threading.Event()
+        self.lock = threading.Lock()
+        self.threads = []
+        self.file = None
+
+    def devSources( self, nodes ):
+        """Group the kernel-counted interfaces by namespace
+           returns: list of [ net/dev path, { name: column } ]"""
+        sources = {}
+        for node in nodes:
+            if self.ports == 'ofctl' and node in self.switches:
+                continue
+            path = devPath( node )
+            wanted = sources.setdefault( path, {} )
+            for intf in node.intfList():
+                if intf.name != 'lo':
+                    wanted[ intf.name.encode() ] = self.column[
+                        ( node.name, intf.name ) ]
+        return [ [ path, wanted ] for path, wanted in sources.items() ]
+
+    def read( self ):
+        "Return the current counters of all interfaces, as one flat list"
+        values = [ 0 ] * ( len( COUNTERS ) * len( self.intfs ) )
+        width = len( COUNTERS )
+        for fd, wanted in self.fds:
+            try:
+                data = readAll( fd )
+            except OSError:
+                # The namespace is gone
+                continue
+            parseNetDev( data, wanted, values )
+        if self.ports == 'ofctl':
+            for switch, text in self.dumpPorts():
+                numbers = dict( ( str( port ), intf.name )
+                                for intf, port in switch.ports.items() )
+                for port, counters in parsePortStats( text ).items():
+                    name = numbers.get( port, port )
+                    column = self.column.get( ( switch.name, name ) )
+                    if column is not None:
+                        start = column * width
+                        values[ start:start + width ] = counters
+        return values
+
+    def dumpPorts( self ):
+        """Run ovs-ofctl dump-ports on every switch at once
+           returns: list of ( switch, output )"""
+        procs = []
+        for switch in self.switches:
+            protocols = getattr( switch, 'protocols', None )
+            cmd = [ 'ovs-ofctl' ] + ( [ '-O', protocols ] if protocols
+                                      else [] )
+            procs.append( ( switch, subprocess.Popen(
+                cmd + [ 'dump-ports', switch.name ],
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL ) ) )
+        return [ ( switch, proc.communicate()[ 0 ].decode( 'utf-8',
+                                                           'replace' ) )
+                 for switch, proc in procs ]
+
+    def record( self, stamp, values ):
+        "Pack one sample as the increase of every counter since the last"
+        try:
+            deltas = array( 'I', [ new - old for new, old
+                                   in zip( values, self.last ) ] )
+        except OverflowError:
+            # A counter was reset (take it as counting from 0) or grew
+            # by more than 32 bits
+            deltas = array( 'I', [
+                min( MAXDELTA, new - old if new >= old else new )
+                for new, old in zip( values, self.last ) ] )
+        self.last = values
+        return STAMP.pack( stamp ) + deltas.tobytes()
+
+    def start( self ):
+        "Write the file header and start sampling"
+        self.fds = [ ( os.open( path, os.O_RDONLY ), wanted )
+                     for path, wanted in self.sources ]
+        self.last = self.read()
+        header = json.dumps( {
+            'version': 1, 'start': time.time(), 'interval': self.interval,
+            'counters': COUNTERS, 'intfs': self.intfs,
+            'base': self.last } ).encode()
+        self.file = open( self.path, 'wb' )
+        self.file.write( HEADER.pack( MAGIC, len( header ) ) + header )
+        self.threads = [ threading.Thread( target=self.sampler ),
+                         threading.Thread( target=self.writer ) ]
+        for thread in self.threads:
+            thread.daemon = True
+            thread.start()
+        info( '*** Sampling %d interfaces at %g Hz into %s\n' %
+              ( len( self.intfs ), 1 / self.interval, self.path ) )
+        return self
+
+    def sampler( self ):
+        "Take a sample every interval until stopped"
+        start = time.time()
+        cpu = time.thread_time() if hasattr( time, 'thread_time' ) else 0
+        tick = 1
+        while not self.stopping.wait(
+                max( 0, start + tick * self.interval - time.time() ) ):
+            now = time.time()
+            record = self.record( now, self.read() )
+            with self.lock:
+                self.samples += 1
+                self.ring.append( ( self.samples, record ) )
+            # Skip the ticks we were too slow for
+            late = int( ( time.time() - start ) / self.interval ) + 1
+            self.missed += max( 0, late - tick - 1 )
+            tick = max( tick + 1, late )
+        if hasattr( time, 'thread_time' ):
+            self.cpu = time.thread_time() - cpu
+
+    def writer( self, period=1.0 ):
+        "Append the samples in the ring to the file every period seconds"
+        stopped = False
+        while not stopped:
+            stopped = self.stopping.wait( period )
+            with self.lock:
+                pending = [ item for item in self.ring
+                            if item[ 0 ] > self.written ]
+            if pending:
+                self.dropped += pending[ 0 ][ 0 ] - self.written - 1
+                self.file.write( b''.join( record for _n, record
+                                           in pending ) )
+                self.file.flush()
+                self.written = pending[ -1 ][ 0 ]
+
+    def stop( self ):
+        "Stop sampling, write out the ring and close the file"
+        self.stopping.set()
+        for thread in self.threads:
+            thread.join()
+        # The sampler may have added one more sample after the writer
+        self.writer( period=0 )
+        self.file.close()
+        for fd, _wanted in self.fds:
+            os.close( fd )
+        seconds = self.samples * self.interval
+        info( '*** Telemetry: %d samples of %d interfaces (%d dropped, '
+              '%d ticks missed), %.1f%% of a core\n' % (
+                  self.samples, len( self.intfs ), self.dropped,
+                  self.missed, 100 * self.cpu / seconds if seconds else 0 ) )
+
+    def rates( self, window=1.0 ):
+        """Return the per-second rate of every counter over the last
+           window seconds of samples
+           returns: dict of ( node, intf ) -> list in COUNTERS order"""
+        with self.lock:
+            records = list( self.ring )[ -max( 1, int( round(
+                window / self.interval ) ) ): ]
+        totals = [ 0 ] * ( len( COUNTERS ) * len( self.intfs ) )
+        for _n, record in records:
+            deltas = array( 'I' )
+            deltas.frombytes( record[ STAMP.size: ] )
+            totals = [ a + b for a, b in zip( totals, deltas ) ]
+        seconds = len( records ) * self.interval or 1
+        width = len( COUNTERS )
+        return dict( ( intf, [ value / seconds for value in
+                               totals[ i * width:( i + 1 ) * width ] ] )
+                     for i, intf in enumerate( self.intfs ) )
+
+    def top( self, count=10, window=1.0 ):
+        "Log the count busiest interfaces over the last window seconds"
+        showRates( self.rates( window ), count )
+
+
+def showRates( rates, count=10 ):
+    "Log the count interfaces with the highest RX+TX bit rate in rates"
+    busiest = sorted( rates.items(),
+                      key=lambda item: -( item[ 1 ][ 0 ] + item[ 1 ][ 3 ] ) )
+    output( '%-10s %-14s %10s %10s %10s %10s\n' % (
+        'node', 'intf', 'rx Mb/s', 'tx Mb/s', 'rx drop/s', 'tx drop/s' ) )
+    for ( node, intf ), values in busiest[ :count ]:
+        output( '%-10s %-14s %10.2f %10.2f %10.1f %10.1f\n' % (
+            node, intf, values[ 0 ] * 8e-6, values[ 3 ] * 8e-6,
+            values[ 2 ], values[ 5 ] ) )
+
+def readTelemetry( path ):
+    """Read a telemetry file
+       returns: header dict, list of times, list of delta arrays (one
+                per sample, COUNTERS for each interface in turn)"""
+    with open( path, 'rb' ) as f:
+        magic, length = HEADER.unpack( f.read( HEADER.size ) )
+        if magic != MAGIC:
+            raise ValueError( '%s is not a telemetry file' % path )
+        header = json.loads( f.read( length ).decode() )
+        size = STAMP.size + 4 * len( COUNTERS ) * len( header[ 'intfs' ] )
+        times, samples = [], []
+        while True:
+            record = f.read( size )
+            if len( record ) < size:
+                break
+            times.append( STAMP.unpack_from( record )[ 0 ] )
+            deltas = array( 'I' )
+            deltas.frombytes( record[ STAMP.size: ] )
+            samples.append( deltas )
+    return header, times, samples
+
+def peakRates( header, times, samples ):
+    """Return the highest per-second rate of each counter of each
+       interface over a telemetry file's samples
+       returns: dict of ( node, intf ) -> list in COUNTERS order"""
+    width = len( COUNTERS )
+    peaks = [ 0.0 ] * ( width * len( header[ 'intfs' ] ) )
+    previous = header[ 'start' ]
+    for stamp, deltas in zip( times, samples ):
+        seconds = max( stamp - previous, 1e-6 )
+        previous = stamp
+        peaks = [ max( peak, delta / seconds )
+                  for peak, delta in zip( peaks, deltas ) ]
+    return dict( ( tuple( intf ), peaks[ i * width:( i + 1 ) * width ] )
+                 for i, intf in enumerate( header[ 'intfs' ] ) )
+
+
+class TelemetryCommands( object ):
+    """Mininet CLI mixin with a 'top' command showing the busiest
+       interfaces
+       self.telemetry: running Telemetry collector, or None"""
+
+    def do_top( self, line ):
+        """Show the busiest interfaces over the last second (needs a
+           running Telemetry collector).
+           Usage: top [count]"""
+        if self.telemetry is None:
+            error( 'telemetry is off (start with --telemetry FILE)\n' )
+            return
+        try:
+            count = int( line ) if line.strip() else 10
+        except ValueError:
+            error( 'usage: top [count]\n' )
+            return
+        self.telemetry.top( count )
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser( description='Summarize a telemetry file' )
+    parser.add_argument( '--top', type=int, default=10,
+                         help='interfaces to list (default: 10)' )
+    parser.add_argument( 'file' )
+    args = parser.parse_args()
+    lg.setLogLevel( 'output' )
+    fileHeader, fileTimes, fileSamples = readTelemetry( args.file )
+    output( '%d samples of %d interfaces over %.1fs; peak rates:\n' % (
+        len( fileSamples ), len( fileHeader[ 'intfs' ] ),
+        fileTimes[ -1 ] - fileHeader[ 'start' ] if fileTimes else 0 ) )
+    showRates( peakRates( fileHeader, fileTimes, fileSamples ), args.top )
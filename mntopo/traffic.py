@@ -0,0 +1,331 @@
+"""
+Traffic-matrix driven iperf load.
+
+A traffic matrix lists flows in the line syntax of topology specs:
+
+    # every NTTU host uploads to the NAT gateway (the root node)
+    h1..h240 -> root proto=tcp duration=10
+    h1..h20 -> h99..h118 proto=udp rate=5M duration=10
+
+Every node on the left sends to every node on the right; proto is tcp
+(default) or udp, rate an iperf bandwidth such as 5M (default: as fast
+as TCP goes, iperf's 1M for UDP) and duration is in seconds (default
+10).
+
+runTraffic() starts one iperf server per protocol on every sink, all
+sinks at once, then every source's clients from a single shell command
+per source. The clients of all sources wait to open one fifo, which is
+only opened for writing once every source waits, so all flows start
+together; apart from the iperf processes themselves the load costs one
+shell round trip per node. Per-flow throughput, and for UDP jitter and
+loss as seen by the server, come back as one TrafficResult.
+
+Needs iperf (version 2) on the machine.
+"""
+
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+from collections import namedtuple
+
+from mininet.log import error, info, output
+
+from mntopo.pipeline import CmdPipeline, runPipelines
+from mntopo.spec import SpecError, splitParams
+from mntopo.util import distribution, dottedQuad
+
+
+PORTS = { 'tcp': 5001, 'udp': 5002 }
+RATE = re.compile( r'^\d+(\.\d+)?[kKmMgG]?$' )
+# Seconds a client may run past its duration before it is killed
+GRACE = 15
+
+Flow = namedtuple( 'Flow', 'src dst proto rate duration' )
+FlowResult = namedtuple( 'FlowResult', 'flow bytes bps jitter lost total' )
+
+
+def parseMatrix( lines, name=None ):
+    """Parse traffic matrix text into a list of Flow
+       lines: iterable of matrix lines
+       name: matrix name, for errors (optional)"""
+    flows, seen = [], set()
+    for lineno, line in enumerate( lines, 1 ):
+        line = line.split( '#', 1 )[ 0 ].strip()
+        if not line:
+            continue
+        tokens = line.replace( ',', ' ' ).split()
+        try:
+            for flow in parseFlows( tokens ):
+                key = flow.src, flow.dst, flow.proto
+                if key in seen:
+                    raise SpecError( 'duplicate %s flow %s -> %s' % (
+                        flow.proto, flow.src, flow.dst ) )
+                seen.add( key )
+                flows.append( flow )
+        except SpecError as e:
+            raise SpecError( '%s:%d: %s' % ( name, lineno, e ) )
+    return flows
+
+def parseFlows( tokens ):
+    "Return the flows of one matrix line, skipping flows to self"
+    if '->' not in tokens:
+        raise SpecError( 'expected: NODES -> NODES [key=value ...]' )
+    arrow = tokens.index( '->' )
+    srcs, _params = splitParams( tokens[ :arrow ] )
+    dsts, params = splitParams( tokens[ arrow + 1: ] )
+    if not srcs or not dsts or _params:
+        raise SpecError( 'expected: NODES -> NODES [key=value ...]' )
+    unknown = set( params ) - set( [ 'proto', 'rate', 'duration' ] )
+    if unknown:
+        raise SpecError( 'unknown flow parameter %s' % sorted( unknown )[ 0 ] )
+    proto = params.get( 'proto', 'tcp' )
+    if proto not in PORTS:
+        raise SpecError( 'proto must be tcp or udp, not %s' % proto )
+    rate = params.get( 'rate' )
+    if rate is not None and not RATE.match( rate ):
+        raise SpecError( 'bad rate %s' % rate )
+    try:
+        duration = float( params.get( 'duration', 10 ) )
+    except ValueError:
+        raise SpecError( 'bad duration %s' % params[ 'duration' ] )
+    return [ Flow( src, dst, proto, rate, duration )
+             for src in srcs for dst in dsts if src != dst ]
+
+def loadMatrix( path ):
+    "Load a traffic matrix file"
+    with open( path ) as f:
+        return parseMatrix( f, os.path.basename( path ) )
+
+
+class TrafficResult( object ):
+    """Per-flow results of runTraffic(), in flow order; bps is None for
+       flows that reported nothing"""
+
+    def __init__( self, flows, starts ):
+        self.flows = flows
+        # Source name -> time its clients were released (epoch seconds)
+        self.starts = starts
+
+    def skew( self ):
+        "Return the spread of the sources' start times in seconds"
+        starts = list( self.starts.values() )
+        return max( starts ) - min( starts ) if starts else 0.0
+
+    def failed( self ):
+        "Return the flows that reported nothing"
+        return [ result.flow for result in self.flows if result.bps is None ]
+
+    def records( self ):
+        "Return the results as a list of dicts, e.g. for JSON"
+        return [ dict( result.flow._asdict(), bytes=result.bytes,
+                       bps=result.bps, jitter=result.jitter,
+                       lost=result.lost, total=result.total )
+                 for result in self.flows ]
+
+
+def serverCmds( proto, port ):
+    """Return commands that start an iperf server, print its pid and
+       wait until it listens"""
+    udp = '-u ' if proto == 'udp' else ''
+    return [ '( iperf -s %s-p %d > /dev/null 2>&1 & echo $! )' % ( udp, port ),
+             'for i in $( seq 200 ); do ss -ln%s | grep -q ":%d " && '
+             'break; sleep 0.05; done; ss -ln%s | grep -q ":%d "' %
+             ( proto[ 0 ], port, proto[ 0 ], port ) ]
+
+def clientCmd( flow, ip ):
+    "Return the command that runs flow's iperf client to ip"
+    args = [ 'timeout', int( flow.duration + GRACE ), 'iperf', '-c', ip,
+             '-p', PORTS[ flow.proto ], '-t', flow.duration, '-y', 'C' ]
+    if flow.proto == 'udp':
+        args.append( '-u' )
+    if flow.rate:
+        args += [ '-b', flow.rate ]
+    return ' '.join( str( arg ) for arg in args )
+
+def sourceCmd( flows, ips, barrier ):
+    """Return one command that checks in at barrier, waits until
+       barrier's fifo has a writer, prints the time and then runs the
+       clients of a source's flows in parallel; with bash 5 only builtins
+       run before the clients, so the release costs no process per
+       source (older shells have no $EPOCHREALTIME and run date)"""
+    clients = ' & '.join( clientCmd( flow, ips[ flow.dst ] )
+                          for flow in flows )
+    # A subshell keeps the interactive shell's job messages out
+    return ( '( : > %s/ready-%s; : < %s/go; '
+             'echo ${EPOCHREALTIME:-$( date +%%s.%%N )}; %s & wait )' %
+             ( barrier, flows[ 0 ].src, barrier, clients ) )
+
+def parseReports( text ):
+    """Parse iperf -y C output into a dict of ( remote IP, port ) ->
+       ( bytes, bps, jitter, lost, total ); a UDP server report
+       replaces the client's own line"""
+    reports = {}
+    for line in text.splitlines():
+        fields = line.strip().split( ',' )
+        if len( fields ) not in ( 9, 14 ) or not fields[ 4 ].isdigit():
+            continue
+        try:
+            values = [ int( fields[ 7 ] ), float( fields[ 8 ] ) ]
+            values += ( [ float( fields[ 9 ] ), int( fields[ 10 ] ),
+                          int( fields[ 11 ] ) ] if len( fields ) == 14
+                        else [ None ] * 3 )
+        except ValueError:
+            continue
+        # Server reports may name the endpoints either way round
+        for ip, port in ( fields[ 3 ], fields[ 4 ] ), ( fields[ 1 ],
+                                                        fields[ 2 ] ):
+            key = ip, int( port )
+            if len( fields ) == 14 or key not in reports:
+                reports[ key ] = tuple( values )
+    return reports
+
+def runTraffic( net, flows, extra=() ):
+    """Run the flows of a traffic matrix, all at once
+       net: Mininet network
+       flows: list of Flow, e.g. from loadMatrix()
+       extra: other nodes flows may name, e.g. connectToInternet's root
+       returns: TrafficResult"""
+    nodes = dict( ( node.name, node )
+                  for node in list( net.hosts ) + list( extra ) )
+    for flow in flows:
+        for name in flow.src, flow.dst:
+            if name not in nodes or not nodes[ name ].IP():
+                raise SpecError( 'flow %s -> %s: no host %s with an '
+                                 'address' % ( flow.src, flow.dst, name ) )
+    ips = dict( ( name, dottedQuad( node.IP() ) )
+                for name, node in nodes.items() if node.IP() )
+    sinks = sorted( set( ( flow.dst, flow.proto ) for flow in flows ) )
+    servers = {}
+    for dst, proto in sinks:
+        pipeline = servers.setdefault( dst, CmdPipeline( nodes[ dst ] ) )
+        for cmd in serverCmds( proto, PORTS[ proto ] ):
+            pipeline.add( cmd )
+    servers = list( servers.values() )
+    pids = []
+    try:
+        info( '*** Starting %d iperf servers on %d nodes\n' %
+              ( len( sinks ), len( servers ) ) )
+        for pipeline, results in zip( servers, runPipelines( servers ) ):
+            pids.append( ( pipeline.node, re.findall(
+                r'^(\d+)\s*$', ''.join( result.output for result in
+                                        results[ ::2 ] ), re.M ) ) )
+            for result in results[ 1::2 ]:
+                if result.status:
+                    error( '*** iperf server on %s not listening\n' %
+                           pipeline.node )
+        return runClients( nodes, ips, flows )
+    finally:
+        stops = [ CmdPipeline( node ).add( 'kill', *nodePids )
+                  for node, nodePids in pids if nodePids ]
+        runPipelines( stops )
+
+def runClients( nodes, ips, flows, timeout=30 ):
+    """Release all sources' clients at once and collect their reports
+       timeout: seconds to wait for every source to be ready"""
+    bySource = {}
+    for flow in flows:
+        bySource.setdefault( flow.src, [] ).append( flow )
+    sources = sorted( bySource )
+    barrier = tempfile.mkdtemp( prefix='mntopo-traffic-' )
+    fifo = os.path.join( barrier, 'go' )
+    os.mkfifo( fifo )
+    fds = []
+
+    def release():
+        "Open the fifo once all sources wait on it (or on timeout)"
+        deadline = time.time() + timeout
+        while ( len( os.listdir( barrier ) ) <= len( sources ) and
+                time.time() < deadline ):
+            time.sleep( .005 )
+        # Wakes every blocked reader at once; read-write never blocks
+        fds.append( os.open( fifo, os.O_RDWR ) )
+
+    try:
+        pipelines = [ CmdPipeline( nodes[ src ] ).add(
+                          sourceCmd( bySource[ src ], ips, barrier ) )
+                      for src in sources ]
+        info( '*** Running %d flows from %d sources\n' %
+              ( len( flows ), len( pipelines ) ) )
+        allResults = runPipelines( pipelines, sent=release )
+    finally:
+        for fd in fds:
+            os.close( fd )
+        shutil.rmtree( barrier )
+    results, starts = [], {}
+    for src, srcResults in zip( sources, allResults ):
+        text = ''.join( result.output for result in srcResults )
+        # $EPOCHREALTIME has the locale's decimal point
+        stamp = re.search( r'^(\d+)[.,](\d+)\s*$', text, re.M )
+        if stamp:
+            starts[ src ] = float( '.'.join( stamp.groups() ) )
+        else:
+            error( '*** No start time from %s\n' % src )
+        reports = parseReports( text )
+        for flow in bySource[ src ]:
+            report = reports.get( ( ips[ flow.dst ], PORTS[ flow.proto ] ),
+                                  ( None, ) * 5 )
+            results.append( FlowResult( flow, *report ) )
+    return TrafficResult( results, starts )
+
+def report( result ):
+    "Log a summary of a TrafficResult"
+    for proto in sorted( PORTS ):
+        flows = [ r for r in result.flows
+                  if r.flow.proto == proto and r.bps is not None ]
+        if not flows:
+            continue
+        mbps = distribution( [ r.bps / 1e6 for r in flows ] )
+        output( '*** %s: %d flows, %.1f Mbit/s total; per flow min %.2f '
+                'p50 %.2f p99 %.2f max %.2f\n' % (
+                    proto.upper(), len( flows ),
+                    sum( r.bps for r in flows ) / 1e6, mbps[ 'min' ],
+                    mbps[ 'p50' ], mbps[ 'p99' ], mbps[ 'max' ] ) )
+        if proto == 'udp':
+            lost = sum( r.lost or 0 for r in flows )
+            total = sum( r.total or 0 for r in flows )
+            jitter = distribution( [ r.jitter for r in flows
+                                     if r.jitter is not None ] )
+            output( '*** UDP: %d/%d datagrams lost (%.2f%%)%s\n' % (
+                lost, total, 100.0 * lost / total if total else 0,
+                '; jitter ms p50 %.3f p99 %.3f' % (
+                    jitter[ 'p50' ], jitter[ 'p99' ] ) if jitter else '' ) )
+    output( '*** Sources started within %.1f ms of each other\n' %
+            ( 1000 * result.skew() ) )
+    failed = result.failed()
+    for flow in failed[ :10 ]:
+        output( '*** %s -> %s (%s) reported nothing\n' %
+                ( flow.src, flow.dst, flow.proto ) )
+    if len( failed ) > 10:
+        output( '*** ... and %d more\n' % ( len( failed ) - 10 ) )
+
+def save( result, path ):
+    "Write a TrafficResult to path as JSON"
+    with open( path, 'w' ) as f:
+        json.dump( { 'skew': result.skew(), 'starts': result.starts,
+                     'flows': result.records() }, f, indent=1 )
+
+
+class TrafficCommands( object ):
+    """Mininet CLI mixin with a traffic-matrix 'traffic' command
+       self.extra: other nodes flows may name, e.g. the root node"""
+
+    def do_traffic( self, line ):
+        """Run the flows of a traffic matrix file and report them.
+           Usage: traffic MATRIX [RESULT.json]"""
+        args = line.split()
+        if not 1 <= len( args ) <= 2:
+            error( 'usage: traffic MATRIX [RESULT.json]\n' )
+            return
+        try:
+            result = runTraffic( self.mn, loadMatrix( args[ 0 ] ),
+                                 self.extra )
+        except ( IOError, SpecError ) as e:
+            error( '*** %s\n' % e )
+            return
+        report( result )
+        if len( args ) > 1:
+            save( result, args[ 1 ] )
+
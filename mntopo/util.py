@@ -0,0 +1,167 @@
+"Utility functions shared by the mntopo helpers"
+
+import socket
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from math import ceil
+from threading import Lock, Thread
+
+from mininet.log import info
+
+try:
+    from shlex import quote as shellQuote
+except ImportError:
+    from pipes import quote as shellQuote
+
+
+def dottedQuad( addr ):
+    """Expand a short-form IPv4 address the way inet_aton does,
+       e.g. '10.254' -> '10.0.0.254', or a short-form subnet the way
+       ip and iptables do, e.g. '192.168/16' -> '192.168.0.0/16'
+       addr: IPv4 address, optionally with a /prefix"""
+    if '/' in addr:
+        addr, prefix = addr.split( '/', 1 )
+        octets = addr.split( '.' )
+        return '.'.join( octets + [ '0' ] * ( 4 - len( octets ) ) ) + (
+            '/' + prefix )
+    return socket.inet_ntoa( socket.inet_aton( addr ) )
+
+def pipeCmd( lines, command ):
+    """Return a single shell command that feeds lines to command's stdin
+       lines: input lines
+       command: shell command reading stdin"""
+    args = ' '.join( shellQuote( line ) for line in lines )
+    return "printf '%%s\\n' %s | %s" % ( args, command )
+
+def ipBatchCmd( lines ):
+    """Return a single shell command that feeds lines to ip -batch
+       lines: ip commands without the leading 'ip'"""
+    return pipeCmd( lines, 'ip -force -batch -' )
+
+def tcBatchCmd( lines ):
+    """Return a single shell command that feeds lines to tc -batch
+       lines: tc commands without the leading 'tc'"""
+    return pipeCmd( lines, 'tc -force -batch -' )
+
+
+def parallelMap( fn, items, workers ):
+    """Apply fn to every item using a bounded pool of threads
+       fn: function of one argument
+       items: iterable of arguments
+       workers: maximum number of concurrent calls (1: run serially)
+       returns: list of results, in item order"""
+    items = list( items )
+    if workers <= 1 or len( items ) <= 1:
+        return [ fn( item ) for item in items ]
+    results = [ None ] * len( items )
+    errors = []
+    pending = iter( enumerate( items ) )
+    lock = Lock()
+
+    def worker():
+        "Process items until none are left or one has failed"
+        while not errors:
+            with lock:
+                try:
+                    index, item = next( pending )
+                except StopIteration:
+                    return
+            try:
+                results[ index ] = fn( item )
+            except Exception as e:  # pylint: disable=broad-except
+                errors.append( e )
+
+    threads = [ Thread( target=worker )
+                for _ in range( min( workers, len( items ) ) ) ]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[ 0 ]
+    return results
+
+
+def distribution( values ):
+    """Summarize values as count, min, median, 90th and 99th percentile
+       (nearest rank) and max
+       returns: OrderedDict, empty if there are no values"""
+    values = sorted( values )
+    if not values:
+        return OrderedDict()
+
+    def percentile( p ):
+        "Return the nearest-rank p-th percentile"
+        return values[ max( 0, int( ceil( p / 100.0 * len( values ) ) ) - 1 ) ]
+
+    return OrderedDict( [ ( 'count', len( values ) ), ( 'min', values[ 0 ] ),
+                          ( 'p50', percentile( 50 ) ),
+                          ( 'p90', percentile( 90 ) ),
+                          ( 'p99', percentile( 99 ) ),
+                          ( 'max', values[ -1 ] ) ] )
+
+
+class PhaseTimer( object ):
+    """Wall-clock timer for the named, possibly nested, phases of a run,
+       and for samples such as per-switch connection times"""
+
+    def __init__( self ):
+        self.phases = []
+        self.depth = 0
+        self.start = time.time()
+        self.samples = OrderedDict()
+
+    @contextmanager
+    def phase( self, name ):
+        "Time the enclosed block and record it as phase name"
+        entry = [ name, 0.0, self.depth ]
+        self.phases.append( entry )
+        self.depth += 1
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.depth -= 1
+            entry[ 1 ] = time.time() - start
+
+    def seconds( self, name ):
+        "Return the total time recorded for phase name"
+        return sum( seconds for phase, seconds, _depth in self.phases
+                    if phase == name )
+
+    def sample( self, name, seconds ):
+        "Record one sample of name, e.g. one switch's connection time"
+        self.samples.setdefault( name, [] ).append( seconds )
+
+    def distributions( self ):
+        "Return an OrderedDict of sample name -> distribution()"
+        return OrderedDict( ( name, distribution( values ) )
+                            for name, values in self.samples.items() )
+
+    def totals( self ):
+        """Return an OrderedDict of phase path -> total seconds, where
+           nested phases are named 'outer/inner'"""
+        totals = OrderedDict()
+        path = []
+        for name, seconds, depth in self.phases:
+            path[ depth: ] = [ name ]
+            key = '/'.join( path )
+            totals[ key ] = totals.get( key, 0.0 ) + seconds
+        return totals
+
+    def elapsed( self ):
+        "Return seconds since the timer was created"
+        return time.time() - self.start
+
+    def report( self, title='Timing' ):
+        "Log the recorded phases and the total elapsed time"
+        info( '*** %s:\n' % title )
+        for name, seconds, depth in self.phases:
+            info( '    %-16s %8.3f s\n' % ( '  ' * depth + name, seconds ) )
+        info( '    %-16s %8.3f s\n' % ( 'total', self.elapsed() ) )
+        for name, dist in self.distributions().items():
+            info( '    %s: n=%d ' % ( name, dist[ 'count' ] ) +
+                  ' '.join( '%s=%.3fs' % ( key, dist[ key ] )
+                            for key in list( dist )[ 1: ] ) + '\n' )
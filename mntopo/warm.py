@@ -0,0 +1,305 @@
+"""
+Warm topology reuse: keep a network up and reset it between experiments.
+
+Building the NTTU tree, connecting it and starting NAT takes minutes;
+resetting it takes one round trip to every node. Run a topology with
+--persist and it stays up without a CLI, its state saved in
+/run/mntopo/TOPO.json, until it gets SIGTERM, SIGHUP or control-C.
+Experiments attach to it from their own processes:
+
+    with attach( 'nttutree' ) as net:
+        net.reset()
+        result = sweep( net )
+        runTraffic( net, flows, extra=[ net.root ] )
+
+An attached node has its own shell, started in the namespaces of the
+persistent node's shell (mnexec -a), so CmdPipeline, sweep(), traffic
+and telemetry work on attached networks as on the original one.
+
+reset() returns the network to its state right after bring-up, all
+nodes at once: it kills every process in the hosts' namespaces except
+the shells, flushes the dynamic neighbor (ARP) entries (static ones
+from --static-arp stay), re-creates the links' qdiscs with the
+shaping of --shape, and reloads the flow tables saved at bring-up,
+which also zeroes the qdisc and flow counters. Kernel interface
+counters cannot be zeroed; mntopo.telemetry reports deltas anyway.
+"""
+
+import json
+import os
+import signal
+import sys
+import time
+from argparse import ArgumentParser
+
+from mininet.link import Intf
+from mininet.log import error, info, lg, output
+from mininet.node import Node
+
+from mntopo.flows import ofctl
+from mntopo.pipeline import CmdPipeline, failures, runPipelines
+from mntopo.shaping import intfShapes, namespaceBatches
+from mntopo.teardown import RUN_ENV, killAll, namespacePids, runAlive
+from mntopo.util import ipBatchCmd, parallelMap, pipeCmd, tcBatchCmd
+
+
+STATE_DIR = '/run/mntopo'
+
+
+def statePath( name ):
+    "Return the state file of persistent topology name"
+    return os.path.join( STATE_DIR, '%s.json' % name )
+
+def nodeState( node ):
+    "Return what attach() needs to know about node"
+    return { 'pid': node.shell.pid,
+             'intfs': [ [ intf.name, port, intf.ip, intf.prefixLen,
+                          intf.mac ]
+                        for port, intf in sorted( node.intfs.items() ) ] }
+
+def dumpFlows( switches ):
+    """Read the flow tables of switches, all switches concurrently
+       returns: dict of switch name -> flow lines"""
+    pipelines = [ CmdPipeline( switch ).add(
+                      ofctl( switch ), 'dump-flows --no-stats', switch.name )
+                  for switch in switches ]
+    flows = {}
+    for pipeline, results in zip( pipelines, runPipelines( pipelines ) ):
+        name = pipeline.node.name
+        if failures( results ):
+            error( '*** Saving the flows of %s failed: %s\n' %
+                   ( name, results[ 0 ].output.strip() ) )
+        flows[ name ] = [ line.strip() for line in
+                          results[ 0 ].output.splitlines()
+                          if 'actions=' in line ]
+    return flows
+
+def saveState( net, spec, root, run, tiers=None ):
+    """Save what attach() and reset() need: nodes, links, shaping and
+       the flow tables as they are now
+       root: the root node of connectToInternet
+       run: run ID of mntopo.teardown.newRun()
+       tiers: link shaping tiers, as for shapeLinks()
+       returns: state file path"""
+    flows = dumpFlows( net.switches )
+    state = {
+        'name': spec.name, 'run': run, 'started': time.time(),
+        'hosts': dict( ( host.name, nodeState( host ) )
+                       for host in net.hosts ),
+        'switches': dict( ( switch.name, dict(
+            nodeState( switch ),
+            protocols=getattr( switch, 'protocols', None ),
+            flows=flows[ switch.name ] ) ) for switch in net.switches ),
+        'root': dict( nodeState( root ), name=root.name ),
+        'links': [ [ link.intf1.node.name, link.intf1.name,
+                     link.intf2.node.name, link.intf2.name ]
+                   for link in net.links ],
+        'shapes': dict( ( intf.name, lines ) for intf, lines
+                        in intfShapes( net, spec, tiers ) ) }
+    if not os.path.isdir( STATE_DIR ):
+        os.makedirs( STATE_DIR )
+    path = statePath( spec.name )
+    with open( path + '.tmp', 'w' ) as f:
+        json.dump( state, f )
+    os.rename( path + '.tmp', path )
+    return path
+
+def persist( net, spec, root, run, tiers=None ):
+    """Save net's state and keep it up for attach() until SIGTERM, SIGHUP
+       (see mntopo.teardown.TeardownGuard) or control-C"""
+    path = saveState( net, spec, root, run, tiers )
+    info( "*** %s is up; attach with mntopo.warm.attach( '%s' ), reset "
+          'with python -m mntopo.warm --reset %s\n' %
+          ( spec.name, spec.name, spec.name ) )
+    info( '*** Stop it with SIGTERM or control-C\n' )
+    try:
+        while True:
+            signal.pause()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        os.unlink( path )
+
+
+class AttachedNode( Node ):
+    "Node with a new shell in the namespaces of a running node's shell"
+
+    def __init__( self, name, target, **params ):
+        """target: pid of the running node's shell"""
+        self.target = target
+        Node.__init__( self, name, **params )
+
+    def startShell( self, mnopts=None ):
+        "Start our shell in the target's namespaces (mnexec -a)"
+        # Node.startShell would add -n, for a new namespace
+        inNamespace, self.inNamespace = self.inNamespace, False
+        try:
+            Node.startShell( self, '-cda%d' % self.target )
+        finally:
+            self.inNamespace = inNamespace
+
+
+class AttachedLink( object ):
+    "A link between attached nodes"
+
+    def __init__( self, intf1, intf2 ):
+        self.intf1, self.intf2 = intf1, intf2
+        intf1.link = intf2.link = self
+
+
+def noMove( *_args, **_kwargs ):
+    "Leave an attached interface where it is"
+    pass
+
+
+class AttachedNet( object ):
+    """A persistent network, attached to from another process; it has
+       hosts, switches, links and get() like a Mininet network"""
+
+    def __init__( self, state, workers=8 ):
+        """state: saved state (see saveState())
+           workers: number of shells to start concurrently"""
+        self.state = state
+        self.name = state[ 'name' ]
+        self.controllers = []
+        entries = ( [ ( name, True, saved ) for name, saved
+                      in state[ 'hosts' ].items() ] +
+                    [ ( name, False, saved ) for name, saved
+                      in state[ 'switches' ].items() ] +
+                    [ ( state[ 'root' ][ 'name' ], False,
+                        state[ 'root' ] ) ] )
+        nodes = parallelMap( lambda entry: AttachedNode(
+            entry[ 0 ], entry[ 2 ][ 'pid' ], inNamespace=entry[ 1 ] ),
+            entries, workers )
+        self.nameToNode = dict( ( node.name, node ) for node in nodes )
+        for node, ( _name, _ns, saved ) in zip( nodes, entries ):
+            for name, port, ip, prefixLen, mac in saved[ 'intfs' ]:
+                intf = Intf( name, node=node, port=port, mac=mac,
+                             moveIntfFn=noMove, up=None )
+                intf.ip, intf.prefixLen = ip, prefixLen
+            node.protocols = saved.get( 'protocols' )
+        self.hosts = nodes[ :len( state[ 'hosts' ] ) ]
+        self.switches = nodes[ len( self.hosts ):-1 ]
+        self.root = nodes[ -1 ]
+        self.links = [ AttachedLink( self.get( node1 ).nameToIntf[ intf1 ],
+                                     self.get( node2 ).nameToIntf[ intf2 ] )
+                       for node1, intf1, node2, intf2 in state[ 'links' ] ]
+
+    def get( self, *names ):
+        "Return node(s) by name"
+        nodes = [ self.nameToNode[ name ] for name in names ]
+        return nodes[ 0 ] if len( nodes ) == 1 else nodes
+
+    __getitem__ = get
+
+    def __enter__( self ):
+        return self
+
+    def __exit__( self, *_exc ):
+        self.detach()
+
+    def detach( self ):
+        "Stop our shells; the persistent network stays up"
+        for node in self.nameToNode.values():
+            node.terminate()
+
+    def reset( self ):
+        """Return the network to its state right after bring-up, all
+           nodes at once
+           returns: dict of node name -> error output, for failed nodes"""
+        start = time.time()
+        state = self.state
+        # Everything in the hosts' namespaces but the shells
+        shells = set( [ saved[ 'pid' ] for saved
+                        in state[ 'hosts' ].values() ] +
+                      [ host.shell.pid for host in self.hosts ] )
+        strays = [ pid for pid in namespacePids( shells )
+                   if pid not in shells ]
+        killAll( strays )
+        intfs = [ intf for link in self.links
+                  for intf in ( link.intf1, link.intf2 ) ]
+        shapes = state[ 'shapes' ]
+        # The same interfaces, so the same namespaces in the same order
+        dels = namespaceBatches( [ ( intf, [ 'qdisc del dev %s root' %
+                                             intf ] ) for intf in intfs ] )
+        adds = namespaceBatches( [ ( intf, shapes.get( intf.name, [] ) )
+                                   for intf in intfs ] )
+        pipelines = []
+        for ( node, delLines ), ( _node, addLines ) in zip( dels, adds ):
+            if node.inNamespace:
+                pipeline = CmdPipeline( node ).add( 'ip neigh flush all' )
+            else:
+                # The switches' shells get their flows below
+                pipeline = CmdPipeline( self.root ).add( ipBatchCmd(
+                    [ 'neigh flush dev %s' % intf
+                      for intf in self.root.intfList() ] ) )
+            # Interfaces with their default qdisc have none to delete
+            pipeline.add( tcBatchCmd( delLines ) + ' 2>/dev/null || true' )
+            if addLines:
+                pipeline.add( tcBatchCmd( addLines ) )
+            pipelines.append( pipeline )
+        for switch in self.switches:
+            pipeline = CmdPipeline( switch ).add(
+                ofctl( switch ), 'del-flows', switch.name )
+            flows = state[ 'switches' ][ switch.name ][ 'flows' ]
+            if flows:
+                pipeline.add( pipeCmd( flows, '%s add-flows %s -' %
+                                       ( ofctl( switch ), switch.name ) ) )
+            pipelines.append( pipeline )
+        errors = {}
+        for pipeline, results in zip( pipelines, runPipelines( pipelines ) ):
+            failed = failures( results )
+            if failed:
+                errors[ pipeline.node.name ] = ''.join(
+                    result.output for result in failed ).strip()
+        for name in sorted( errors ):
+            error( '*** Resetting %s failed: %s\n' % ( name, errors[ name ] ) )
+        info( '*** Reset %d hosts and %d switches in %.3fs (%d stray '
+              'processes killed)\n' % ( len( self.hosts ),
+                                        len( self.switches ),
+                                        time.time() - start, len( strays ) ) )
+        return errors
+
+
+def loadState( name ):
+    """Load the state of persistent topology name
+       raises: IOError if there is none, ValueError if it is no longer
+               running"""
+    with open( statePath( name ) ) as f:
+        state = json.load( f )
+    if not runAlive( state[ 'run' ] ):
+        raise ValueError( '%s is no longer running' % name )
+    return state
+
+def attach( name, workers=8 ):
+    """Attach to persistent topology name (a --persist run)
+       workers: number of shells to start concurrently
+       returns: AttachedNet"""
+    state = loadState( name )
+    # Our shells belong to the persistent run, and go with it
+    os.environ[ RUN_ENV ] = state[ 'run' ]
+    return AttachedNet( state, workers )
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser( description='Show or reset a persistent '
+                                         'topology (run with --persist)' )
+    parser.add_argument( '--reset', action='store_true',
+                         help='reset it to its state after bring-up' )
+    parser.add_argument( 'topo', help='topology name, e.g. nttutree' )
+    args = parser.parse_args()
+    lg.setLogLevel( 'info' )
+    try:
+        if not args.reset:
+            found = loadState( args.topo )
+            output( '%s: %d hosts, %d switches, %d links, up %.0fs '
+                    '(run %s)\n' % (
+                        found[ 'name' ], len( found[ 'hosts' ] ),
+                        len( found[ 'switches' ] ), len( found[ 'links' ] ),
+                        time.time() - found[ 'started' ], found[ 'run' ] ) )
+            sys.exit( 0 )
+        with attach( args.topo ) as attached:
+            sys.exit( 1 if attached.reset() else 0 )
+    except ( IOError, ValueError ) as e:
+        error( '%s\n' % e )
+        sys.exit( 1 )
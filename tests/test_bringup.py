@@ -0,0 +1,47 @@
+"""
+Parallel bring-up scheduling: link rounds keep every node in one link
+per round and each node's links in spec order, and the next host and
+switch get the parameters Mininet would give them.
+"""
+
+from mntopo.bringup import hostDefaults, linkRounds, switchDefaults
+from mntopo.dryrun import DryRunNet
+from mntopo.spec import loadSpec
+
+
+def checkRounds( pairs ):
+    rounds = linkRounds( pairs )
+    assert sorted( sum( rounds, [] ) ) == list( range( len( pairs ) ) )
+    for indices in rounds:
+        nodes = [ node for index in indices for node in pairs[ index ] ]
+        assert len( nodes ) == len( set( nodes ) )
+    # Each node's links come in spec order
+    roundOf = dict( ( index, number ) for number, indices
+                    in enumerate( rounds ) for index in indices )
+    last = {}
+    for index, pair in enumerate( pairs ):
+        for node in pair:
+            assert roundOf[ index ] > last.get( node, -1 )
+            last[ node ] = roundOf[ index ]
+    return rounds
+
+def testLinkRounds():
+    rounds = checkRounds( [ ( 's1', 's2' ), ( 's1', 's3' ), ( 's4', 'h1' ),
+                            ( 's2', 's3' ), ( 's1', 'h2' ) ] )
+    assert rounds == [ [ 0, 2 ], [ 1 ], [ 3, 4 ] ]
+
+def testLinkRoundsOfShippedSpecs():
+    for name in 'minicurcle', 'curcle', '2tree', 'nttutree':
+        pairs = loadSpec( name ).linkPairs()
+        rounds = checkRounds( pairs )
+        assert len( rounds ) < len( pairs )
+
+def testDefaults():
+    net = DryRunNet( listenPort=6633, autoSetMacs=True )
+    assert hostDefaults( net, {} ) == { 'ip': '10.0.0.1/8',
+                                        'mac': '00:00:00:00:00:01' }
+    assert hostDefaults( net, { 'ip': '10.0.0.9' } ) == {
+        'ip': '10.0.0.9', 'mac': '00:00:00:00:00:02' }
+    assert switchDefaults( net, {} ) == { 'listenPort': 6633,
+                                          'inNamespace': False }
+    assert switchDefaults( net, {} )[ 'listenPort' ] == 6634
@@ -0,0 +1,31 @@
+"""
+The campus tree generator: its defaults are the NTTU tree, and other
+fanouts and host counts lay out the tiers the same way.
+"""
+
+from mntopo.campus import campusSpec, parsePattern
+from mntopo.spec import loadSpec
+
+
+def testDefaultsAreNTTUTree():
+    campus, nttu = campusSpec(), loadSpec( 'nttutree' )
+    assert campus.switchNames() == nttu.switchNames()
+    assert campus.hostNames() == nttu.hostNames()
+    assert campus.linkPairs() == nttu.linkPairs()
+    assert ( [ controller[ :2 ] for controller in campus.controllers ] ==
+             [ controller[ :2 ] for controller in nttu.controllers ] )
+
+def testPatternsCycle():
+    spec = campusSpec( [ 2, ( 1, 2 ) ], [ 0, 0, ( 1, 2 ) ],
+                       controller=None )
+    assert spec.switchNames() == [ 's1', 's2', 's3', 's4', 's5', 's6' ]
+    # Leaves s4, s5, s6 get 1, 2, 1 hosts
+    assert spec.linkPairs() == [
+        ( 's1', 's2' ), ( 's1', 's3' ), ( 's2', 's4' ), ( 's3', 's5' ),
+        ( 's3', 's6' ), ( 's4', 'h1' ), ( 's5', 'h2' ), ( 's5', 'h3' ),
+        ( 's6', 'h4' ) ]
+    assert spec.controllers == []
+
+def testParsePattern():
+    assert parsePattern( '3,7' ) == ( 3, 7 )
+    assert parsePattern( '4' ) == ( 4, )
@@ -0,0 +1,136 @@
+"""
+Fault timelines: parsing probes and events with their defaults and
+errors, and the ip and tc batch lines each step of a timeline writes.
+"""
+
+import pytest
+
+from mntopo.dryrun import DryRunNet
+from mntopo.faults import ( SETTLE, Event, formatEvent, parseTime,
+                            parseTimeline, planSteps )
+from mntopo.spec import SpecError, buildNet, parseSpec
+
+
+SPEC = """
+switch s1 s2
+host h1 h2
+s1 -> s2
+s1 -> h1
+s2 -> h2
+"""
+
+
+def testParseTime():
+    assert parseTime( '2.5' ) == parseTime( '2500ms' ) == parseTime( '2.5s' )
+    for text in '-1', '2m', '':
+        with pytest.raises( SpecError ):
+            parseTime( text )
+
+def testParseTimeline():
+    timeline = parseTimeline( [
+        '# ring failure',
+        'probe h1 h2 -> h2 h3',
+        'probe h1 -> h2    # again',
+        '4 up s1 s2',
+        '2 down s1,s2',
+        '6 loss s1 h1 12.5',
+        '6 stop s2' ] )
+    assert timeline.pairs == [ ( 'h1', 'h2' ), ( 'h1', 'h3' ),
+                               ( 'h2', 'h3' ) ]
+    assert timeline.interval == 10.0
+    assert timeline.events == [
+        Event( 2.0, 'down', [ 's1', 's2' ], None ),
+        Event( 4.0, 'up', [ 's1', 's2' ], None ),
+        Event( 6.0, 'loss', [ 's1', 'h1' ], 12.5 ),
+        Event( 6.0, 'stop', [ 's2' ], None ) ]
+    assert timeline.end == 6.0 + SETTLE
+    assert formatEvent( timeline.events[ 2 ] ) == 'loss s1 h1 12.5'
+    timeline = parseTimeline( [ 'probe h1 -> h2', 'interval 0.5s',
+                                '1 stop s1', 'end 5' ] )
+    assert ( timeline.interval, timeline.end ) == ( 500.0, 5.0 )
+    assert parseTimeline( [ 'probe h1 -> h2', 'interval 2.5',
+                            '1 stop s1' ] ).interval == 2.5
+
+@pytest.mark.parametrize( 'line, message', [
+    ( 'probe h1 h2', 'expected: probe NODES -> NODES' ),
+    ( 'probe h1 -> h2 rate=1', 'expected: probe NODES -> NODES' ),
+    ( '1 fail s1', 'expected: TIME down|loss|start|stop|up ...' ),
+    ( '1 down s1', 'expected: TIME down NODE NODE' ),
+    ( '1 loss s1 s2', 'expected: TIME loss NODE NODE PERCENT' ),
+    ( '1 loss s1 s2 200', 'loss 200 out of range' ),
+    ( 'interval 0', 'interval must be positive' ),
+    ( 'end', 'expected: end TIME' ) ] )
+def testParseTimelineErrors( line, message ):
+    with pytest.raises( SpecError ) as e:
+        parseTimeline( [ 'probe h1 -> h2', line, '9 stop s1' ], 'ring' )
+    assert str( e.value ) == 'ring:2: %s' % message
+
+def testIncompleteTimeline():
+    for lines in [ 'probe h1 -> h2' ], [ '1 stop s1' ]:
+        with pytest.raises( SpecError ) as e:
+            parseTimeline( lines, 'ring' )
+        assert 'needs probe pairs and events' in str( e.value )
+    with pytest.raises( SpecError ) as e:
+        parseTimeline( [ 'probe h1 -> h2', '5 stop s1', 'end 5' ], 'ring' )
+    assert str( e.value ) == 'ring: end is not after the last event'
+
+def steps( lines, shapes=None, qdiscs=None ):
+    "Return planSteps() of a timeline for a dry-run network of SPEC"
+    net = buildNet( parseSpec( SPEC.splitlines() ), net=DryRunNet() )
+    timeline = parseTimeline( [ 'probe h1 -> h2' ] + lines )
+    plan, nodes = planSteps( net, timeline, shapes, qdiscs )
+    return [ ( when, dict( batches ) ) for when, _events, batches
+             in plan ], dict( ( key, node.name )
+                              for key, node in nodes.items() )
+
+def testDownUp():
+    "Links go down at their ends in the root namespace"
+    plan, nodes = steps( [ '1 down s1 s2', '1 down h2 s2', '2 up s2 h2' ] )
+    assert plan == [
+        ( 1.0, { ( 'ip', None ): [ 'link set dev s1-eth1 down',
+                                   'link set dev s2-eth1 down',
+                                   'link set dev s2-eth2 down' ] } ),
+        ( 2.0, { ( 'ip', None ): [ 'link set dev s2-eth2 up' ] } ) ]
+    assert nodes == { ( 'ip', None ): 's1' }
+
+def testStopStart():
+    plan, _nodes = steps( [ '1 stop s1', '2 start s1' ] )
+    assert plan == [
+        ( 1.0, { ( 'ip', None ): [ 'link set dev s1-eth1 down',
+                                   'link set dev s1-eth2 down' ] } ),
+        ( 2.0, { ( 'ip', None ): [ 'link set dev s1-eth1 up',
+                                   'link set dev s1-eth2 up' ] } ) ]
+
+def testLoss():
+    "Loss replaces the qdiscs in place, on top of the link's shaping"
+    shapes = { 's1-eth2': { 'bw': 10.0 }, 'h1-eth0': { 'bw': 10.0 } }
+    plan, nodes = steps( [ '1 loss s1 h1 5', '2 loss h1 s1 0' ], shapes )
+    assert plan[ 0 ][ 1 ][ ( 'tc', None ) ][ :2 ] == [
+        'qdisc del dev s1-eth2 root',
+        'qdisc add dev s1-eth2 root handle 5: htb default 1' ]
+    assert plan[ 0 ][ 1 ][ ( 'tc', 'h1' ) ][ -1 ] == (
+        'qdisc add dev h1-eth0 parent 5:1 handle 10: netem loss 5%' )
+    assert plan[ 1 ][ 1 ][ ( 'tc', 'h1' ) ] == [
+        'qdisc del dev h1-eth0 root',
+        'qdisc add dev h1-eth0 root handle 5: htb default 1',
+        'class add dev h1-eth0 parent 5: classid 5:1 htb rate 10mbit '
+        'burst 15k' ]
+    assert nodes == { ( 'tc', None ): 's1', ( 'tc', 'h1' ): 'h1' }
+
+def testLossQdiscs():
+    "Only interfaces that have a root qdisc get it deleted first"
+    plan, _nodes = steps( [ '1 loss s1 s2 5', '2 loss s1 s2 0' ],
+                          qdiscs=[ 's2-eth1' ] )
+    assert plan == [
+        ( 1.0, { ( 'tc', None ): [
+            'qdisc add dev s1-eth1 root handle 10: netem loss 5%',
+            'qdisc del dev s2-eth1 root',
+            'qdisc add dev s2-eth1 root handle 10: netem loss 5%' ] } ),
+        ( 2.0, { ( 'tc', None ): [ 'qdisc del dev s1-eth1 root',
+                                   'qdisc del dev s2-eth1 root' ] } ) ]
+
+@pytest.mark.parametrize( 'line', [ '1 stop h1', '1 stop s9',
+                                    '1 down h1 h2' ] )
+def testUnknownNodes( line ):
+    with pytest.raises( SpecError ):
+        steps( [ line ] )
@@ -0,0 +1,125 @@
+"""
+Proactive flows: shortest-path ports, the flow tables compiled from
+them, which switches a push touches, and the spanning tree that
+broadcast and multicast frames are kept on.
+"""
+
+from mntopo.dryrun import DryRunNet
+from mntopo.flows import ( COOKIE, GATEWAY_PRIORITY, HOST_PRIORITY,
+                           MULTICAST, SUBNET_PRIORITY, TREE_PRIORITY,
+                           compileFlows, pushFlows, treeFlows, treeRoot )
+from mntopo.graph import TopoGraph
+
+
+def ring():
+    """Return s1 - s2 - s3 - s4 - s1 with h1 on s1, h3 on s3 and the
+       gateway root on s2; switch ports 1 and 2 face the ring"""
+    net = DryRunNet()
+    switches = [ net.addSwitch( 's%d' % i ) for i in range( 1, 5 ) ]
+    for i, switch in enumerate( switches ):
+        net.addLink( switch, switches[ ( i + 1 ) % 4 ], port1=2, port2=1 )
+    net.addLink( net.addHost( 'h1', ip='10.0.0.1' ), 's1', port2=3 )
+    net.addLink( net.addHost( 'h3', ip='10.0.0.3' ), 's3', port2=3 )
+    root = net.rootNode()
+    root.params[ 'ip' ] = '10.254/8'
+    net.addLink( root, 's2', port2=3 )
+    return net, TopoGraph.fromNet( net, extra=[ root ] )
+
+def testFromNet():
+    _net, graph = ring()
+    assert graph.switches == [ 's1', 's2', 's3', 's4' ]
+    assert graph.hosts == { 'h1': '10.0.0.1', 'h3': '10.0.0.3',
+                            'root': '10.0.0.254' }
+    assert len( graph.links() ) == 7
+    assert graph.attachment( 'root' ) == ( 's2', 3 )
+
+def testPortsToward():
+    _net, graph = ring()
+    assert graph.portsToward( 's1' ) == { 's1': None, 's2': 1, 's4': 2,
+                                          's3': 1 }
+    assert graph.portsToward( 's3' )[ 's1' ] == 2
+
+def testCompileFlows():
+    _net, graph = ring()
+    flows = compileFlows( graph )
+    assert flows[ 's1' ][ :2 ] == [
+        'cookie=%#x,priority=%d,ip,nw_dst=10.0.0.1,actions=output:3' %
+        ( COOKIE, HOST_PRIORITY ),
+        'cookie=%#x,priority=%d,arp,arp_tpa=10.0.0.1,actions=output:3' %
+        ( COOKIE, HOST_PRIORITY ) ]
+    assert 'arp,arp_tpa=10.0.0.3,actions=output:2' in flows[ 's2' ][ 3 ]
+    # Only the gateway adds a default route, below the subnet's flow to
+    # the controller, so in-subnet addresses never leave for the gateway
+    for switch, port in [ ( 's1', 2 ), ( 's2', 3 ), ( 's3', 1 ),
+                          ( 's4', 2 ) ]:
+        assert len( flows[ switch ] ) == 8
+        assert flows[ switch ][ -2: ] == [
+            'cookie=%#x,priority=%d,ip,nw_dst=10.0.0.0/8,'
+            'actions=CONTROLLER' % ( COOKIE, SUBNET_PRIORITY ),
+            'cookie=%#x,priority=%d,ip,actions=output:%d' %
+            ( COOKIE, GATEWAY_PRIORITY, port ) ]
+    assert SUBNET_PRIORITY > GATEWAY_PRIORITY
+    assert all( len( lines ) == 6 for lines in
+                compileFlows( graph, gateway=None ).values() )
+    assert '192.168.0.0/16' in compileFlows(
+        graph, subnet='192.168/16' )[ 's1' ][ -2 ]
+
+def testPushFlows():
+    net, graph = ring()
+    flows = compileFlows( graph )
+    flows[ 's4' ] = []
+    assert pushFlows( net, flows ) == {}
+    first = [ op for op in net.log if op.kind == 'ovs' ]
+    assert [ op.node for op in first ] == [ 's1', 's2', 's3' ]
+    assert all( 'add-flows' in op.cmd for op in first )
+    assert net.flowSwitches == set( [ 's1', 's2', 's3' ] )
+    # Replacing deletes only where our flows were, and skips switches
+    # that neither had nor get any
+    flows = dict( ( name, [] ) for name in flows )
+    flows[ 's4' ] = compileFlows( graph )[ 's4' ]
+    pushFlows( net, flows )
+    second = [ op for op in net.log if op.kind == 'ovs' ][ 3: ]
+    assert [ op.node for op in second ] == [ 's1', 's2', 's3', 's4' ]
+    assert all( 'del-flows' in op.cmd for op in second[ :3 ] )
+    assert 'add-flows' in second[ 3 ].cmd
+    assert net.flowSwitches == set( [ 's4' ] )
+
+def testSpanningTree():
+    _net, graph = ring()
+    assert graph.spanningTree( 's2' ) == set( [
+        ( 's2', 1 ), ( 's1', 2 ), ( 's2', 2 ), ( 's3', 1 ), ( 's1', 1 ),
+        ( 's4', 2 ) ] )
+    assert graph.offTreePorts( 's2' ) == { 's3': [ 2 ], 's4': [ 1 ] }
+    assert graph.offTreePorts( 's4' ) == { 's1': [ 2 ], 's2': [ 1 ] }
+    assert graph.offTreePorts() == graph.offTreePorts( 's1' )
+
+def testOffTreePorts():
+    graph = TopoGraph()
+    for switch in 's1', 's2', 's3', 's4':
+        graph.addSwitch( switch )
+    graph.addHost( 'h1' )
+    graph.addLink( 'h1', 0, 's1', 1 )
+    graph.addLink( 's1', 2, 's2', 1 )
+    assert graph.offTreePorts() == {}
+    # Parallel links and loops in a second, unconnected part
+    graph.addLink( 's1', 3, 's2', 2 )
+    graph.addLink( 's3', 1, 's4', 1 )
+    graph.addLink( 's4', 2, 's3', 2 )
+    graph.addLink( 's3', 3, 's3', 4 )
+    assert graph.offTreePorts() == { 's1': [ 3 ], 's2': [ 2 ],
+                                     's3': [ 2, 3, 4 ], 's4': [ 2 ] }
+
+def testTreeFlows():
+    _net, graph = ring()
+    root = treeRoot( graph )
+    assert root == 's2'
+    assert treeRoot( graph, 'h9' ) is None
+    flows = treeFlows( graph, root )
+    assert flows == {
+        's1': [], 's2': [],
+        's3': [ 'cookie=%#x,priority=%d,in_port=2,%s,actions=drop' %
+                ( COOKIE, TREE_PRIORITY, MULTICAST ) ],
+        's4': [ 'cookie=%#x,priority=%d,in_port=1,%s,actions=drop' %
+                ( COOKIE, TREE_PRIORITY, MULTICAST ) ] }
+    # Unicast is left to the shortest paths and the controller
+    assert MULTICAST == 'dl_dst=01:00:00:00:00:00/01:00:00:00:00:00'
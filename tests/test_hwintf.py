@@ -0,0 +1,48 @@
+"""
+Hardware interface maps: parsing 'intf=switch' entries and reporting
+every problem with a map at once.
+"""
+
+import pytest
+
+from mntopo.hwintf import IntfStatus, attachProblems, loadAttach, parseAttach
+
+
+def testParseAttach():
+    assert parseAttach( 'eth1=s8,eth2=s15' ) == [ ( 'eth1', 's8' ),
+                                                  ( 'eth2', 's15' ) ]
+    text = '# uplinks\neth1=s8  eth2=s15, # the lab\n\n  eth3=s1\n'
+    assert parseAttach( text ) == [ ( 'eth1', 's8' ), ( 'eth2', 's15' ),
+                                    ( 'eth3', 's1' ) ]
+    assert parseAttach( '' ) == []
+
+@pytest.mark.parametrize( 'text', [ 'eth1', 'eth1=', '=s1', 'eth1=s1,s2' ] )
+def testParseAttachErrors( text ):
+    with pytest.raises( ValueError ):
+        parseAttach( text )
+
+def testLoadAttach( tmp_path ):
+    path = tmp_path / 'intfs'
+    path.write_text( 'eth1=s8\neth2=s15 # spare\n' )
+    assert loadAttach( str( path ) ) == [ ( 'eth1', 's8' ),
+                                          ( 'eth2', 's15' ) ]
+
+def testAttachProblems():
+    intfs = [ ( 'eth1', 's1' ), ( 'eth2', 's9' ), ( 'eth1', 's2' ) ]
+    assert attachProblems( intfs, [ 's1', 's2' ], check=False ) == [
+        'Error: eth2 is mapped to unknown switch s9',
+        'Error: eth1 is mapped more than once' ]
+    assert attachProblems( intfs[ :1 ], [ 's1' ], check=False ) == []
+
+def testAttachProblemsCheck():
+    "Missing interfaces are reported once, after the map's problems"
+    intfs = [ ( 'mntopo-none', 's1' ), ( 'mntopo-none', 's1' ) ]
+    assert attachProblems( intfs, [ 's1' ] ) == [
+        'Error: mntopo-none is mapped more than once',
+        'Error: mntopo-none does not exist' ]
+
+def testIntfStatus():
+    assert IntfStatus( 'eth1', True, [] ).problem() is None
+    assert IntfStatus( 'eth1', False, [] ).problem() == 'does not exist'
+    assert '10.0.0.1/8' in IntfStatus( 'eth1', True,
+                                       [ '10.0.0.1/8' ] ).problem()
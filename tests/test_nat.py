@@ -0,0 +1,92 @@
+"""
+NAT rules: what startNAT() loads for an empty, current or stale ruleset,
+and that loading it once leaves nothing to load the next time.
+"""
+
+import subprocess
+
+from mntopo.nat import ( FORWARD_CHAIN, NAT_CHAIN, natRules, parseSaved,
+                         restoreCmd, rulesToLoad )
+
+
+HOST = """# Generated by iptables-save
+*filter
+:INPUT ACCEPT [0:0]
+:FORWARD DROP [0:0]
+:OUTPUT ACCEPT [0:0]
+-A FORWARD -i docker0 -j ACCEPT
+COMMIT
+*nat
+:PREROUTING ACCEPT [0:0]
+:POSTROUTING ACCEPT [0:0]
+COMMIT
+"""
+
+def restored( text, load ):
+    "Return iptables-save text after loading load with --noflush"
+    tables = parseSaved( text )
+    for table, lines in load.items():
+        rules = tables.setdefault( table, [] )
+        for line in lines:
+            if line.startswith( ':' ):
+                # Declaring a chain creates or flushes it
+                chain = line.split()[ 0 ][ 1: ]
+                rules[:] = [ rule for rule in rules
+                             if not rule.startswith( '-A %s ' % chain ) ]
+                if not any( rule.startswith( ':%s ' % chain )
+                            for rule in rules ):
+                    rules.insert( 0, line )
+            elif line.startswith( '-I ' ):
+                rules.insert( 0, '-A' + line[ 2: ].replace( ' 1 ', ' ' ) )
+            else:
+                rules.append( line )
+    return ''.join( '*%s\n%s\nCOMMIT\n' % ( table, '\n'.join( rules ) )
+                    for table, rules in tables.items() )
+
+def testNatRules():
+    rules = natRules( 'root-eth0', 'eth0', '10.0/8' )
+    assert rules[ 'filter' ] == [
+        '-A MNTOPO-FORWARD -d 10.0.0.0/8 -i root-eth0 -j DROP',
+        '-A MNTOPO-FORWARD -s 10.0.0.0/8 -i root-eth0 -j ACCEPT',
+        '-A MNTOPO-FORWARD -d 10.0.0.0/8 -i eth0 -j ACCEPT' ]
+    assert rules[ 'nat' ] == [ '-A MNTOPO-POSTROUTING -o eth0 -j MASQUERADE' ]
+
+def testParseSaved():
+    tables = parseSaved( HOST )
+    assert sorted( tables ) == [ 'filter', 'nat' ]
+    assert tables[ 'filter' ][ -1 ] == '-A FORWARD -i docker0 -j ACCEPT'
+    assert all( not line.startswith( ( '#', 'COMMIT' ) )
+                for rules in tables.values() for line in rules )
+
+def testLoadOnce():
+    wanted = natRules( 'root-eth0', 'eth0', '10.0/8' )
+    load = rulesToLoad( parseSaved( HOST ), wanted )
+    assert load[ 'filter' ] == ( [ ':%s - [0:0]' % FORWARD_CHAIN ] +
+                                 wanted[ 'filter' ] +
+                                 [ '-I FORWARD 1 -j %s' % FORWARD_CHAIN ] )
+    assert load[ 'nat' ][ -1 ] == '-I POSTROUTING 1 -j %s' % NAT_CHAIN
+    # Once loaded, the rules are in place and the host's are kept
+    live = restored( HOST, load )
+    assert rulesToLoad( parseSaved( live ), wanted ) == {}
+    assert '-A FORWARD -i docker0 -j ACCEPT' in live
+
+def testReloadStale():
+    live = restored( HOST, rulesToLoad( parseSaved( HOST ),
+                                        natRules( 'root-eth0', 'eth0',
+                                                  '10.0/8' ) ) )
+    wanted = natRules( 'root-eth0', 'wlan0', '10.0/8' )
+    load = rulesToLoad( parseSaved( live ), wanted )
+    # The chains are flushed and refilled, but not hooked in again
+    assert load == { 'filter': [ ':%s - [0:0]' % FORWARD_CHAIN ] +
+                     wanted[ 'filter' ],
+                     'nat': [ ':%s - [0:0]' % NAT_CHAIN ] + wanted[ 'nat' ] }
+    live = restored( live, load )
+    assert rulesToLoad( parseSaved( live ), wanted ) == {}
+    assert live.count( '-j %s' % FORWARD_CHAIN ) == 1
+
+def testRestoreCmd():
+    cmd = restoreCmd( { 'nat': [ '-A X -j MASQUERADE' ], 'filter': [] } )
+    feed, command = cmd.rsplit( ' | ', 1 )
+    assert command == 'iptables-restore --noflush'
+    lines = subprocess.check_output( feed, shell=True ).decode()
+    assert lines.splitlines() == [ '*nat', '-A X -j MASQUERADE', 'COMMIT' ]
@@ -0,0 +1,83 @@
+"""
+Command pipelines: the script a node's shell runs, and the markers that
+split its output into per-command results, run here through bash.
+"""
+
+import subprocess
+
+from mntopo.pipeline import ( MAX_LINE, CmdPipeline, failures,
+                              runPipelines )
+
+
+class ShellNode( object ):
+    "Stands in for a node, running each script with bash"
+
+    def __init__( self ):
+        self.output = None
+        self.scripts = []
+
+    def sendCmd( self, script, printPid=True ):
+        self.scripts.append( script )
+        self.output = subprocess.run(
+            [ 'bash', '-c', script ], stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT ).stdout.decode()
+
+    def waitOutput( self ):
+        return self.output
+
+
+def testResults():
+    results = CmdPipeline( ShellNode() ).add( 'echo', 'one' ).add(
+        'echo two >&2; false' ).add( 'printf x' ).run()
+    assert [ result.cmd for result in results ] == [
+        'echo one', 'echo two >&2; false', 'printf x' ]
+    assert [ result.status for result in results ] == [ 0, 1, 0 ]
+    assert [ result.output for result in results ] == [
+        'one\n', 'two\n', 'x' ]
+    assert failures( results ) == [ results[ 1 ] ]
+
+def testBackground():
+    results = CmdPipeline( ShellNode() ).add( 'true &' ).add(
+        'echo done' ).run()
+    assert [ result.status for result in results ] == [ 0, 0 ]
+    assert results[ 1 ].output == 'done\n'
+
+def testShellExit():
+    "Commands after one that ends the shell get no status"
+    results = CmdPipeline( ShellNode() ).add( 'echo bye' ).add(
+        'echo last; exit 3' ).add( 'echo never' ).run()
+    assert results[ 0 ] == ( 'echo bye', 0, 'bye\n' )
+    assert results[ 1 ].status is None
+    assert results[ 1 ].output == 'last\n'
+    assert results[ 2 ] == ( 'echo never', None, '' )
+
+def testMarkerInOutput():
+    "Another pipeline's marker in the output isn't taken for ours"
+    other = CmdPipeline( None )
+    results = CmdPipeline( ShellNode() ).add(
+        "printf '\\n%s 0 1\\n'" % other.marker ).run()
+    assert results[ 0 ].status == 0
+    assert other.marker in results[ 0 ].output
+
+def testLongScript():
+    node = ShellNode()
+    pipeline = CmdPipeline( node )
+    for index in range( MAX_LINE // 10 ):
+        pipeline.add( 'echo', index )
+    results = pipeline.run()
+    assert len( node.scripts[ 0 ] ) < MAX_LINE
+    assert node.scripts[ 0 ].startswith( '. ' )
+    assert [ result.output for result in results ] == [
+        '%d\n' % index for index in range( MAX_LINE // 10 ) ]
+    assert pipeline.scriptFile is None
+
+def testRunPipelines():
+    nodes = [ ShellNode(), ShellNode() ]
+    pipelines = [ CmdPipeline( nodes[ 0 ] ).add( 'echo a' ),
+                  CmdPipeline( nodes[ 1 ] ) ]
+    sent = []
+    results = runPipelines( pipelines, sent=lambda: sent.append(
+        len( nodes[ 0 ].scripts ) ) )
+    assert sent == [ 1 ]
+    assert results == [ [ ( 'echo a', 0, 'a\n' ) ], [] ]
+    assert nodes[ 1 ].scripts == []
@@ -0,0 +1,87 @@
+"""
+Live reconfiguration: the hosts and links a target spec adds to or
+deletes from a running network, and the shaping of the links it keeps.
+"""
+
+import pytest
+
+from mntopo.dryrun import DryRunNet
+from mntopo.reconfig import diffTopo, linkKey, linkParams, reshapePorts
+from mntopo.spec import SpecError, buildNet, parseSpec
+
+
+BASE = """
+switch s1..s3
+host h1 h2
+s1 -> s2 s3
+s2 -> h1
+s3 -> h2
+"""
+
+
+def running():
+    "Return a dry-run network of BASE with a gateway linked to s1"
+    net = buildNet( parseSpec( BASE.splitlines() ), net=DryRunNet() )
+    net.addLink( net.rootNode(), net.get( 's1' ) )
+    return net
+
+def testLinkKey():
+    assert linkKey( 's2', 's1' ) == linkKey( 's1', 's2' ) == ( 's1', 's2' )
+
+def testNoChange():
+    diff = diffTopo( running(), parseSpec( BASE.splitlines() ) )
+    assert len( diff ) == 0
+    assert str( diff ) == '+0/-0 hosts, +0/-0 links'
+
+def testDiffTopo():
+    net = running()
+    spec = parseSpec( [ 'switch s1..s3', 'host h1 h3',
+                        # Reversed, and a redundant uplink twice
+                        's3 -> s1', 's1 -> s2', 's2 -> s3', 's3 -> s2',
+                        's2 -> h1 h3' ] )
+    diff = diffTopo( net, spec )
+    assert diff.addHosts == [ ( 'h3', {} ) ]
+    assert [ host.name for host in diff.delHosts ] == [ 'h2' ]
+    assert diff.addLinks == [ 2, 3, 5 ]
+    # The gateway's link is left alone
+    assert [ ( link.intf1.node.name, link.intf2.node.name )
+             for link in diff.delLinks ] == [ ( 's3', 'h2' ) ]
+    assert str( diff ) == '+1/-1 hosts, +3/-1 links'
+
+def testDropParallelLink():
+    net = running()
+    net.addLink( 's1', 's2' )
+    diff = diffTopo( net, parseSpec( BASE.splitlines() ) )
+    assert diff.addLinks == []
+    assert diff.delLinks == [ net.links[ -1 ] ]
+
+def testSwitchesDiffer():
+    with pytest.raises( SpecError ):
+        diffTopo( running(), parseSpec( [ 'switch s1 s2', 'host h1',
+                                          's1 -> s2', 's2 -> h1' ] ) )
+
+def testLinkParams():
+    net = running()
+    spec = parseSpec( [ 'switch s1..s3', 'host h1',
+                        's3 -> s1 delay=2', 's2 -> s1 bw=10',
+                        's2 -> h1', 's1 -> s2 bw=20' ] )
+    params = linkParams( net, spec, { 'access': { 'loss': 1 } } )
+    assert [ ( link.intf1.name, shape ) for link, shape in params ] == [
+        ( 's1-eth1', { 'bw': 10.0 } ), ( 's1-eth2', { 'delay': '2ms' } ),
+        ( 's2-eth2', { 'loss': 1 } ) ]
+
+def testReshapePorts():
+    "The dry run's tc qdisc show lists no qdiscs, so all ports lost them"
+    net = running()
+    spec = parseSpec( BASE.splitlines() )
+    # Without shaping there is nothing to check
+    assert reshapePorts( net, spec ) == {}
+    assert not [ op for op in net.log if 'tc ' in op.cmd ]
+    assert reshapePorts( net, spec, { 'uplink': { 'bw': 100 } } ) == {}
+    tc = [ op for op in net.log if 'tc ' in op.cmd ]
+    assert [ ( op.node, op.kind ) for op in tc ] == [ ( 's1', 'other' ),
+                                                      ( 's1', 'tc' ) ]
+    assert tc[ 0 ].cmd == 'tc qdisc show'
+    for port in 's1-eth1', 's1-eth2', 's2-eth1', 's3-eth1':
+        assert 'dev %s root handle 5:' % port in tc[ 1 ].cmd
+    assert 's2-eth2' not in tc[ 1 ].cmd
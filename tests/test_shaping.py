@@ -0,0 +1,112 @@
+"""
+Link shaping: parameter checks, per-tier options, the tc -batch lines
+of each link and finding switch ports whose qdiscs OVS cleared.
+"""
+
+import pytest
+
+from mntopo.dryrun import DryRunNet
+from mntopo.shaping import ( checkShape, checkShapes, intfShapes,
+                             linkShapes, lostShapes, namespaceBatches,
+                             parseTier, rootQdiscs, shapeBatch )
+from mntopo.spec import SpecError, buildNet, parseSpec
+
+
+SPEC = """
+switch s1 s2
+host h1 h2
+s1 -> s2 delay=5
+s1 -> h1 loss=1
+s2 -> h2
+"""
+
+# tc qdisc show of s1-eth1 shaped, s1-eth2 cleared by OVS and s2-eth1
+# given another qdisc
+QDISCS = """qdisc noqueue 0: dev lo root refcnt 2
+qdisc htb 5: dev s1-eth1 root refcnt 2 r2q 10 default 0x1
+qdisc netem 10: dev s1-eth1 parent 5:1 limit 1000 delay 5ms
+qdisc noqueue 0: dev s1-eth2 root refcnt 2
+qdisc fq_codel 8001: dev s2-eth1 root refcnt 2 limit 10240p
+"""
+
+
+def testCheckShape():
+    assert checkShape( { 'bw': '100', 'delay': '1', 'jitter': '500us',
+                         'loss': 0, 'max_queue_size': '50' } ) == {
+        'bw': 100.0, 'delay': '1ms', 'jitter': '500us', 'loss': 0.0,
+        'max_queue_size': 50 }
+
+@pytest.mark.parametrize( 'params, message', [
+    ( { 'speed': 1 }, 'unknown link parameter speed' ),
+    ( { 'delay': '1h' }, 'bad delay 1h' ),
+    ( { 'bw': 'fast' }, 'bad bw fast' ),
+    ( { 'bw': 0 }, 'bw 0 out of range' ),
+    ( { 'loss': 101 }, 'loss 101 out of range' ),
+    ( { 'max_queue_size': '1.5' }, 'bad max_queue_size 1.5' ) ] )
+def testCheckShapeErrors( params, message ):
+    with pytest.raises( ValueError ) as e:
+        checkShape( params )
+    assert str( e.value ) == message
+
+def testParseTier():
+    assert parseTier( 'uplink:bw=1000,delay=1' ) == (
+        'uplink', { 'bw': 1000.0, 'delay': '1ms' } )
+    for text in 'core:bw=1', 'access', 'access:', 'access:bw':
+        with pytest.raises( ValueError ):
+            parseTier( text )
+
+def testShapeBatch():
+    assert shapeBatch( 'e', {} ) == []
+    assert shapeBatch( 'e', { 'bw': 10.0 } ) == [
+        'qdisc add dev e root handle 5: htb default 1',
+        'class add dev e parent 5: classid 5:1 htb rate 10mbit burst 15k' ]
+    assert shapeBatch( 'e', { 'bw': 1000.0, 'delay': '1ms',
+                              'jitter': '100us', 'loss': 0.5,
+                              'max_queue_size': 100 } )[ 2: ] == [
+        'qdisc add dev e parent 5:1 handle 10: netem delay 1ms 100us '
+        'loss 0.5% limit 100' ]
+    assert shapeBatch( 'e', { 'jitter': '1ms' } ) == [
+        'qdisc add dev e root handle 10: netem delay 0ms 1ms' ]
+
+def testLinkShapes():
+    spec = parseSpec( SPEC.splitlines() )
+    tiers = { 'uplink': { 'bw': 1000.0 }, 'access': { 'bw': 100.0 } }
+    assert linkShapes( spec, tiers ) == [
+        { 'bw': 1000.0, 'delay': '5ms' }, { 'bw': 100.0, 'loss': 1.0 },
+        { 'bw': 100.0 } ]
+    assert linkShapes( spec )[ 2 ] == {}
+    with pytest.raises( SpecError ) as e:
+        linkShapes( parseSpec( [ 'switch s1', 'host h1',
+                                 's1 -> h1 loss=-1' ] ) )
+    assert str( e.value ) == 'link s1 -> h1: loss -1 out of range'
+
+def testNamespaceBatches():
+    net = buildNet( parseSpec( SPEC.splitlines() ), net=DryRunNet() )
+    intfLines = intfShapes( net, parseSpec( SPEC.splitlines() ) )
+    assert [ intf.name for intf, _lines in intfLines ] == [
+        's1-eth1', 's2-eth1', 's1-eth2', 'h1-eth0' ]
+    batches = namespaceBatches( intfLines )
+    # Switch ports share one batch in the root namespace
+    assert [ ( node.name, len( lines ) ) for node, lines in batches ] == [
+        ( 's1', 3 ), ( 'h1', 1 ) ]
+
+def testLostShapes():
+    net = buildNet( parseSpec( SPEC.splitlines() ), net=DryRunNet() )
+    intfLines = intfShapes( net, parseSpec( SPEC.splitlines() ),
+                            { 'uplink': { 'bw': 10 } } )
+    assert rootQdiscs( QDISCS ) == { 'lo': '0:', 's1-eth1': '5:',
+                                     's1-eth2': '0:', 's2-eth1': '8001:' }
+    lost = dict( ( intf.name, lines ) for intf, lines
+                 in lostShapes( QDISCS, intfLines ) )
+    assert sorted( lost ) == [ 'h1-eth0', 's1-eth2', 's2-eth1' ]
+    assert lost[ 's2-eth1' ][ 0 ] == 'qdisc del dev s2-eth1 root'
+    assert lost[ 's1-eth2' ] == [
+        'qdisc add dev s1-eth2 root handle 10: netem loss 1%' ]
+
+def testCheckShapes():
+    "The dry run's tc qdisc show lists no qdiscs, so all ports lost them"
+    spec = parseSpec( SPEC.splitlines() )
+    net = buildNet( spec, net=DryRunNet() )
+    assert checkShapes( net, spec ) == [ 's1-eth1', 's1-eth2', 's2-eth1' ]
+    plain = parseSpec( [ 'switch s1', 'host h1', 's1 -> h1' ] )
+    assert checkShapes( buildNet( plain, net=DryRunNet() ), plain ) == []
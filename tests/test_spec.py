@@ -0,0 +1,363 @@
+"""
+The shipped specs against the topologies of the original Net-to-*.py
+scripts: the same switches, hosts (with their fixed IPs) and links, in
+the same order, since the order sets IPs and port numbers.
+"""
+
+import pytest
+
+from mntopo.spec import loadSpec
+
+
+# Taken from the addSwitch, addHost and addLink calls of the scripts
+BASELINE = {
+    '2tree': {
+        'switches': [
+            's1', 's2', 's3', 's4', 's5', 's6', 's7', 's8', 's9', 's10',
+            's11', 's12', 's13', 's14', 's15' ],
+        'hosts': [
+            ( 'h2', '10.0.0.2' ), ( 'h3', '10.0.0.3' ), ( 'h4', '10.0.0.4' ),
+            ( 'h6', '10.0.0.6' ), ( 'h7', '10.0.0.7' ), ( 'h8', '10.0.0.8' ),
+            ( 'h9', '10.0.0.9' ), ( 'h10', '10.0.0.10' ),
+            ( 'h11', '10.0.0.11' ), ( 'h13', '10.0.0.13' ),
+            ( 'h14', '10.0.0.14' ), ( 'h15', '10.0.0.15' ) ],
+        'links': [
+            ( 's1', 's2' ), ( 's1', 's3' ), ( 's2', 's4' ), ( 's2', 's5' ),
+            ( 's3', 's6' ), ( 's3', 's7' ), ( 's4', 's8' ), ( 's4', 's9' ),
+            ( 's5', 's10' ), ( 's5', 's11' ), ( 's6', 's12' ),
+            ( 's6', 's13' ), ( 's7', 's14' ), ( 's7', 's15' ),
+            ( 's8', 'h2' ), ( 's9', 'h3' ), ( 's9', 'h4' ), ( 's10', 'h6' ),
+            ( 's11', 'h7' ), ( 's11', 'h8' ), ( 's12', 'h9' ),
+            ( 's12', 'h10' ), ( 's13', 'h11' ), ( 's14', 'h13' ),
+            ( 's14', 'h14' ), ( 's15', 'h15' ) ] },
+    'curcle': {
+        'switches': [
+            's1', 's2', 's3', 's4', 's5', 's6', 's7', 's8', 's9', 's10',
+            's11', 's12', 's13', 's14', 's15', 's16', 's17', 's18', 's19',
+            's20', 's21', 's22', 's23', 's24', 's25', 's26', 's27', 's28',
+            's29', 's30', 's31', 's32', 's33', 's34', 's35', 's36', 's37',
+            's38', 's39', 's40', 's41' ],
+        'hosts': [
+            ( 'h1', None ), ( 'h2', None ), ( 'h3', None ), ( 'h4', None ),
+            ( 'h5', None ), ( 'h6', None ), ( 'h7', None ), ( 'h8', None ),
+            ( 'h9', None ), ( 'h10', None ), ( 'h11', None ),
+            ( 'h12', None ), ( 'h13', None ), ( 'h14', None ),
+            ( 'h15', None ), ( 'h16', None ), ( 'h17', None ),
+            ( 'h18', None ), ( 'h19', None ), ( 'h20', None ),
+            ( 'h21', None ), ( 'h22', None ), ( 'h23', None ),
+            ( 'h24', None ), ( 'h25', None ), ( 'h26', None ),
+            ( 'h27', None ), ( 'h28', None ), ( 'h29', None ),
+            ( 'h30', None ), ( 'h31', None ), ( 'h32', None ),
+            ( 'h33', None ), ( 'h34', None ), ( 'h35', None ),
+            ( 'h36', None ), ( 'h37', None ), ( 'h38', None ),
+            ( 'h39', None ), ( 'h40', None ), ( 'h41', None ),
+            ( 'h42', None ), ( 'h43', None ), ( 'h44', None ),
+            ( 'h45', None ), ( 'h46', None ), ( 'h47', None ),
+            ( 'h48', None ), ( 'h49', None ), ( 'h50', None ),
+            ( 'h51', None ), ( 'h52', None ), ( 'h53', None ),
+            ( 'h54', None ), ( 'h55', None ), ( 'h56', None ),
+            ( 'h57', None ), ( 'h58', None ), ( 'h59', None ),
+            ( 'h60', None ), ( 'h61', None ), ( 'h62', None ),
+            ( 'h63', None ), ( 'h64', None ), ( 'h65', None ),
+            ( 'h66', None ), ( 'h67', None ), ( 'h68', None ),
+            ( 'h69', None ), ( 'h70', None ), ( 'h71', None ),
+            ( 'h72', None ), ( 'h73', None ), ( 'h74', None ),
+            ( 'h75', None ), ( 'h76', None ), ( 'h77', None ),
+            ( 'h78', None ), ( 'h79', None ), ( 'h80', None ),
+            ( 'h81', None ), ( 'h82', None ), ( 'h83', None ),
+            ( 'h84', None ), ( 'h85', None ), ( 'h86', None ),
+            ( 'h87', None ), ( 'h88', None ), ( 'h89', None ),
+            ( 'h90', None ), ( 'h91', None ), ( 'h92', None ),
+            ( 'h93', None ), ( 'h94', None ), ( 'h95', None ),
+            ( 'h96', None ), ( 'h97', None ), ( 'h98', None ),
+            ( 'h99', None ), ( 'h100', None ), ( 'h101', None ),
+            ( 'h102', None ), ( 'h103', None ), ( 'h104', None ),
+            ( 'h105', None ), ( 'h106', None ), ( 'h107', None ),
+            ( 'h108', None ), ( 'h109', None ), ( 'h110', None ),
+            ( 'h111', None ), ( 'h112', None ), ( 'h113', None ),
+            ( 'h114', None ), ( 'h115', None ), ( 'h116', None ),
+            ( 'h117', None ), ( 'h118', None ) ],
+        'links': [
+            ( 's1', 's2' ), ( 's1', 's3' ), ( 's1', 's4' ), ( 's2', 's5' ),
+            ( 's2', 's7' ), ( 's2', 's13' ), ( 's3', 's4' ), ( 's3', 's7' ),
+            ( 's3', 's8' ), ( 's3', 's9' ), ( 's4', 's5' ), ( 's4', 's10' ),
+            ( 's4', 's11' ), ( 's5', 's12' ), ( 's5', 's13' ),
+            ( 's6', 's7' ), ( 's6', 's13' ), ( 's6', 's14' ),
+            ( 's6', 's16' ), ( 's6', 's17' ), ( 's7', 's8' ),
+            ( 's7', 's20' ), ( 's7', 's21' ), ( 's7', 's22' ),
+            ( 's8', 's22' ), ( 's8', 's23' ), ( 's9', 's10' ),
+            ( 's9', 's26' ), ( 's10', 's29' ), ( 's10', 's30' ),
+            ( 's10', 's33' ), ( 's11', 's12' ), ( 's11', 's34' ),
+            ( 's11', 's35' ), ( 's12', 's36' ), ( 's12', 's37' ),
+            ( 's13', 's39' ), ( 's14', 's15' ), ( 's14', 's16' ),
+            ( 's15', 's16' ), ( 's16', 's18' ), ( 's17', 's18' ),
+            ( 's17', 's19' ), ( 's20', 's21' ), ( 's23', 's24' ),
+            ( 's23', 's25' ), ( 's26', 's27' ), ( 's26', 's28' ),
+            ( 's27', 's28' ), ( 's30', 's31' ), ( 's30', 's32' ),
+            ( 's35', 's36' ), ( 's36', 's38' ), ( 's37', 's38' ),
+            ( 's39', 's40' ), ( 's39', 's41' ), ( 's15', 'h1' ),
+            ( 's15', 'h2' ), ( 's18', 'h3' ), ( 's18', 'h4' ),
+            ( 's18', 'h5' ), ( 's19', 'h6' ), ( 's19', 'h7' ),
+            ( 's20', 'h8' ), ( 's20', 'h9' ), ( 's20', 'h10' ),
+            ( 's21', 'h11' ), ( 's21', 'h12' ), ( 's21', 'h13' ),
+            ( 's21', 'h14' ), ( 's21', 'h15' ), ( 's22', 'h16' ),
+            ( 's22', 'h17' ), ( 's24', 'h18' ), ( 's24', 'h19' ),
+            ( 's24', 'h20' ), ( 's24', 'h21' ), ( 's24', 'h22' ),
+            ( 's24', 'h23' ), ( 's24', 'h24' ), ( 's24', 'h25' ),
+            ( 's24', 'h26' ), ( 's24', 'h27' ), ( 's25', 'h28' ),
+            ( 's25', 'h29' ), ( 's25', 'h30' ), ( 's25', 'h31' ),
+            ( 's25', 'h32' ), ( 's25', 'h33' ), ( 's25', 'h34' ),
+            ( 's25', 'h35' ), ( 's25', 'h36' ), ( 's25', 'h37' ),
+            ( 's28', 'h38' ), ( 's28', 'h39' ), ( 's28', 'h40' ),
+            ( 's28', 'h41' ), ( 's28', 'h42' ), ( 's28', 'h43' ),
+            ( 's28', 'h44' ), ( 's29', 'h45' ), ( 's29', 'h46' ),
+            ( 's29', 'h47' ), ( 's29', 'h48' ), ( 's29', 'h49' ),
+            ( 's31', 'h50' ), ( 's31', 'h51' ), ( 's31', 'h52' ),
+            ( 's31', 'h53' ), ( 's31', 'h54' ), ( 's31', 'h55' ),
+            ( 's31', 'h56' ), ( 's31', 'h57' ), ( 's31', 'h58' ),
+            ( 's31', 'h59' ), ( 's31', 'h60' ), ( 's31', 'h61' ),
+            ( 's32', 'h62' ), ( 's32', 'h63' ), ( 's32', 'h64' ),
+            ( 's32', 'h65' ), ( 's32', 'h66' ), ( 's32', 'h67' ),
+            ( 's32', 'h68' ), ( 's32', 'h69' ), ( 's32', 'h70' ),
+            ( 's32', 'h71' ), ( 's33', 'h72' ), ( 's33', 'h73' ),
+            ( 's33', 'h74' ), ( 's33', 'h75' ), ( 's33', 'h76' ),
+            ( 's33', 'h77' ), ( 's34', 'h78' ), ( 's34', 'h79' ),
+            ( 's34', 'h80' ), ( 's35', 'h81' ), ( 's35', 'h82' ),
+            ( 's36', 'h83' ), ( 's36', 'h84' ), ( 's36', 'h85' ),
+            ( 's36', 'h86' ), ( 's38', 'h87' ), ( 's38', 'h88' ),
+            ( 's38', 'h89' ), ( 's38', 'h90' ), ( 's38', 'h91' ),
+            ( 's37', 'h92' ), ( 's37', 'h93' ), ( 's37', 'h94' ),
+            ( 's37', 'h95' ), ( 's41', 'h96' ), ( 's41', 'h97' ),
+            ( 's41', 'h98' ), ( 's41', 'h99' ), ( 's41', 'h100' ),
+            ( 's41', 'h101' ), ( 's41', 'h102' ), ( 's41', 'h103' ),
+            ( 's41', 'h104' ), ( 's41', 'h105' ), ( 's41', 'h106' ),
+            ( 's40', 'h107' ), ( 's40', 'h108' ), ( 's40', 'h109' ),
+            ( 's40', 'h110' ), ( 's40', 'h111' ), ( 's40', 'h112' ),
+            ( 's40', 'h113' ), ( 's40', 'h114' ), ( 's40', 'h115' ),
+            ( 's40', 'h116' ), ( 's40', 'h117' ), ( 's40', 'h118' ) ] },
+    'minicurcle': {
+        'switches': [
+            's1', 's2', 's3', 's4', 's5', 's6', 's7', 's8', 's9', 's10',
+            's11', 's12', 's13' ],
+        'hosts': [
+            ( 'h1', None ), ( 'h2', None ), ( 'h3', None ), ( 'h4', None ),
+            ( 'h5', None ), ( 'h6', None ), ( 'h7', None ), ( 'h8', None ),
+            ( 'h9', None ), ( 'h10', None ), ( 'h11', None ),
+            ( 'h12', None ), ( 'h13', None ), ( 'h14', None ),
+            ( 'h15', None ), ( 'h16', None ) ],
+        'links': [
+            ( 's1', 's2' ), ( 's1', 's3' ), ( 's1', 's4' ), ( 's1', 's5' ),
+            ( 's2', 's6' ), ( 's2', 's7' ), ( 's2', 's3' ), ( 's3', 's8' ),
+            ( 's3', 's9' ), ( 's3', 's4' ), ( 's4', 's10' ), ( 's4', 's11' ),
+            ( 's4', 's5' ), ( 's5', 's12' ), ( 's5', 's13' ), ( 's5', 's2' ),
+            ( 's6', 's7' ), ( 's7', 's8' ), ( 's8', 's9' ), ( 's9', 's10' ),
+            ( 's10', 's11' ), ( 's11', 's12' ), ( 's12', 's13' ),
+            ( 's13', 's6' ), ( 's6', 'h1' ), ( 's6', 'h2' ), ( 's7', 'h3' ),
+            ( 's7', 'h4' ), ( 's8', 'h5' ), ( 's8', 'h6' ), ( 's9', 'h7' ),
+            ( 's9', 'h8' ), ( 's10', 'h9' ), ( 's10', 'h10' ),
+            ( 's11', 'h11' ), ( 's11', 'h12' ), ( 's12', 'h13' ),
+            ( 's12', 'h14' ), ( 's13', 'h15' ), ( 's13', 'h16' ) ] },
+    'nttutree': {
+        'switches': [
+            's1', 's2', 's3', 's4', 's5', 's6', 's7', 's8', 's9', 's10',
+            's11', 's12', 's13', 's14', 's15', 's16', 's17', 's18', 's19',
+            's20', 's21', 's22', 's23', 's24', 's25', 's26', 's27', 's28',
+            's29', 's30', 's31', 's32', 's33', 's34', 's35', 's36', 's37',
+            's38', 's39', 's40', 's41', 's42', 's43', 's44', 's45', 's46',
+            's47', 's48', 's49', 's50', 's51', 's52', 's53', 's54', 's55',
+            's56', 's57', 's58', 's59', 's60', 's61', 's62', 's63', 's64',
+            's65', 's66' ],
+        'hosts': [
+            ( 'h1', None ), ( 'h2', None ), ( 'h3', None ), ( 'h4', None ),
+            ( 'h5', None ), ( 'h6', None ), ( 'h7', None ), ( 'h8', None ),
+            ( 'h9', None ), ( 'h10', None ), ( 'h11', None ),
+            ( 'h12', None ), ( 'h13', None ), ( 'h14', None ),
+            ( 'h15', None ), ( 'h16', None ), ( 'h17', None ),
+            ( 'h18', None ), ( 'h19', None ), ( 'h20', None ),
+            ( 'h21', None ), ( 'h22', None ), ( 'h23', None ),
+            ( 'h24', None ), ( 'h25', None ), ( 'h26', None ),
+            ( 'h27', None ), ( 'h28', None ), ( 'h29', None ),
+            ( 'h30', None ), ( 'h31', None ), ( 'h32', None ),
+            ( 'h33', None ), ( 'h34', None ), ( 'h35', None ),
+            ( 'h36', None ), ( 'h37', None ), ( 'h38', None ),
+            ( 'h39', None ), ( 'h40', None ), ( 'h41', None ),
+            ( 'h42', None ), ( 'h43', None ), ( 'h44', None ),
+            ( 'h45', None ), ( 'h46', None ), ( 'h47', None ),
+            ( 'h48', None ), ( 'h49', None ), ( 'h50', None ),
+            ( 'h51', None ), ( 'h52', None ), ( 'h53', None ),
+            ( 'h54', None ), ( 'h55', None ), ( 'h56', None ),
+            ( 'h57', None ), ( 'h58', None ), ( 'h59', None ),
+            ( 'h60', None ), ( 'h61', None ), ( 'h62', None ),
+            ( 'h63', None ), ( 'h64', None ), ( 'h65', None ),
+            ( 'h66', None ), ( 'h67', None ), ( 'h68', None ),
+            ( 'h69', None ), ( 'h70', None ), ( 'h71', None ),
+            ( 'h72', None ), ( 'h73', None ), ( 'h74', None ),
+            ( 'h75', None ), ( 'h76', None ), ( 'h77', None ),
+            ( 'h78', None ), ( 'h79', None ), ( 'h80', None ),
+            ( 'h81', None ), ( 'h82', None ), ( 'h83', None ),
+            ( 'h84', None ), ( 'h85', None ), ( 'h86', None ),
+            ( 'h87', None ), ( 'h88', None ), ( 'h89', None ),
+            ( 'h90', None ), ( 'h91', None ), ( 'h92', None ),
+            ( 'h93', None ), ( 'h94', None ), ( 'h95', None ),
+            ( 'h96', None ), ( 'h97', None ), ( 'h98', None ),
+            ( 'h99', None ), ( 'h100', None ), ( 'h101', None ),
+            ( 'h102', None ), ( 'h103', None ), ( 'h104', None ),
+            ( 'h105', None ), ( 'h106', None ), ( 'h107', None ),
+            ( 'h108', None ), ( 'h109', None ), ( 'h110', None ),
+            ( 'h111', None ), ( 'h112', None ), ( 'h113', None ),
+            ( 'h114', None ), ( 'h115', None ), ( 'h116', None ),
+            ( 'h117', None ), ( 'h118', None ), ( 'h119', None ),
+            ( 'h120', None ), ( 'h121', None ), ( 'h122', None ),
+            ( 'h123', None ), ( 'h124', None ), ( 'h125', None ),
+            ( 'h126', None ), ( 'h127', None ), ( 'h128', None ),
+            ( 'h129', None ), ( 'h130', None ), ( 'h131', None ),
+            ( 'h132', None ), ( 'h133', None ), ( 'h134', None ),
+            ( 'h135', None ), ( 'h136', None ), ( 'h137', None ),
+            ( 'h138', None ), ( 'h139', None ), ( 'h140', None ),
+            ( 'h141', None ), ( 'h142', None ), ( 'h143', None ),
+            ( 'h144', None ), ( 'h145', None ), ( 'h146', None ),
+            ( 'h147', None ), ( 'h148', None ), ( 'h149', None ),
+            ( 'h150', None ), ( 'h151', None ), ( 'h152', None ),
+            ( 'h153', None ), ( 'h154', None ), ( 'h155', None ),
+            ( 'h156', None ), ( 'h157', None ), ( 'h158', None ),
+            ( 'h159', None ), ( 'h160', None ), ( 'h161', None ),
+            ( 'h162', None ), ( 'h163', None ), ( 'h164', None ),
+            ( 'h165', None ), ( 'h166', None ), ( 'h167', None ),
+            ( 'h168', None ), ( 'h169', None ), ( 'h170', None ),
+            ( 'h171', None ), ( 'h172', None ), ( 'h173', None ),
+            ( 'h174', None ), ( 'h175', None ), ( 'h176', None ),
+            ( 'h177', None ), ( 'h178', None ), ( 'h179', None ),
+            ( 'h180', None ), ( 'h181', None ), ( 'h182', None ),
+            ( 'h183', None ), ( 'h184', None ), ( 'h185', None ),
+            ( 'h186', None ), ( 'h187', None ), ( 'h188', None ),
+            ( 'h189', None ), ( 'h190', None ), ( 'h191', None ),
+            ( 'h192', None ), ( 'h193', None ), ( 'h194', None ),
+            ( 'h195', None ), ( 'h196', None ), ( 'h197', None ),
+            ( 'h198', None ), ( 'h199', None ), ( 'h200', None ),
+            ( 'h201', None ), ( 'h202', None ), ( 'h203', None ),
+            ( 'h204', None ), ( 'h205', None ), ( 'h206', None ),
+            ( 'h207', None ), ( 'h208', None ), ( 'h209', None ),
+            ( 'h210', None ), ( 'h211', None ), ( 'h212', None ),
+            ( 'h213', None ), ( 'h214', None ), ( 'h215', None ),
+            ( 'h216', None ), ( 'h217', None ), ( 'h218', None ),
+            ( 'h219', None ), ( 'h220', None ), ( 'h221', None ),
+            ( 'h222', None ), ( 'h223', None ), ( 'h224', None ),
+            ( 'h225', None ), ( 'h226', None ), ( 'h227', None ),
+            ( 'h228', None ), ( 'h229', None ), ( 'h230', None ),
+            ( 'h231', None ), ( 'h232', None ), ( 'h233', None ),
+            ( 'h234', None ), ( 'h235', None ), ( 'h236', None ),
+            ( 'h237', None ), ( 'h238', None ), ( 'h239', None ),
+            ( 'h240', None ) ],
+        'links': [
+            ( 's1', 's2' ), ( 's1', 's3' ), ( 's1', 's4' ), ( 's1', 's5' ),
+            ( 's1', 's6' ), ( 's1', 's7' ), ( 's2', 's8' ), ( 's2', 's9' ),
+            ( 's2', 's10' ), ( 's2', 's11' ), ( 's2', 's12' ),
+            ( 's4', 's13' ), ( 's4', 's14' ), ( 's4', 's15' ),
+            ( 's4', 's16' ), ( 's4', 's17' ), ( 's4', 's18' ),
+            ( 's5', 's19' ), ( 's5', 's20' ), ( 's6', 's21' ),
+            ( 's6', 's22' ), ( 's6', 's23' ), ( 's6', 's24' ),
+            ( 's6', 's25' ), ( 's6', 's26' ), ( 's8', 's27' ),
+            ( 's8', 's28' ), ( 's9', 's29' ), ( 's9', 's30' ),
+            ( 's10', 's31' ), ( 's10', 's32' ), ( 's11', 's33' ),
+            ( 's11', 's34' ), ( 's12', 's35' ), ( 's12', 's36' ),
+            ( 's12', 's37' ), ( 's12', 's38' ), ( 's13', 's39' ),
+            ( 's13', 's40' ), ( 's14', 's41' ), ( 's14', 's42' ),
+            ( 's15', 's43' ), ( 's15', 's44' ), ( 's16', 's45' ),
+            ( 's16', 's46' ), ( 's17', 's47' ), ( 's17', 's48' ),
+            ( 's18', 's49' ), ( 's18', 's50' ), ( 's19', 's51' ),
+            ( 's19', 's52' ), ( 's20', 's53' ), ( 's20', 's54' ),
+            ( 's21', 's55' ), ( 's21', 's56' ), ( 's22', 's57' ),
+            ( 's22', 's58' ), ( 's23', 's59' ), ( 's23', 's60' ),
+            ( 's24', 's61' ), ( 's24', 's62' ), ( 's25', 's63' ),
+            ( 's25', 's64' ), ( 's26', 's65' ), ( 's26', 's66' ),
+            ( 's27', 'h1' ), ( 's27', 'h2' ), ( 's27', 'h3' ),
+            ( 's28', 'h4' ), ( 's28', 'h5' ), ( 's28', 'h6' ),
+            ( 's28', 'h7' ), ( 's28', 'h8' ), ( 's28', 'h9' ),
+            ( 's28', 'h10' ), ( 's29', 'h11' ), ( 's29', 'h12' ),
+            ( 's29', 'h13' ), ( 's30', 'h14' ), ( 's30', 'h15' ),
+            ( 's30', 'h16' ), ( 's30', 'h17' ), ( 's30', 'h18' ),
+            ( 's30', 'h19' ), ( 's30', 'h20' ), ( 's31', 'h21' ),
+            ( 's31', 'h22' ), ( 's31', 'h23' ), ( 's32', 'h24' ),
+            ( 's32', 'h25' ), ( 's32', 'h26' ), ( 's32', 'h27' ),
+            ( 's32', 'h28' ), ( 's32', 'h29' ), ( 's32', 'h30' ),
+            ( 's33', 'h31' ), ( 's33', 'h32' ), ( 's33', 'h33' ),
+            ( 's34', 'h34' ), ( 's34', 'h35' ), ( 's34', 'h36' ),
+            ( 's34', 'h37' ), ( 's34', 'h38' ), ( 's34', 'h39' ),
+            ( 's34', 'h40' ), ( 's35', 'h41' ), ( 's35', 'h42' ),
+            ( 's35', 'h43' ), ( 's36', 'h44' ), ( 's36', 'h45' ),
+            ( 's36', 'h46' ), ( 's36', 'h47' ), ( 's36', 'h48' ),
+            ( 's36', 'h49' ), ( 's36', 'h50' ), ( 's37', 'h51' ),
+            ( 's37', 'h52' ), ( 's37', 'h53' ), ( 's38', 'h54' ),
+            ( 's38', 'h55' ), ( 's38', 'h56' ), ( 's38', 'h57' ),
+            ( 's38', 'h58' ), ( 's38', 'h59' ), ( 's38', 'h60' ),
+            ( 's38', 'h61' ), ( 's38', 'h62' ), ( 's38', 'h63' ),
+            ( 's38', 'h64' ), ( 's38', 'h65' ), ( 's38', 'h66' ),
+            ( 's38', 'h67' ), ( 's38', 'h68' ), ( 's38', 'h69' ),
+            ( 's38', 'h70' ), ( 's39', 'h71' ), ( 's39', 'h72' ),
+            ( 's39', 'h73' ), ( 's40', 'h74' ), ( 's40', 'h75' ),
+            ( 's40', 'h76' ), ( 's40', 'h77' ), ( 's40', 'h78' ),
+            ( 's40', 'h79' ), ( 's40', 'h80' ), ( 's41', 'h81' ),
+            ( 's41', 'h82' ), ( 's41', 'h83' ), ( 's42', 'h84' ),
+            ( 's42', 'h85' ), ( 's42', 'h86' ), ( 's42', 'h87' ),
+            ( 's42', 'h88' ), ( 's42', 'h89' ), ( 's42', 'h90' ),
+            ( 's43', 'h91' ), ( 's43', 'h92' ), ( 's43', 'h93' ),
+            ( 's44', 'h94' ), ( 's44', 'h95' ), ( 's44', 'h96' ),
+            ( 's44', 'h97' ), ( 's44', 'h98' ), ( 's44', 'h99' ),
+            ( 's44', 'h100' ), ( 's45', 'h101' ), ( 's45', 'h102' ),
+            ( 's45', 'h103' ), ( 's46', 'h104' ), ( 's46', 'h105' ),
+            ( 's46', 'h106' ), ( 's46', 'h107' ), ( 's46', 'h108' ),
+            ( 's46', 'h109' ), ( 's46', 'h110' ), ( 's47', 'h111' ),
+            ( 's47', 'h112' ), ( 's47', 'h113' ), ( 's48', 'h114' ),
+            ( 's48', 'h115' ), ( 's48', 'h116' ), ( 's48', 'h117' ),
+            ( 's48', 'h118' ), ( 's48', 'h119' ), ( 's48', 'h120' ),
+            ( 's49', 'h121' ), ( 's49', 'h122' ), ( 's49', 'h123' ),
+            ( 's50', 'h124' ), ( 's50', 'h125' ), ( 's50', 'h126' ),
+            ( 's50', 'h127' ), ( 's50', 'h128' ), ( 's50', 'h129' ),
+            ( 's50', 'h130' ), ( 's51', 'h131' ), ( 's51', 'h132' ),
+            ( 's51', 'h133' ), ( 's52', 'h134' ), ( 's52', 'h135' ),
+            ( 's52', 'h136' ), ( 's52', 'h137' ), ( 's52', 'h138' ),
+            ( 's52', 'h139' ), ( 's52', 'h140' ), ( 's53', 'h141' ),
+            ( 's53', 'h142' ), ( 's53', 'h143' ), ( 's54', 'h144' ),
+            ( 's54', 'h145' ), ( 's54', 'h146' ), ( 's54', 'h147' ),
+            ( 's54', 'h148' ), ( 's54', 'h149' ), ( 's54', 'h150' ),
+            ( 's55', 'h151' ), ( 's55', 'h152' ), ( 's55', 'h153' ),
+            ( 's56', 'h154' ), ( 's56', 'h155' ), ( 's56', 'h156' ),
+            ( 's56', 'h157' ), ( 's56', 'h158' ), ( 's56', 'h159' ),
+            ( 's56', 'h160' ), ( 's57', 'h161' ), ( 's57', 'h162' ),
+            ( 's57', 'h163' ), ( 's58', 'h164' ), ( 's58', 'h165' ),
+            ( 's58', 'h166' ), ( 's58', 'h167' ), ( 's58', 'h168' ),
+            ( 's58', 'h169' ), ( 's58', 'h170' ), ( 's59', 'h171' ),
+            ( 's59', 'h172' ), ( 's59', 'h173' ), ( 's60', 'h174' ),
+            ( 's60', 'h175' ), ( 's60', 'h176' ), ( 's60', 'h177' ),
+            ( 's60', 'h178' ), ( 's60', 'h179' ), ( 's60', 'h180' ),
+            ( 's61', 'h181' ), ( 's61', 'h182' ), ( 's61', 'h183' ),
+            ( 's62', 'h184' ), ( 's62', 'h185' ), ( 's62', 'h186' ),
+            ( 's62', 'h187' ), ( 's62', 'h188' ), ( 's62', 'h189' ),
+            ( 's62', 'h190' ), ( 's63', 'h191' ), ( 's63', 'h192' ),
+            ( 's63', 'h193' ), ( 's64', 'h194' ), ( 's64', 'h195' ),
+            ( 's64', 'h196' ), ( 's64', 'h197' ), ( 's64', 'h198' ),
+            ( 's64', 'h199' ), ( 's64', 'h200' ), ( 's65', 'h201' ),
+            ( 's65', 'h202' ), ( 's65', 'h203' ), ( 's66', 'h204' ),
+            ( 's66', 'h205' ), ( 's66', 'h206' ), ( 's66', 'h207' ),
+            ( 's66', 'h208' ), ( 's66', 'h209' ), ( 's66', 'h210' ),
+            ( 's3', 'h211' ), ( 's3', 'h212' ), ( 's3', 'h213' ),
+            ( 's3', 'h214' ), ( 's3', 'h215' ), ( 's7', 'h216' ),
+            ( 's7', 'h217' ), ( 's7', 'h218' ), ( 's7', 'h219' ),
+            ( 's7', 'h220' ), ( 's7', 'h221' ), ( 's7', 'h222' ),
+            ( 's7', 'h223' ), ( 's7', 'h224' ), ( 's7', 'h225' ),
+            ( 's7', 'h226' ), ( 's7', 'h227' ), ( 's7', 'h228' ),
+            ( 's7', 'h229' ), ( 's7', 'h230' ), ( 's7', 'h231' ),
+            ( 's7', 'h232' ), ( 's7', 'h233' ), ( 's7', 'h234' ),
+            ( 's7', 'h235' ), ( 's7', 'h236' ), ( 's7', 'h237' ),
+            ( 's7', 'h238' ), ( 's7', 'h239' ), ( 's7', 'h240' ) ] } }
+
+
+@pytest.mark.parametrize( 'name', sorted( BASELINE ) )
+def testSpecMatchesBaseline( name ):
+    spec = loadSpec( name )
+    expected = BASELINE[ name ]
+    assert spec.switchNames() == expected[ 'switches' ]
+    hosts = [ ( host, params.get( 'ip' ) ) for host, params in spec.hosts ]
+    assert hosts == expected[ 'hosts' ]
+    assert spec.linkPairs() == expected[ 'links' ]
+    assert spec.controllers == [ ( 'C0', '192.168.176.132', {} ) ]
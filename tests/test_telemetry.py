@@ -0,0 +1,111 @@
+"""
+Telemetry: parsing kernel and OVS port counters, packing samples as
+32-bit counter increases (also across resets and overflows) and reading
+a file back.
+"""
+
+import time
+from array import array
+
+import pytest
+
+from mntopo.dryrun import DryRunNet
+from mntopo.telemetry import ( COUNTERS, HEADER, MAXDELTA, STAMP,
+                               Telemetry, parseNetDev, parsePortStats,
+                               peakRates, readTelemetry )
+
+
+NETDEV = b"""Inter-|   Receive                            |  Transmit
+ face |bytes    packets errs drop fifo frame compressed multicast|\
+bytes    packets errs drop fifo colls carrier compressed
+    lo:     100       1    0    0    0     0          0         0 \
+     100       1    0    0    0     0       0          0
+s1-eth1: 5000000000  40    0    2    0     0          0         0 \
+   700       7    0    3    0     0       0          0
+s1-eth2:      10       1    0    0    0     0          0         0 \
+      20       2    0    0    0     0       0          0
+"""
+
+DUMPPORTS = """OFPST_PORT reply (xid=0x2): 2 ports
+  port  "s1-eth1": rx pkts=40, bytes=5000, drop=2, errs=0, frame=0, \
+over=0, crc=0
+           tx pkts=7, bytes=700, drop=3, errs=0, coll=0
+  port LOCAL: rx pkts=0, bytes=0, drop=?, errs=0, frame=0, over=0, crc=0
+           tx pkts=1, bytes=70, drop=?, errs=0, coll=0
+"""
+
+
+def telemetry( path ):
+    "Return a Telemetry for switches s1 - s2 - s3"
+    net = DryRunNet()
+    net.addLink( net.addSwitch( 's1' ), net.addSwitch( 's2' ) )
+    net.addLink( net.addSwitch( 's3' ), 's2' )
+    return Telemetry( net, str( path ), rate=100 )
+
+def testParseNetDev():
+    values = [ -1 ] * ( 3 * len( COUNTERS ) )
+    parseNetDev( NETDEV, { b's1-eth1': 0, b's1-eth2': 2 }, values )
+    assert values == [ 5000000000, 40, 2, 700, 7, 3,
+                       -1, -1, -1, -1, -1, -1,
+                       10, 1, 0, 20, 2, 0 ]
+
+def testParsePortStats():
+    assert parsePortStats( DUMPPORTS ) == {
+        's1-eth1': [ 5000, 40, 2, 700, 7, 3 ],
+        'LOCAL': [ 0, 0, 0, 70, 1, 0 ] }
+
+def testRecord( tmp_path ):
+    collector = telemetry( tmp_path / 'run.tm' )
+    assert collector.intfs == [ ( 's1', 's1-eth1' ), ( 's2', 's2-eth1' ),
+                                ( 's2', 's2-eth2' ), ( 's3', 's3-eth1' ) ]
+    width = len( COUNTERS ) * len( collector.intfs )
+    collector.last = [ 10 ] * width
+
+    def deltas( record ):
+        assert STAMP.unpack_from( record )[ 0 ] == 1.5
+        values = array( 'I' )
+        values.frombytes( record[ STAMP.size: ] )
+        return list( values )
+
+    assert deltas( collector.record( 1.5, [ 15 ] * width ) ) == [ 5 ] * width
+    # A reset counts from 0 and a jump past 32 bits saturates
+    values = [ 15 ] * width
+    values[ :2 ] = [ 3, 15 + 2 ** 33 ]
+    assert deltas( collector.record( 1.5, values ) ) == (
+        [ 3, MAXDELTA ] + [ 0 ] * ( width - 2 ) )
+    assert collector.last is values
+
+def testRoundTrip( tmp_path ):
+    path = tmp_path / 'run.tm'
+    collector = telemetry( path )
+    width = len( COUNTERS ) * len( collector.intfs )
+    reads = []
+
+    def read():
+        "Counters that grow by a step each read"
+        reads.append( [ len( reads ) * ( i + 1 ) for i in range( width ) ] )
+        return reads[ -1 ]
+
+    collector.read = read
+    collector.start()
+    while collector.samples < 5:
+        time.sleep( .01 )
+    collector.stop()
+    header, times, samples = readTelemetry( str( path ) )
+    assert header[ 'counters' ] == list( COUNTERS )
+    assert [ tuple( intf ) for intf in header[ 'intfs' ] ] == (
+        collector.intfs )
+    assert header[ 'base' ] == reads[ 0 ]
+    assert len( samples ) == collector.samples == len( reads ) - 1
+    assert times == sorted( times ) and times[ 0 ] >= header[ 'start' ]
+    # The base plus every increase gives the last counters read
+    assert [ base + sum( sample[ i ] for sample in samples )
+             for i, base in enumerate( header[ 'base' ] ) ] == reads[ -1 ]
+    peaks = peakRates( header, times, samples )
+    assert sorted( peaks ) == sorted( collector.intfs )
+
+def testNotTelemetry( tmp_path ):
+    path = tmp_path / 'other'
+    path.write_bytes( HEADER.pack( b'NOTMAGIC', 0 ) )
+    with pytest.raises( ValueError ):
+        readTelemetry( str( path ) )
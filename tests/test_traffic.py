@@ -0,0 +1,65 @@
+"""
+Traffic matrices: parsing flows and their errors, and the iperf -y C
+reports the results are read from.
+"""
+
+import pytest
+
+from mntopo.spec import SpecError
+from mntopo.traffic import Flow, parseMatrix, parseReports
+
+
+def testParseMatrix():
+    flows = parseMatrix( [
+        '# uploads',
+        'h1..h3 -> root',
+        'h1, h2 -> h2 h3 proto=udp rate=5M duration=2.5  # cross',
+        '' ] )
+    assert flows == [
+        Flow( 'h1', 'root', 'tcp', None, 10.0 ),
+        Flow( 'h2', 'root', 'tcp', None, 10.0 ),
+        Flow( 'h3', 'root', 'tcp', None, 10.0 ),
+        Flow( 'h1', 'h2', 'udp', '5M', 2.5 ),
+        Flow( 'h1', 'h3', 'udp', '5M', 2.5 ),
+        Flow( 'h2', 'h3', 'udp', '5M', 2.5 ) ]
+    # A flow per protocol may share its endpoints
+    assert len( parseMatrix( [ 'h1 -> h2', 'h1 -> h2 proto=udp' ] ) ) == 2
+
+@pytest.mark.parametrize( 'line, message', [
+    ( 'h1 h2', 'expected' ),
+    ( 'h1 -> ', 'expected' ),
+    ( 'h1 proto=udp -> h2', 'expected' ),
+    ( 'h1 -> h2 size=10', 'unknown flow parameter size' ),
+    ( 'h1 -> h2 proto=sctp', 'proto must be tcp or udp' ),
+    ( 'h1 -> h2 rate=fast', 'bad rate fast' ),
+    ( 'h1 -> h2 duration=long', 'bad duration long' ) ] )
+def testParseMatrixErrors( line, message ):
+    with pytest.raises( SpecError ) as e:
+        parseMatrix( [ '', line ], 'load' )
+    assert str( e.value ).startswith( 'load:2: ' )
+    assert message in str( e.value )
+
+def testDuplicateFlow():
+    with pytest.raises( SpecError ) as e:
+        parseMatrix( [ 'h1 -> h2', 'h1..h2 -> h2 h3' ], 'load' )
+    assert str( e.value ) == 'load:2: duplicate tcp flow h1 -> h2'
+
+def testParseReports():
+    text = '\n'.join( [
+        '1712345678.123456',
+        # TCP client
+        '20240101120000,10.0.0.1,40000,10.0.0.254,5001,3,0.0-10.0,'
+        '1250000000,1000000000',
+        # UDP client, then the server's report naming it the other way
+        '20240101120000,10.0.0.1,40001,10.0.0.2,5002,4,0.0-2.5,'
+        '655060,2096192',
+        '20240101120000,10.0.0.2,5002,10.0.0.1,40001,4,0.0-2.5,'
+        '652120,2086784,0.015,2,446,0.448,0',
+        'WARNING: did not receive ack of last datagram after 10 tries.',
+        '20240101120000,10.0.0.1,40002,10.0.0.3,5001,5,0.0-10.0,x,y' ] )
+    reports = parseReports( text )
+    assert reports[ ( '10.0.0.254', 5001 ) ] == ( 1250000000, 1e9, None,
+                                                   None, None )
+    assert reports[ ( '10.0.0.2', 5002 ) ] == ( 652120, 2086784.0, 0.015,
+                                                 2, 446 )
+    assert ( '10.0.0.3', 5001 ) not in reports